@@ -8,9 +8,198 @@ import numpy as np  # pip install numpy
 import msgpack
 import time
 import math
+import copy
+import socket
+import asyncio
+import inspect
 import logging
 
 
+class _RequestRecorded(Exception):
+    """
+    Stops a client method once its request has been recorded, before it waits for the response
+    """
+    pass
+
+
+class _RequestRecorder:
+    """
+    Stands in for the msgpackrpc client while a batched call is recorded
+    """
+    def __init__(self):
+        self.request = None
+
+    def call(self, method, *args):
+        self.request = (method, args)
+        raise _RequestRecorded()
+
+    def call_async(self, method, *args):
+        self.request = (method, args)
+        raise _RequestRecorded()
+
+
+class _RequestReplay:
+    """
+    Stands in for the msgpackrpc client while a batched call is resolved, returning the response of its pipelined
+    request. Any further request of the client method is sent as usual
+    """
+    def __init__(self, client, method, future):
+        self.client = client
+        self.method = method
+        self.future = future
+
+    def call(self, method, *args):
+        if self.future is not None and method == self.method:
+            future, self.future = self.future, None
+            if isinstance(self.client, CountingRPCClient):
+                return self.client.get(future)
+            return future.get()
+        return self.client.call(method, *args)
+
+    def call_async(self, method, *args):
+        if self.future is not None and method == self.method:
+            future, self.future = self.future, None
+            return future
+        return self.client.call_async(method, *args)
+
+
+class _NoDelayAddress(msgpackrpc.Address):
+    """
+    Address of the server whose sockets send every request as soon as it is written. Otherwise, Nagle's algorithm holds
+    the requests pipelined by an RPCBatch after the first one until the response of the first one is received
+    """
+    def socket(self, *args, **kwargs):
+        sock = super().socket(*args, **kwargs)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+
+class CountingRPCClient:
+    """
+    Wraps the msgpackrpc client in order to count the requests sent to the server and the round trips waited for their
+    responses. A round trip is counted every time that the client blocks waiting for a response that has not been
+    received yet, so the requests of an RPCBatch whose responses arrive together are counted as a single round trip
+    """
+    def __init__(self, client):
+        self.client = client
+        self.n_requests = 0
+        self.n_round_trips = 0
+
+    def call(self, method, *args):
+        self.n_requests += 1
+        self.n_round_trips += 1
+        return self.client.call(method, *args)
+
+    def call_async(self, method, *args):
+        self.n_requests += 1
+        return self.client.call_async(method, *args)
+
+    def get(self, future):
+        """
+        Waits for the response of a request sent with call_async
+
+        Args:
+            future (msgpackrpc.Future): Future of the request
+
+        Returns:
+            The result of the request
+        """
+        if not getattr(future, "_set_flag", False):
+            self.n_round_trips += 1
+        return future.get()
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class BatchedCall:
+    """
+    Result of a call added to an RPCBatch, available once the batch has been executed
+    """
+    def __init__(self, method_name):
+        self.method_name = method_name
+        self.done = False
+        self.result = None
+
+    def set(self, result):
+        self.done = True
+        self.result = result
+
+    def get(self):
+        """
+        Returns:
+            The value returned by the client method
+        """
+        if not self.done:
+            raise RuntimeError("The batch containing " + self.method_name + " has not been executed yet")
+        return self.result
+
+
+class RPCBatch:
+    """
+    Groups several API calls such that their requests are written to the msgpackrpc connection one after the other and
+    their responses are awaited together, instead of waiting for the response of each call before sending the next one.
+    Since the client sockets have TCP_NODELAY set, the requests are not held back by Nagle's algorithm and the batch
+    usually takes a single round trip to the server.
+
+    Any method of the client can be added by calling it on the batch with the usual arguments. It returns a BatchedCall
+    whose value, decoded by the client method as usual, is available when the batch is executed on exiting the with
+    block. Only the first request of each method is pipelined, any further request is sent when the batch is executed
+    """
+    def __init__(self, vehicle_client):
+        self.vehicle_client = vehicle_client
+        self.calls = []
+
+    def __getattr__(self, method_name):
+        getattr(self.vehicle_client, method_name)  # fail early if the client has no such method
+
+        def add_call(*args, **kwargs):
+            batched_call = BatchedCall(method_name)
+            self.calls.append((method_name, args, kwargs, batched_call))
+            return batched_call
+        return add_call
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.execute()
+        return False
+
+    def client_with(self, rpc_client):
+        """
+        Copy of the vehicle client that sends its requests through another msgpackrpc client
+        """
+        vehicle_client = copy.copy(self.vehicle_client)
+        vehicle_client.client = rpc_client
+        return vehicle_client
+
+    def execute(self):
+        """
+        Sends the requests of all the calls of the batch and resolves them once all of them have been sent
+        """
+        calls, self.calls = self.calls, []
+        rpc_client = self.vehicle_client.client
+
+        # Record the request of every call and send it without waiting for the response
+        requests = []
+        for method_name, args, kwargs, batched_call in calls:
+            recorder = _RequestRecorder()
+            try:
+                batched_call.set(getattr(self.client_with(recorder), method_name)(*args, **kwargs))
+                requests.append(None)
+            except _RequestRecorded:
+                method, rpc_args = recorder.request
+                requests.append((method, rpc_client.call_async(method, *rpc_args)))
+
+        # Decode the responses with the client methods
+        for (method_name, args, kwargs, batched_call), request in zip(calls, requests):
+            if request is not None:
+                replay = _RequestReplay(rpc_client, *request)
+                batched_call.set(getattr(self.client_with(replay), method_name)(*args, **kwargs))
+
+
 class VehicleClient:
     def __init__(self, ip="", port=41451, timeout_value=3600):
         if ip == "":
@@ -19,7 +208,7 @@ class VehicleClient:
         self.port = port
         self.timeout_value = timeout_value
         self.client = msgpackrpc.Client(
-            msgpackrpc.Address(self.ip, self.port),
+            _NoDelayAddress(self.ip, self.port),
             timeout=self.timeout_value,
             pack_encoding="utf-8",
             unpack_encoding="utf-8",
@@ -43,6 +232,33 @@ class VehicleClient:
         """
         return self.client.call("ping")
 
+    def batch(self):
+        """
+        Groups the API calls made within a with block such that their requests are sent together and their responses are
+        awaited together, which usually takes a single round trip to the server
+
+        Example:
+            with client.batch() as b:
+                state = b.getMultirotorState(vehicle_name=vehicle_name)
+                pose = b.simGetVehiclePose(vehicle_name=vehicle_name)
+            timestamp = state.get().timestamp
+
+        Returns:
+            RPCBatch: Batch whose calls are sent and resolved together when the with block is exited
+        """
+        return RPCBatch(self)
+
+    def countRpcCalls(self):
+        """
+        Starts counting the requests sent to the server and the round trips waited for their responses
+
+        Returns:
+            CountingRPCClient: Wrapped msgpackrpc client, whose n_requests and n_round_trips hold the counts
+        """
+        if not isinstance(self.client, CountingRPCClient):
+            self.client = CountingRPCClient(self.client)
+        return self.client
+
     def getClientVersion(self):
         return 1  # sync with C++ client
 
@@ -407,7 +623,7 @@ class VehicleClient:
     def simLoadLevel(self, level_name):
         return_val = self.client.call("simLoadLevel", level_name)
         self.client = msgpackrpc.Client(
-            msgpackrpc.Address(self.ip, self.port),
+            _NoDelayAddress(self.ip, self.port),
             timeout=self.timeout_value,
             pack_encoding="utf-8",
             unpack_encoding="utf-8",
@@ -2621,3 +2837,212 @@ class CarClient(VehicleClient, object):
         """
         controls_raw = self.client.call("getCarControls", vehicle_name)
         return CarControls.from_msgpack(controls_raw)
+
+
+# -----------------------------------  Asyncio APIs ---------------------------------------------
+class AsyncRPCConnection:
+    """
+    msgpack-rpc connection driven by an asyncio event loop. The requests made within an iteration of the event loop are
+    written to the socket together and the response of each of them is delivered to an asyncio future, so any number
+    of requests can be in flight at the same time
+    """
+    def __init__(self, ip="127.0.0.1", port=41451, timeout_value=3600):
+        self.ip = ip
+        self.port = port
+        self.timeout_value = timeout_value
+        self.reader = None
+        self.writer = None
+        self.reader_task = None
+        self.msgid = 0
+        self.pending = {}
+        self.requests = []
+        self.packer = msgpack.Packer(default=lambda obj: obj.to_msgpack(), use_bin_type=False)
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.ip, self.port)
+        self.reader_task = asyncio.ensure_future(self.read_responses())
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.reader_task
+            self.writer = None
+
+    def call_async(self, method, *args):
+        """
+        Sends a request without waiting for its response
+
+        Returns:
+            asyncio.Future: Future that receives the result of the request
+        """
+        if self.writer is None:
+            raise ConnectionError("The AsyncMultirotorClient is not connected, await connect() first")
+        self.msgid += 1
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self.pending[self.msgid] = (future, loop.call_later(self.timeout_value, self.expire, self.msgid))
+        if not self.requests:
+            loop.call_soon(self.flush)
+        self.requests.append(self.packer.pack([0, self.msgid, method, list(args)]))
+        return future
+
+    def flush(self):
+        if self.writer is not None:
+            self.writer.write(b"".join(self.requests))
+        self.requests = []
+
+    def expire(self, msgid):
+        future, _ = self.pending.pop(msgid, (None, None))
+        if future is not None and not future.done():
+            future.set_exception(msgpackrpc.error.TimeoutError("Request timed out"))
+
+    async def read_responses(self):
+        unpacker = msgpack.Unpacker(raw=False)
+        try:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    break
+                unpacker.feed(data)
+                for _, msgid, error, result in unpacker:
+                    future, timeout_handle = self.pending.pop(msgid, (None, None))
+                    if future is None or future.done():
+                        continue
+                    timeout_handle.cancel()
+                    if error is not None:
+                        future.set_exception(msgpackrpc.error.RPCError(error))
+                    else:
+                        future.set_result(result)
+        except ConnectionError:
+            pass
+        for future, timeout_handle in self.pending.values():
+            timeout_handle.cancel()
+            if not future.done():
+                future.set_exception(ConnectionError("The connection with the AirSim server was closed"))
+        self.pending = {}
+
+
+class _AsyncRequestReplay:
+    """
+    Stands in for the msgpackrpc client while a method of the MultirotorClient is run by the AsyncMultirotorClient.
+    It returns the responses received so far, in order, and sends the next request of the method to the server
+    """
+    def __init__(self, connection, responses):
+        self.connection = connection
+        self.responses = responses
+        self.index = 0
+        self.future = None
+
+    def call(self, method, *args):
+        if self.index < len(self.responses):
+            self.index += 1
+            return self.responses[self.index - 1]
+        self.future = self.connection.call_async(method, *args)
+        raise _RequestRecorded()
+
+    def call_async(self, method, *args):
+        return self.connection.call_async(method, *args)
+
+
+class AsyncMultirotorClient:
+    """
+    Multirotor client whose methods are coroutines run on a single asyncio event loop. It has the same methods as the
+    MultirotorClient, including the custom set*Activation and get*StoredDataVec endpoints, and each of them sends its
+    request as soon as it is called. Hence, several vehicles or calls can be served concurrently with a single
+    connection and thread, e.g.:
+
+        async with AsyncMultirotorClient() as client:
+            states = await asyncio.gather(*[client.getMultirotorState(vehicle_name=name) for name in names])
+
+    The methods that wait for a task in the MultirotorClient (e.g. moveToZAsync(...).join()) return an asyncio future
+    that is done when the task finishes: await client.moveToZAsync(...)
+    """
+    def __init__(self, ip="", port=41451, timeout_value=3600):
+        if ip == "":
+            ip = "127.0.0.1"
+        self.ip = ip
+        self.port = port
+        self.timeout_value = timeout_value
+        self.connection = AsyncRPCConnection(self.ip, self.port, self.timeout_value)
+
+    async def connect(self):
+        await self.connection.connect()
+        return self
+
+    async def close(self):
+        await self.connection.close()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    def client_with(self, rpc_client):
+        """
+        MultirotorClient that sends its requests through another msgpackrpc client, without opening a connection
+        """
+        client = MultirotorClient.__new__(MultirotorClient)
+        client.ip, client.port, client.timeout_value = self.ip, self.port, self.timeout_value
+        client.client = rpc_client
+        return client
+
+    def run_method(self, method_name, args, kwargs):
+        """
+        Runs a method of the MultirotorClient with the responses received so far. When the method makes a request whose
+        response has not been received, the request is sent and the method is run again once it arrives
+        """
+        responses = []
+        replay = _AsyncRequestReplay(self.connection, responses)
+        try:
+            result = getattr(self.client_with(replay), method_name)(*args, **kwargs)
+        except _RequestRecorded:
+            return self.resolve_method(method_name, args, kwargs, responses, replay.future)
+        if asyncio.isfuture(result):
+            return result
+        return self.completed(result)
+
+    async def resolve_method(self, method_name, args, kwargs, responses, future):
+        while True:
+            responses.append(await future)
+            replay = _AsyncRequestReplay(self.connection, responses)
+            try:
+                return getattr(self.client_with(replay), method_name)(*args, **kwargs)
+            except _RequestRecorded:
+                future = replay.future
+
+    @staticmethod
+    async def completed(result):
+        return result
+
+    async def confirmConnection(self):
+        """
+        Checks the connection with the server and reports the client and server versions
+        """
+        if await self.ping():
+            print("Connected!")
+        else:
+            print("Ping returned false!")
+        server_ver, server_min_ver, client_min_ver = await asyncio.gather(
+            self.getServerVersion(), self.getMinRequiredServerVersion(), self.getMinRequiredClientVersion())
+        client_ver = await self.getClientVersion()
+        print("Client Ver:" + str(client_ver) + " (Min Req: " + str(client_min_ver) + "), Server Ver:"
+              + str(server_ver) + " (Min Req: " + str(server_min_ver) + ")")
+        print("")
+
+
+def _async_client_method(method_name):
+    method = getattr(MultirotorClient, method_name)
+
+    def async_method(self, *args, **kwargs):
+        return self.run_method(method_name, args, kwargs)
+    async_method.__name__ = method_name
+    async_method.__doc__ = method.__doc__
+    return async_method
+
+
+for _method_name, _ in inspect.getmembers(MultirotorClient, inspect.isfunction):
+    if not _method_name.startswith("_") and not hasattr(AsyncMultirotorClient, _method_name) and \
+            _method_name not in ("batch", "countRpcCalls"):
+        setattr(AsyncMultirotorClient, _method_name, _async_client_method(_method_name))
@@ -292,6 +292,25 @@ class ImageResponse(MsgpackMixin):
     height = 0
     image_type = ImageType.Scene
 
+    @classmethod
+    def from_msgpack(cls, encoded):
+        obj = super().from_msgpack(encoded)
+        # The float pixels are kept as a float32 array instead of a list of Python floats. The uint8 data is kept as the
+        # bytes object received, which image_data_uint8_array() views without copying it
+        if isinstance(obj.image_data_float, (bytes, bytearray, memoryview)):
+            obj.image_data_float = np.frombuffer(obj.image_data_float, dtype=np.float32)
+        elif isinstance(obj.image_data_float, (list, tuple)):
+            obj.image_data_float = np.array(obj.image_data_float, dtype=np.float32)
+        return obj
+
+    def image_data_uint8_array(self):
+        """
+        Returns the uint8 image data as a read-only numpy array that shares the memory of the received payload
+        """
+        if isinstance(self.image_data_uint8, (bytes, bytearray, memoryview)):
+            return np.frombuffer(self.image_data_uint8, dtype=np.uint8)
+        return np.asarray(self.image_data_uint8, dtype=np.uint8)
+
 class CarControls(MsgpackMixin):
     throttle = 0.0
     steering = 0.0
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the A* planner used by GridNavigation.navigation_A_star. It compares the heap-based search
+and the single-dilation obstacle inflation of AStarPlanner with the original implementation, which selects the next
+node with a linear scan over the open set and inflates the obstacles with nested loops over the complete grid. It also
+checks that both produce paths with the same cost.
+
+It should be run from the root of the repository: python -m Benchmarks.a_star_search
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import math
+import numpy as np
+from icecream import ic
+from math import sqrt, ceil
+from contextlib import redirect_stdout
+from io import StringIO
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Drone_grid_navigation.PythonRobotics.PathPlanning.AStar.a_star import AStarPlanner
+
+
+def inflate_obstacle_map_loops(grid, rr):
+    """
+    Original obstacle inflation of AStarPlanner.calc_obstacle_map, kept as reference
+    :param grid: occupancy grid
+    :param rr: robot radius in grid cells
+    :return: inflated occupancy grid
+    """
+    x_width = grid.shape[0] - 1
+    y_width = grid.shape[1] - 1
+    obstacle_map = grid.copy()
+    obstacle_map_new = grid.copy()
+    repeated_diagonals = ceil(rr / sqrt(2))
+    it_diag = 0
+    for i in range(int(rr)):
+        for x in range(x_width):
+            for y in range(y_width):
+                if obstacle_map[x, y]:
+                    obstacle_map_new[max(x - 1, 0), y] = True
+                    obstacle_map_new[min(x + 1, x_width - 1), y] = True
+                    obstacle_map_new[x, max(y - 1, 0)] = True
+                    obstacle_map_new[x, min(y + 1, y_width - 1)] = True
+                    if it_diag < repeated_diagonals:
+                        obstacle_map_new[max(x - 1, 0), max(y - 1, 0)] = True
+                        obstacle_map_new[min(x + 1, x_width - 1), max(y - 1, 0)] = True
+                        obstacle_map_new[max(x - 1, 0), min(y + 1, y_width - 1)] = True
+                        obstacle_map_new[min(x + 1, x_width - 1), min(y + 1, y_width - 1)] = True
+        it_diag += 1
+        obstacle_map = obstacle_map_new.copy()
+    return obstacle_map
+
+
+def a_star_open_set_scan(obstacle_map, start, goal):
+    """
+    Original search of AStarPlanner.planning, kept as reference. The node with the lowest cost plus heuristic is found
+    with a linear scan over the open set dictionary.
+    :param obstacle_map: inflated occupancy grid
+    :param start: start location
+    :param goal: goal location
+    :return: list of grid points from the goal to the start and the number of expanded nodes
+    """
+    motion = [(1, 0, 1), (0, 1, 1), (-1, 0, 1), (0, -1, 1),
+              (-1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (1, 1, math.sqrt(2))]
+    y_width = obstacle_map.shape[1]
+    obstacle_map = obstacle_map.tolist()
+    open_set, closed_set = {start: (0.0, None)}, {}
+    while open_set:
+        current = min(open_set, key=lambda o: open_set[o][0] + math.hypot(goal[0] - o[0], goal[1] - o[1]))
+        cost, parent = open_set.pop(current)
+        closed_set[current] = parent
+        if current == goal:
+            path = [current]
+            while closed_set[path[-1]] is not None:
+                path.append(closed_set[path[-1]])
+            return path, len(closed_set)
+        for dx, dy, move_cost in motion:
+            node = (current[0] + dx, current[1] + dy)
+            if node[0] < 0 or node[1] < 0 or node[0] >= len(obstacle_map) or node[1] >= y_width or \
+                    obstacle_map[node[0]][node[1]] or node in closed_set:
+                continue
+            if node not in open_set or open_set[node][0] > cost + move_cost:
+                open_set[node] = (cost + move_cost, current)
+    return [goal], len(closed_set)
+
+
+def path_cost(path):
+    """
+    Computes the length of a path of grid points
+    :param path: list of grid points
+    :return: length of the path
+    """
+    path = np.array(path, dtype=float)
+    return float(np.sum(np.hypot(*np.diff(path, axis=0).T)))
+
+
+def run_benchmark(shape=(200, 200), n_maps=5, n_pairs=10, robot_radius=1.8):
+    """
+    Times the original and the heap-based A* on synthetic maps and checks that the paths have the same cost
+    :param shape: shape of the synthetic maps
+    :param n_maps: number of synthetic maps
+    :param n_pairs: number of start and goal pairs planned in each map
+    :param robot_radius: robot radius in grid cells
+    :return: dictionary with the total time of each implementation in seconds
+    """
+    ic.disable()
+    n_steps = int(robot_radius)
+    times = {"inflation_loops": 0., "inflation_dilation": 0., "search_scan": 0., "search_heap": 0.}
+    expansions = {"search_scan": 0, "search_heap": 0}
+    for seed in range(n_maps):
+        grid = generate_occupancy_grid(shape=shape, seed=seed)
+
+        start_time = time.perf_counter()
+        obstacle_map_reference = inflate_obstacle_map_loops(grid, robot_radius)
+        times["inflation_loops"] += time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        planner = AStarPlanner(grid, 1, robot_radius)
+        times["inflation_dilation"] += time.perf_counter() - start_time
+
+        # The original inflation did not grow the obstacles from the last row and column of the grid
+        assert np.all(planner.obstacle_map >= obstacle_map_reference), "The inflation is less strict than the original"
+        assert np.array_equal(planner.obstacle_map[:-n_steps - 1, :-n_steps - 1],
+                              obstacle_map_reference[:-n_steps - 1, :-n_steps - 1]), "The inflated grids do not match"
+
+        for start, goal in generate_start_goal_pairs(planner.obstacle_map, n_pairs=n_pairs, seed=seed):
+            start_time = time.perf_counter()
+            path_reference, n_expansions = a_star_open_set_scan(planner.obstacle_map, start, goal)
+            times["search_scan"] += time.perf_counter() - start_time
+            expansions["search_scan"] += n_expansions
+
+            start_time = time.perf_counter()
+            with redirect_stdout(StringIO()):
+                rx, ry = planner.planning(start[0], start[1], goal[0], goal[1], animation=False)
+            times["search_heap"] += time.perf_counter() - start_time
+            expansions["search_heap"] += planner.n_expansions
+
+            assert math.isclose(path_cost(path_reference), path_cost(list(zip(rx, ry))), abs_tol=1e-9), \
+                "The path costs do not match"
+
+    print("Obstacle inflation with nested loops: %.4f s" % times["inflation_loops"])
+    print("Obstacle inflation with one dilation: %.4f s" % times["inflation_dilation"])
+    print("Speed-up: %.1fx" % (times["inflation_loops"] / times["inflation_dilation"]))
+    print("A* with open set scan: %.4f s (%d expansions)" % (times["search_scan"], expansions["search_scan"]))
+    print("A* with binary heap: %.4f s (%d expansions)" % (times["search_heap"], expansions["search_heap"]))
+    print("Speed-up: %.1fx" % (times["search_scan"] / times["search_heap"]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Provides the correctness check and benchmark of the alpha shape computation in utils.obtain_outer_edge. The array
+implementation is compared with the original triangle-by-triangle loop on random point sets, both with continuous
+coordinates and with the integer grid coordinates of the obstacles in the occupancy map.
+
+It should be run from the root of the repository: python -m Benchmarks.alpha_shape
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import numpy as np
+from scipy.spatial import Delaunay
+
+from utils import obtain_outer_edge
+
+
+def loop_obtain_outer_edge(points, alpha, only_outer=True):
+    """
+    Original triangle-by-triangle implementation of utils.obtain_outer_edge, kept as reference
+    :param points: np.array of shape (n,2) points
+    :param alpha: alpha value
+    :param only_outer: boolean value to specify if we keep only the outer border or also inner edges
+    :return: set of (i,j) pairs representing edges of the alpha-shape and array of the points in those edges
+    """
+    def add_edge(edges, i, j):
+        if (i, j) in edges or (j, i) in edges:
+            assert (j, i) in edges, "Can't go twice over same directed edge right?"
+            if only_outer:
+                edges.remove((j, i))
+            return
+        edges.add((i, j))
+
+    tri = Delaunay(points)
+    edges = set()
+    for ia, ib, ic in tri.simplices:
+        pa = points[ia]
+        pb = points[ib]
+        pc = points[ic]
+        a = np.sqrt((pa[0] - pb[0]) ** 2 + (pa[1] - pb[1]) ** 2)
+        b = np.sqrt((pb[0] - pc[0]) ** 2 + (pb[1] - pc[1]) ** 2)
+        c = np.sqrt((pc[0] - pa[0]) ** 2 + (pc[1] - pa[1]) ** 2)
+        s = (a + b + c) / 2.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            area = np.sqrt(s * (s - a) * (s - b) * (s - c))
+            circum_r = a * b * c / (4.0 * area)
+        if circum_r < alpha:
+            add_edge(edges, int(ia), int(ib))
+            add_edge(edges, int(ib), int(ic))
+            add_edge(edges, int(ic), int(ia))
+    point_indices = list(set([point for edge in edges for point in edge]))
+    output_points = points[point_indices]
+    return edges, output_points
+
+
+def random_point_sets(n_sets=500, seed=0):
+    """
+    Generates random point sets with continuous coordinates and with integer grid coordinates
+    :param n_sets: number of point sets
+    :param seed: seed of the random number generator
+    :return: list of tuples with a point set and the alpha value to use with it
+    """
+    rng = np.random.default_rng(seed)
+    point_sets = []
+    for i in range(n_sets):
+        n_points = int(rng.integers(4, 400))
+        if i % 2:
+            points = rng.uniform(0, 10, [n_points, 2])
+            alpha = rng.uniform(0.2, 5)
+        else:
+            points = np.unique(rng.integers(0, 30, [n_points, 2]), axis=0)
+            alpha = 200
+        if points.shape[0] > 3 and len(set(points[:, 0])) > 1 and len(set(points[:, 1])) > 1:
+            point_sets.append((points, alpha))
+    return point_sets
+
+
+def check_correctness(point_sets):
+    """
+    Checks that the array and the loop implementations return the same edges and the same points
+    :param point_sets: list of tuples with a point set and the alpha value to use with it
+    :return: None
+    """
+    for points, alpha in point_sets:
+        for only_outer in (True, False):
+            edges, output_points = obtain_outer_edge(points, alpha, only_outer)
+            edges_reference, output_points_reference = loop_obtain_outer_edge(points, alpha, only_outer)
+            assert edges == edges_reference, "The edges of the alpha shape do not match"
+            assert set(map(tuple, output_points.tolist())) == set(map(tuple, output_points_reference.tolist())), \
+                "The points of the alpha shape do not match"
+    print("The array and loop alpha shapes match for %d point sets" % len(point_sets))
+
+
+def run_benchmark(point_sets):
+    """
+    Times the array and the loop implementations over the same point sets
+    :param point_sets: list of tuples with a point set and the alpha value to use with it
+    :return: dictionary with the time of each implementation in seconds
+    """
+    times = {}
+    for label, function in (("loop", loop_obtain_outer_edge), ("array", obtain_outer_edge)):
+        start_time = time.perf_counter()
+        for points, alpha in point_sets:
+            function(points, alpha, True)
+        times[label] = time.perf_counter() - start_time
+
+    print("Loop alpha shape: %.4f s" % times["loop"])
+    print("Array alpha shape: %.4f s" % times["array"])
+    print("Speed-up: %.1fx" % (times["loop"] / times["array"]))
+    return times
+
+
+if __name__ == "__main__":
+    random_sets = random_point_sets()
+    check_correctness(random_sets)
+    run_benchmark(random_sets)
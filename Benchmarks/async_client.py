@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the AsyncMultirotorClient, which drives several drones from a single thread and connection.
+Against a local fake msgpack-rpc server with a configurable latency, it compares the time needed by N drones to take
+their tick snapshots (multirotor state, vehicle pose and collision information) with the approach of
+MultiThreadDataGathering, with one thread and one MultirotorClient per drone, and with the asyncio client, with all the
+requests of all the drones in flight at the same time. It also checks that both retrieve the same values.
+
+It requires the msgpack-rpc-python library used by the synchronous client and it should be run from the root of the
+repository: python -m Benchmarks.async_client
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import asyncio
+import threading
+
+from Airsim_lib_mod.client import MultirotorClient, AsyncMultirotorClient
+from Drone_flight.TickSnapshot import TickSnapshot
+from Benchmarks.fake_rpc_server import FakeRPCServer
+from Benchmarks.rpc_batch import create_handlers
+
+
+def run_threads(port, vehicle_names, n_ticks):
+    """
+    Takes the tick snapshots of every drone with one thread and one synchronous client per drone
+    :param port: port of the fake server
+    :param vehicle_names: names of the drones
+    :param n_ticks: number of ticks per drone
+    :return: the time taken and the vehicle pose of the last tick of each drone
+    """
+    clients = [MultirotorClient(port=port) for _ in vehicle_names]
+    poses = {}
+
+    def fly(client, vehicle_name):
+        for _ in range(n_ticks):
+            poses[vehicle_name] = TickSnapshot(client, vehicle_name).pose
+
+    threads = [threading.Thread(target=fly, args=(client, vehicle_name))
+               for client, vehicle_name in zip(clients, vehicle_names)]
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed_time = time.perf_counter() - start_time
+    for client in clients:
+        client.client.close()
+    return elapsed_time, poses
+
+
+async def run_async(port, vehicle_names, n_ticks):
+    """
+    Takes the tick snapshots of every drone with a single asyncio client
+    :param port: port of the fake server
+    :param vehicle_names: names of the drones
+    :param n_ticks: number of ticks per drone
+    :return: the time taken and the vehicle pose of the last tick of each drone
+    """
+    poses = {}
+    async with AsyncMultirotorClient(port=port) as client:
+        async def fly(vehicle_name):
+            for _ in range(n_ticks):
+                _, poses[vehicle_name], _ = await asyncio.gather(
+                    client.getMultirotorState(vehicle_name=vehicle_name),
+                    client.simGetVehiclePose(vehicle_name=vehicle_name),
+                    client.simGetCollisionInfo(vehicle_name=vehicle_name))
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*[fly(vehicle_name) for vehicle_name in vehicle_names])
+        elapsed_time = time.perf_counter() - start_time
+    return elapsed_time, poses
+
+
+def run_benchmark(n_drones_lst=(1, 4, 16, 64), latency=0.002, n_ticks=50):
+    """
+    Times the ticks of several drones with threads and with the asyncio client
+    :param n_drones_lst: numbers of drones flown at the same time
+    :param latency: latency of the fake server: s
+    :param n_ticks: number of ticks per drone
+    :return: dictionary with the ticks per second of both approaches for each number of drones
+    """
+    results = {}
+    server = FakeRPCServer(create_handlers(), latency=latency)
+    port = server.start()
+    print("Latency %.1f ms, %d ticks per drone" % (latency * 1e3, n_ticks))
+    for n_drones in n_drones_lst:
+        vehicle_names = ["Drone" + str(i) for i in range(n_drones)]
+        time_threads, poses_reference = run_threads(port, vehicle_names, n_ticks)
+        time_async, poses = asyncio.get_event_loop().run_until_complete(run_async(port, vehicle_names, n_ticks))
+        assert all(poses[name].position.z_val == poses_reference[name].position.z_val for name in vehicle_names), \
+            "The vehicle poses do not match"
+
+        results[n_drones] = {"threads_ticks_per_s": n_drones * n_ticks / time_threads,
+                             "async_ticks_per_s": n_drones * n_ticks / time_async}
+        print("%d drones: %.0f ticks/s with one thread per drone, %.0f ticks/s with the asyncio client (%.1fx)" %
+              (n_drones, results[n_drones]["threads_ticks_per_s"], results[n_drones]["async_ticks_per_s"],
+               time_threads / time_async))
+    server.stop()
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the collision check of the smoothed paths. It compares the exact supercover traversal of
+GridNavigation.check_collision with the original approach, which samples every segment of the path 1000 times along the
+path and the two lines parallel to it. It also checks that the supercover traversal detects every collision detected
+by the original approach.
+
+It should be run from the root of the repository: python -m Benchmarks.collision_check
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import tempfile
+import numpy as np
+from icecream import ic
+from contextlib import redirect_stdout
+from io import StringIO
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Environment_extraction.OccupancyMap import OccupancyMap
+from Drone_grid_navigation.GridNavigation import GridNavigation
+from Drone_grid_navigation.PythonRobotics.PathPlanning.BSplinePath.bspline_path import approximate_b_spline_path
+
+
+def check_collision_sampling(grid, path, distanced_obs=True):
+    """
+    Original implementation of GridNavigation.check_collision, kept as reference. Every segment is sliced 1000 times
+    and the cells of the sliced points are checked against the occupancy grid.
+    :param grid: occupancy grid
+    :param path: proposed path that the drone must follow
+    :param distanced_obs: whether a minimum distance of 1 cell should be kept from the obstacles
+    :return: whether the path collides with an obstacle
+    """
+    for i in range(len(path) - 1):
+        local_start = path[i][:2]
+        local_goal = path[i + 1][:2]
+        if local_goal[0] != local_start[0]:
+            m = (local_goal[1] - local_start[1]) / (local_goal[0] - local_start[0])
+            line_equation = lambda x: m * (x - local_start[0]) + local_start[1]
+            if distanced_obs:
+                line_equation_parallel_1 = lambda x: m * (x - local_start[0] - 1) + local_start[1]
+                line_equation_parallel_2 = lambda x: m * (x - local_start[0] + 1) + local_start[1]
+                x0 = np.linspace(local_start[0], local_goal[0], 1000)
+                x1 = np.linspace(local_start[0] + 1, local_goal[0] + 1, 1000)
+                x2 = np.linspace(local_start[0] - 1, local_goal[0] - 1, 1000)
+                y = np.array(list(map(line_equation, x0)) + list(map(line_equation_parallel_1, x1)) + list(
+                    map(line_equation_parallel_2, x2)))
+                x = np.vstack((x0, x1, x2)).flatten()
+            else:
+                x = np.linspace(local_start[0], local_goal[0], 1000)
+                y = np.array(list(map(line_equation, x)))
+        else:
+            if distanced_obs:
+                x0 = np.ones(1000) * local_start[0]
+                x1 = np.ones(1000) * local_start[0] + 1
+                x2 = np.ones(1000) * local_start[0] - 1
+                x = np.vstack((x0, x1, x2)).flatten()
+                y0 = np.linspace(local_start[1], local_goal[1], 1000)
+                y = np.vstack((y0, y0, y0)).flatten()
+            else:
+                x = np.ones(1000) * local_start[0]
+                y = np.linspace(local_start[1], local_goal[1], 1000)
+
+        x_int = np.round(x).astype(int)
+        y_int = np.round(y).astype(int)
+        coord = np.vstack((x_int, y_int)).T
+        grids_cells = np.unique(coord, axis=0)
+        for cell in grids_cells:
+            if grid.shape[0] > cell[0] >= 0 and grid.shape[1] > cell[1] >= 0:
+                if grid[cell[0], cell[1]]:
+                    return True
+    return False
+
+
+def generate_smoothed_paths(nav, n_pairs=5, robot_radius=1.8, seed=0):
+    """
+    Generates the B-spline smoothed paths of A* paths for all the reductions tried by DroneFlight.navigate_drone_grid
+    :param nav: GridNavigation object
+    :param n_pairs: number of start and goal pairs
+    :param robot_radius: robot radius in grid cells
+    :param seed: seed of the random number generator
+    :return: list of smoothed paths
+    """
+    paths = []
+    for start, goal in generate_start_goal_pairs(nav.obtain_inflated_grid(robot_radius), n_pairs=n_pairs, seed=seed):
+        with redirect_stdout(StringIO()):
+            path = nav.navigation_A_star(start, goal, robot_radius)
+        for reduction in np.arange(0.05, 1.05, 0.05):
+            n_course_point = max(int(len(path) * reduction), 2)
+            rax, ray = approximate_b_spline_path([i[0] for i in path], [i[1] for i in path], n_course_point, degree=2)
+            paths.append([(round(i), round(j)) for i, j in zip(rax, ray)])
+    return paths
+
+
+def run_benchmark(shape=(200, 200), n_maps=2, n_pairs=3):
+    """
+    Times the sampling and the supercover collision checks on the smoothed paths of synthetic maps and checks that
+    every collision found by the sampling is also found by the supercover traversal
+    :param shape: shape of the synthetic maps
+    :param n_maps: number of synthetic maps
+    :param n_pairs: number of start and goal pairs planned in each map
+    :return: dictionary with the total time of each implementation in seconds
+    """
+    ic.disable()
+    times = {"sampling": 0., "supercover": 0.}
+    collisions = {"sampling": 0, "supercover": 0}
+    n_paths = 0
+    for seed in range(n_maps):
+        om = OccupancyMap(folder=tempfile.mkdtemp(), extent_x=shape[0], extent_y=shape[1])
+        om.grid = generate_occupancy_grid(shape=shape, seed=seed)
+        nav = GridNavigation(om, False, False)
+        for path in generate_smoothed_paths(nav, n_pairs=n_pairs, seed=seed):
+            start_time = time.perf_counter()
+            collision_reference = check_collision_sampling(om.grid, path)
+            times["sampling"] += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            collision = nav.check_collision(path)
+            times["supercover"] += time.perf_counter() - start_time
+
+            assert collision or not collision_reference, "The supercover traversal missed a collision"
+            collisions["sampling"] += collision_reference
+            collisions["supercover"] += collision
+            n_paths += 1
+
+    print("Sampling with 1000 points per segment: %.4f s (%d/%d paths collide)" %
+          (times["sampling"], collisions["sampling"], n_paths))
+    print("Supercover traversal: %.4f s (%d/%d paths collide)" % (times["supercover"], collisions["supercover"], n_paths))
+    print("Speed-up: %.1fx" % (times["sampling"] / times["supercover"]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the client side throughput of the complete data gathering pipeline. It runs
+DataGathering.gather_data_consecutive_runs against the FakeAirSimServer, without Unreal Engine 4, for each of the
+provided server latencies and reports the control ticks per second of the flights, the RPC requests and round trips per
+tick, the time taken to write the sensor data to disk and the requests served per method. The sensor data, flight
+information and point cloud are written to a temporary folder which is deleted afterwards.
+
+It requires the libraries of the data gathering, the AirSim library with the modified client.py installed as airsim, and
+it should be run from the root of the repository: python -m Benchmarks.data_gathering
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+from _init_paths import init_paths  # Setup the system paths
+init_paths()
+
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+from icecream import ic
+
+from user_input import load_user_input
+from Drone_flight.Data_gathering.DataGathering import DataGathering
+from Benchmarks.fake_airsim_server import FakeAirSimServer
+
+
+def timed(method, times):
+    """
+    Wraps a method such that the duration of each of its calls is stored
+    :param method: bound method to time
+    :param times: list where the durations are appended: s
+    :return: the wrapped method
+    """
+    def timed_method(*args, **kwargs):
+        start_time = time.perf_counter()
+        output = method(*args, **kwargs)
+        times.append(time.perf_counter() - start_time)
+        return output
+    return timed_method
+
+
+def run_data_gathering(folder, number_runs, clock_speed, vehicle_name="Drone1"):
+    """
+    Runs the data gathering of several flights against the server listening at the AirSim port
+    :param folder: folder where all the data of the flights is stored
+    :param number_runs: number of flights
+    :param clock_speed: clock speed of the simulation
+    :param vehicle_name: name of the drone
+    :return: the total time, the flight times, the writing times and the RPC requests and round trips of each tick
+    """
+    user_input = load_user_input()
+    user_input.number_runs = number_runs
+    user_input.update_saved_vertices = True
+    user_input.saved_vertices_filename = os.path.join(folder, "Fake_airsim_object_points")
+    user_input.occupancy_map_cache_folder = os.path.join(folder, "Map_cache")
+    user_input.sensors_remote_storage_location = folder
+    user_input.flight_info_remote_storage_location = folder
+    data = {"ClockSpeed": clock_speed, "Vehicles": {vehicle_name: {"X": 0, "Y": 0, "Z": 0}}}
+
+    data_gathering = DataGathering(data, user_input, vehicle_name=vehicle_name, vehicle_start_position=(0, 0, 0))
+    drone_flight = data_gathering.drone_flight
+
+    # Time the flights, in which the data is gathered and written to disk, and the writing of the sensor data
+    flight_times, write_times, rpc_calls_per_tick = [], [], []
+    obtain_sensor_data = timed(drone_flight.obtain_sensor_data, flight_times)
+
+    def obtain_sensor_data_ticks():
+        obtain_sensor_data()
+        rpc_calls_per_tick.extend(drone_flight.rpc_calls_per_tick)
+
+    drone_flight.obtain_sensor_data = obtain_sensor_data_ticks
+    drone_flight.sensors.write_to_file = timed(drone_flight.sensors.write_to_file, write_times)
+
+    start_time = time.perf_counter()
+    data_gathering.gather_data_consecutive_runs()
+    total_time = time.perf_counter() - start_time
+    drone_flight.client.client.close()
+    return total_time, flight_times, write_times, rpc_calls_per_tick
+
+
+def run_benchmark(latencies=(0.0, 0.002), number_runs=3, clock_speed=5, sensor_rates=None):
+    """
+    Runs the data gathering against the fake AirSim server for each latency
+    :param latencies: latencies of the fake server: s
+    :param number_runs: number of flights per latency
+    :param clock_speed: clock speed of the simulation
+    :param sensor_rates: sample rates of the stored signals of the fake server: Hz. If None, the requested ones
+    :return: dictionary with the results of each latency
+    """
+    ic.disable()
+    results = {}
+    for latency in latencies:
+        folder = tempfile.mkdtemp()
+        server = FakeAirSimServer(latency=latency, clock_speed=clock_speed, sensor_rates=sensor_rates)
+        server.start()
+        try:
+            total_time, flight_times, write_times, rpc_calls_per_tick = run_data_gathering(folder, number_runs,
+                                                                                            clock_speed)
+        finally:
+            server.stop()
+            shutil.rmtree(folder)
+
+        loop_time = sum(flight_times) - sum(write_times)
+        requests_per_tick, round_trips_per_tick = np.mean(rpc_calls_per_tick, axis=0)
+        results[latency] = {"total_time_s": total_time, "loop_time_s": loop_time, "write_time_s": sum(write_times),
+                            "ticks": len(rpc_calls_per_tick), "ticks_per_s": len(rpc_calls_per_tick) / loop_time,
+                            "requests_per_tick": requests_per_tick, "round_trips_per_tick": round_trips_per_tick,
+                            "requests": server.n_requests, "images": server.n_images,
+                            "sensor_samples": server.n_samples, "requests_per_method": server.requests_per_method}
+
+        result = results[latency]
+        print("Latency %.1f ms, %d runs at clock speed %g: %.1f s in total" %
+              (latency * 1e3, number_runs, clock_speed, total_time))
+        print("    Flight loop: %d ticks in %.2f s, %.0f ticks/s, %.1f requests and %.1f round trips per tick" %
+              (result["ticks"], loop_time, result["ticks_per_s"], requests_per_tick, round_trips_per_tick))
+        print("    Writing to disk: %.2f s for %d images and %d sensor samples" %
+              (result["write_time_s"], result["images"], result["sensor_samples"]))
+        methods = sorted(server.requests_per_method.items(), key=lambda item: -item[1])
+        print("    Requests: %d, " % server.n_requests + ", ".join("%s %d" % method for method in methods[:6]))
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
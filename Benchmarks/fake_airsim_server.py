@@ -0,0 +1,729 @@
+#!/usr/bin/env python
+"""
+Provides the FakeAirSimServer class, a local stand-in of the modified AirSim plugin that allows to run the complete
+data gathering pipeline without Unreal Engine 4, e.g. in order to profile the Python side in headless machines. It
+extends the FakeRPCServer with the subset of the AirSim API used by this project:
+- The multirotor state, vehicle pose and collision information of a simple kinematic drone that flies the paths given
+to moveOnPath at the requested velocity and falls to the ground once a failure has been injected.
+- The images of simGetImages, with synthetic PNG, uncompressed or float payloads of the requested camera size.
+- The static meshes of simGetMeshPositionVertexBuffers, a seeded scene of box buildings.
+- The set*Activation, get*StoredDataVec and clean*StoredData family of the sensor and controller signals, which are
+sampled at the activation rates or at the rates provided to the server.
+- The failure injection setters (damage coefficients, locked propellers and advanced blade damage).
+
+The simulation clock runs clock_speed times faster than the wall clock, as the ClockSpeed of the AirSim settings.
+
+It can also be launched on its own from the root of the repository, such that the main file connects to it:
+python -m Benchmarks.fake_airsim_server --latency 0.001 --clock_speed 1
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import re
+import time
+import zlib
+import struct
+import argparse
+import numpy as np
+
+from Benchmarks.fake_rpc_server import FakeRPCServer
+
+# Variables stored by each of the get*StoredDataVec methods, by the name of the signal in the RPC methods
+STORED_DATA_FIELDS = {
+    "Imu": ["timestamps", "orientation_w", "orientation_x", "orientation_y", "orientation_z", "angular_velocity_x",
+            "angular_velocity_y", "angular_velocity_z", "linear_acceleration_x", "linear_acceleration_y",
+            "linear_acceleration_z"],
+    "Barometer": ["timestamps", "altitude", "pressure", "qnh"],
+    "Magnetometer": ["timestamps", "magnetic_field_body_x", "magnetic_field_body_y", "magnetic_field_body_z"],
+    "GPS": ["timestamps", "latitude", "longitude", "altitude", "velocity_x", "velocity_y", "velocity_z", "eph", "epv",
+            "fix_type"],
+    "Pwm": ["front_left", "front_right", "back_right", "back_left"],
+    "Position": ["positions_x", "positions_y", "positions_z"],
+    "PosRef": ["pos_ref_x", "pos_ref_y", "pos_ref_z"],
+    "PosError": ["pos_error_x", "pos_error_y", "pos_error_z"],
+    "PosErrorDot": ["pos_error_dot_x", "pos_error_dot_y", "pos_error_dot_z"],
+    "Vel": ["vel_x", "vel_y", "vel_z"],
+    "VelRef": ["vel_ref_x", "vel_ref_y", "vel_ref_z"],
+    "AccRef": ["acc_ref_x", "acc_ref_y", "acc_ref_z"],
+    "YawRef": ["yaw_ref", "yaw_ref_corrected"],
+    "YawTransferFcn": ["yaw_transfer_fcn_3", "yaw_transfer_fcn_1", "yaw_transfer_fcn_1_1"],
+    "Orientation": ["orientation_x", "orientation_y", "orientation_z"],
+    "PqrRef": ["pqr_ref_x", "pqr_ref_y", "pqr_ref_z"],
+    "Pqr": ["pqr_x", "pqr_y", "pqr_z"],
+    "ThrustRef": ["current_thrust_ref_fb", "current_thrust_ref_ff"],
+    "Omegas": ["front_left", "front_right", "back_right", "back_left"],
+    "PositionIntegrator": ["position_integrator_x", "position_integrator_y", "position_integrator_z"],
+    "ThrustPi": ["thrust_P", "thrust_I"],
+    "DamagedMassForces": ["damaged_mass_forces_x", "damaged_mass_forces_y", "damaged_mass_forces_z"],
+    "DamagedMassMoments": ["damaged_mass_moments_x", "damaged_mass_moments_y", "damaged_mass_moments_z"],
+    "DamagedAeroForces": ["damaged_aero_forces_x", "damaged_aero_forces_y", "damaged_aero_forces_z"],
+    "DamagedAeroMoments": ["damaged_aero_moments_x", "damaged_aero_moments_y", "damaged_aero_moments_z"],
+    "TimeInfo": ["time", "sampling_frequency"]
+}
+
+HOME_GEO_POINT = (47.641468, -122.140165, 122.0)   # Default home location of AirSim: latitude, longitude, altitude
+EARTH_RADIUS = 6378137.0                           # Radius of the Earth: m
+GRAVITY = 9.81                                     # Acceleration of gravity: m/s^2
+
+
+def vector(values=(0.0, 0.0, 0.0)):
+    """
+    Encoded Vector3r
+    :param values: x, y and z components
+    :return: dictionary with the fields of the vector
+    """
+    return {"x_val": float(values[0]), "y_val": float(values[1]), "z_val": float(values[2])}
+
+
+def quaternion(yaw=0.0):
+    """
+    Encoded Quaternionr of a rotation around the z-axis
+    :param yaw: yaw angle: rad
+    :return: dictionary with the fields of the quaternion
+    """
+    return {"w_val": float(np.cos(yaw / 2)), "x_val": 0.0, "y_val": 0.0, "z_val": float(np.sin(yaw / 2))}
+
+
+def encode_png(image):
+    """
+    Encodes an RGB image in the PNG format without filtering
+    :param image: uint8 array of shape (height, width, 3)
+    :return: bytes of the PNG file
+    """
+    height, width, _ = image.shape
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+    rows = np.hstack([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, width * 3)])
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)) + \
+        chunk(b"IDAT", zlib.compress(rows.tobytes())) + chunk(b"IEND", b"")
+
+
+class FakeVehicle:
+    """
+    Class which stores the state of a simulated drone. The position is computed from the last motion command: hovering
+    at a fixed position or flying a path at a constant velocity, followed by a fall once a failure has been injected
+    """
+    def __init__(self, name, fall_speed=5.0):
+        """
+        Initializes the FakeVehicle object landed at the origin
+        :param name: name of the vehicle
+        :param fall_speed: vertical velocity of the drone once a failure has been injected: m/s
+        """
+        self.name = name
+        self.fall_speed = fall_speed
+        self.api_control = False
+        self.armed = False
+        self.landed = True
+        self.yaw = 0.0
+
+        # Motion command: start time, start position, points of the path, their accumulated length and the velocity
+        self.motion_time = 0.0
+        self.path = np.zeros((1, 3))
+        self.path_lengths = np.zeros(1)
+        self.velocity = 0.0
+
+        # Failure injection
+        self.failure_time = None
+        self.failure_velocity = None
+        self.damage_coefficients = [1.0] * 4
+        self.locked_propellers = [False] * 4
+        self.locked_propeller_coefficients = [1.0] * 4
+        self.blade_damage_active = False
+
+        # Sample rate and activation time of each of the stored signals
+        self.stored_data = {}
+
+    def hover(self, sim_time, position):
+        """
+        Keeps the drone at a fixed position
+        :param sim_time: simulation time of the command: s
+        :param position: position of the drone
+        :return: None
+        """
+        self.motion_time = sim_time
+        self.path = np.array([position], dtype=float)
+        self.path_lengths = np.zeros(1)
+        self.velocity = 0.0
+
+    def fly_path(self, sim_time, path, velocity):
+        """
+        Flies the drone from its current position along the provided path points at a constant velocity
+        :param sim_time: simulation time of the command: s
+        :param path: list of points to follow
+        :param velocity: velocity of the drone along the path: m/s
+        :return: None
+        """
+        self.path = np.vstack([self.positions_at([sim_time]), np.array(path, dtype=float).reshape(-1, 3)])
+        self.path_lengths = np.concatenate([[0], np.cumsum(np.linalg.norm(np.diff(self.path, axis=0), axis=1))])
+        self.motion_time = sim_time
+        self.velocity = velocity
+        self.landed = False
+
+    def positions_at(self, times):
+        """
+        Positions of the drone at the provided simulation times, assuming that the last motion command was given before
+        all of them
+        :param times: simulation times: s
+        :return: array of shape (n, 3) with the positions in the NED frame
+        """
+        times = np.asarray(times, dtype=float)
+        if self.failure_time is not None:
+            fall_times = np.maximum(times - self.failure_time, 0)
+            times = np.minimum(times, self.failure_time)
+        distances = np.clip(self.velocity * (times - self.motion_time), 0, self.path_lengths[-1])
+        positions = np.column_stack([np.interp(distances, self.path_lengths, self.path[:, i]) for i in range(3)])
+        if self.failure_time is not None:
+            positions += np.outer(fall_times, self.failure_velocity)
+            positions[:, 2] = np.minimum(positions[:, 2], 0)     # The ground is at z = 0
+        return positions
+
+    def velocities_at(self, times, dt=0.01):
+        """
+        Velocities of the drone at the provided simulation times, by finite differences of the positions
+        :param times: simulation times: s
+        :param dt: time step of the finite differences: s
+        :return: array of shape (n, 3) with the velocities in the NED frame
+        """
+        times = np.asarray(times, dtype=float)
+        return (self.positions_at(times) - self.positions_at(times - dt)) / dt
+
+    def yaw_at(self, sim_time):
+        """
+        Heading of the drone, which points along its horizontal velocity when flying a path
+        :param sim_time: simulation time: s
+        :return: yaw angle: rad
+        """
+        velocity = self.velocities_at([sim_time])[0]
+        if self.failure_time is None and np.hypot(velocity[0], velocity[1]) > 1e-3:
+            self.yaw = float(np.arctan2(velocity[1], velocity[0]))
+        return self.yaw
+
+    def has_collided(self, sim_time):
+        """
+        Whether the drone has hit the ground after a failure
+        :param sim_time: simulation time: s
+        :return: boolean
+        """
+        return self.failure_time is not None and bool(self.positions_at([sim_time])[0][2] >= 0)
+
+    def inject_failure(self, sim_time):
+        """
+        Starts the fall of the drone, keeping half of its horizontal velocity
+        :param sim_time: simulation time of the failure: s
+        :return: None
+        """
+        if self.failure_time is None and not self.landed:
+            velocity = self.velocities_at([sim_time])[0]
+            self.failure_velocity = np.array([velocity[0] / 2, velocity[1] / 2, self.fall_speed])
+            self.failure_time = sim_time
+
+    def update_failure(self, sim_time):
+        """
+        Injects the failure if any of the failure setters has damaged the drone and removes it when all of them have
+        been reset
+        :param sim_time: simulation time: s
+        :return: None
+        """
+        if min(self.damage_coefficients) < 1 or any(self.locked_propellers) or self.blade_damage_active:
+            self.inject_failure(sim_time)
+        elif self.failure_time is not None:
+            self.hover(sim_time, self.positions_at([sim_time])[0])
+            self.failure_time = None
+
+    def reset(self):
+        """
+        Brings the drone back to its initial state, landed at the origin without damage
+        :return: None
+        """
+        self.__init__(self.name, self.fall_speed)
+
+
+class FakeAirSimServer(FakeRPCServer):
+    """
+    Class which serves the subset of the AirSim RPC API used by the data gathering with a simulated drone
+    """
+    def __init__(self, latency=0.0, clock_speed=1.0, sensor_rates=None, image_size=(256, 144), n_buildings=40,
+                 scene_size=300, vehicle_names=("Drone1",), fall_speed=5.0, seed=0, host="127.0.0.1", port=41451):
+        """
+        Initializes the FakeAirSimServer object
+        :param latency: time between the arrival of a request and its response: s
+        :param clock_speed: ratio between the simulation and the wall clock speeds
+        :param sensor_rates: dictionary from the name of a stored signal in the RPC methods (e.g. "Imu") to its sample
+        rate: Hz. The signals which are not provided are sampled at the rate requested by their activation
+        :param image_size: width and height of the camera images: pixels
+        :param n_buildings: number of box buildings in the scene
+        :param scene_size: side of the square area that contains the buildings: m
+        :param vehicle_names: names of the vehicles. The first one is used when no vehicle name is given
+        :param fall_speed: vertical velocity of the drones once a failure has been injected: m/s
+        :param seed: seed of the scene and of the synthetic images and sensor signals
+        :param host: address at which the server listens
+        :param port: port at which the server listens. The default is the one of AirSim
+        """
+        super().__init__({}, latency=latency, host=host, port=port)
+        self.clock_speed = clock_speed
+        self.sensor_rates = {} if sensor_rates is None else sensor_rates
+        self.image_size = image_size
+        self.fall_speed = fall_speed
+        self.seed = seed
+        self.start_time = time.perf_counter()
+        self.vehicle_names = list(vehicle_names)
+        self.vehicles = {name: FakeVehicle(name, fall_speed) for name in self.vehicle_names}
+        self.meshes = self.create_scene(n_buildings, scene_size)
+        self.images = {}    # Payload of the images, by image type, pixels as float and compression
+
+        # Statistics of the served data
+        self.n_images = 0
+        self.n_samples = 0
+
+        self.handlers = self.create_handlers()
+
+    def create_handlers(self):
+        """
+        Creates the handlers of the RPC methods served
+        :return: dictionary from the method names to their handlers
+        """
+        handlers = {
+            "ping": lambda: True,
+            "getServerVersion": lambda: 1,
+            "getMinRequiredClientVersion": lambda: 1,
+            "reset": self.reset,
+            "enableApiControl": self.enable_api_control,
+            "isApiControlEnabled": lambda vehicle_name: self.get_vehicle(vehicle_name).api_control,
+            "armDisarm": self.arm_disarm,
+            "getMultirotorState": self.get_multirotor_state,
+            "simGetVehiclePose": self.get_vehicle_pose,
+            "simSetVehiclePose": self.set_vehicle_pose,
+            "simGetCollisionInfo": self.get_collision_info,
+            "simListSceneObjects": self.list_scene_objects,
+            "simGetImages": self.get_images,
+            "simGetMeshPositionVertexBuffers": lambda: self.meshes,
+            "getMotorPWMs": self.get_motor_pwms,
+            "takeoff": self.take_off,
+            "hover": lambda vehicle_name: True,
+            "moveToZ": self.move_to_z,
+            "moveOnPath": self.move_on_path,
+            "setTeleportYawRef": lambda yaw_angle_ref, vehicle_name: None,
+            "setPlotDataCollectionActivation": lambda activation, vehicle_name: None,
+            "setVelocityControllerGains": lambda *gains: None,
+            "setAngleLevelControllerGains": lambda *gains: None,
+            "setAngleRateControllerGains": lambda *gains: None,
+            "setPositionControllerGains": lambda *gains: None,
+            "setDamageCoefficients": self.failure_setter("damage_coefficients"),
+            "setLockedProppellers": self.failure_setter("locked_propellers"),
+            "setLockedPropellerCoefficients": self.failure_setter("locked_propeller_coefficients"),
+            "getDamageCoefficients": lambda vehicle_name: self.get_vehicle(vehicle_name).damage_coefficients,
+            "getLockedPropellers": lambda vehicle_name: self.get_vehicle(vehicle_name).locked_propellers,
+            "getLockedPropellerCoefficients":
+                lambda vehicle_name: self.get_vehicle(vehicle_name).locked_propeller_coefficients,
+            "setDamageCoefficientAdvanced": lambda propeller, blade, coefficient, start_angle, vehicle_name: None,
+            "resetDamageCoefficientAdvanced": self.reset_blade_damage,
+            "setSwitchActivateBladeDamageAdvanced": self.switch_blade_damage
+        }
+        for signal in STORED_DATA_FIELDS:
+            handlers["set" + signal + "Activation"] = self.stored_data_activation(signal)
+            handlers["get" + signal + "StoredDataVec"] = self.stored_data_getter(signal)
+            handlers["clean" + signal + "StoredData"] = self.stored_data_cleaner(signal)
+        return handlers
+
+    def sim_time(self):
+        """
+        Current simulation time
+        :return: time since the server was created, scaled with the clock speed: s
+        """
+        return (time.perf_counter() - self.start_time) * self.clock_speed
+
+    def get_vehicle(self, vehicle_name):
+        """
+        Provides the vehicle with the given name, which is created if it does not exist yet
+        :param vehicle_name: name of the vehicle. If empty, the first vehicle
+        :return: FakeVehicle object
+        """
+        if vehicle_name == "":
+            vehicle_name = self.vehicle_names[0]
+        if vehicle_name not in self.vehicles:
+            self.vehicle_names.append(vehicle_name)
+            self.vehicles[vehicle_name] = FakeVehicle(vehicle_name, self.fall_speed)
+        return self.vehicles[vehicle_name]
+
+    def create_scene(self, n_buildings, scene_size):
+        """
+        Creates the static meshes of the scene: the ground and box buildings taller than the flight altitudes. As in
+        Unreal Engine 4, the vertices are given in centimetres with the z-axis pointing up, and the vertices of the
+        walls are spaced one metre apart such that any altitude slice of the point cloud contains the buildings
+        :param n_buildings: number of buildings
+        :param scene_size: side of the square area that contains the buildings: m
+        :return: list with the encoded MeshPositionVertexBuffersResponse of each mesh
+        """
+        random_state = np.random.RandomState(self.seed)
+        half_size = scene_size * 50
+        meshes = [{"position": vector(), "orientation": quaternion(), "name": "Ground",
+                   "vertices": [-half_size, -half_size, 0, half_size, -half_size, 0, half_size, half_size, 0,
+                                -half_size, half_size, 0],
+                   "indices": [0, 1, 2, 0, 2, 3]}]
+        for i in range(n_buildings):
+            center = random_state.uniform(-half_size, half_size, 2)
+            sides = random_state.uniform(1000, 3000, 2)
+            height = random_state.uniform(4000, 6000)
+
+            # Points along the perimeter of the footprint, repeated at every level of the walls
+            corners = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1], [-1, -1]]) * sides / 2 + center
+            perimeter = np.vstack([np.linspace(corners[j], corners[j + 1], int(np.ceil(sides[j % 2] / 100)),
+                                               endpoint=False) for j in range(4)])
+            levels = np.arange(0, height + 100, 100)
+            vertices = np.column_stack([np.tile(perimeter, (len(levels), 1)), np.repeat(levels, len(perimeter))])
+            meshes.append({"position": vector((center[0] / 100, center[1] / 100, 0)), "orientation": quaternion(),
+                           "name": "Building_" + str(i), "vertices": vertices.ravel().tolist(),
+                           "indices": list(range(len(vertices)))})
+        return meshes
+
+    def reset(self):
+        """
+        Brings all the vehicles back to their initial state
+        :return: None
+        """
+        for vehicle in self.vehicles.values():
+            vehicle.reset()
+
+    def enable_api_control(self, is_enabled, vehicle_name):
+        """
+        Enables or disables the API control of a vehicle
+        :param is_enabled: whether the API control is enabled
+        :param vehicle_name: name of the vehicle
+        :return: None
+        """
+        self.get_vehicle(vehicle_name).api_control = is_enabled
+
+    def arm_disarm(self, arm, vehicle_name):
+        """
+        Arms or disarms a vehicle
+        :param arm: whether the vehicle is armed
+        :param vehicle_name: name of the vehicle
+        :return: True
+        """
+        self.get_vehicle(vehicle_name).armed = arm
+        return True
+
+    def get_multirotor_state(self, vehicle_name):
+        """
+        Encoded MultirotorState of a vehicle
+        :param vehicle_name: name of the vehicle
+        :return: dictionary with the fields of the state
+        """
+        sim_time = self.sim_time()
+        vehicle = self.get_vehicle(vehicle_name)
+        position = vehicle.positions_at([sim_time])[0]
+        linear_velocity = vehicle.velocities_at([sim_time])[0]
+        latitude, longitude, altitude = self.geo_point(position)
+        return {"collision": self.get_collision_info(vehicle_name),
+                "kinematics_estimated": {"position": vector(position),
+                                         "orientation": quaternion(vehicle.yaw_at(sim_time)),
+                                         "linear_velocity": vector(linear_velocity), "angular_velocity": vector(),
+                                         "linear_acceleration": vector(), "angular_acceleration": vector()},
+                "gps_location": {"latitude": float(latitude), "longitude": float(longitude),
+                                 "altitude": float(altitude)},
+                "timestamp": int(sim_time * 1e9), "landed_state": int(not vehicle.landed),
+                "rc_data": {"timestamp": 0, "pitch": 0.0, "roll": 0.0, "throttle": 0.0, "yaw": 0.0, "switch1": 0,
+                            "switch2": 0, "switch3": 0, "switch4": 0, "switch5": 0, "switch6": 0, "switch7": 0,
+                            "switch8": 0, "is_initialized": False, "is_valid": False},
+                "ready": True, "ready_message": "", "can_arm": True}
+
+    def get_vehicle_pose(self, vehicle_name):
+        """
+        Encoded Pose of a vehicle
+        :param vehicle_name: name of the vehicle
+        :return: dictionary with the fields of the pose
+        """
+        sim_time = self.sim_time()
+        vehicle = self.get_vehicle(vehicle_name)
+        return {"position": vector(vehicle.positions_at([sim_time])[0]),
+                "orientation": quaternion(vehicle.yaw_at(sim_time))}
+
+    def set_vehicle_pose(self, pose, ignore_collision, vehicle_name):
+        """
+        Teleports a vehicle, which then hovers at the new pose
+        :param pose: encoded Pose
+        :param ignore_collision: whether the collisions are ignored
+        :param vehicle_name: name of the vehicle
+        :return: None
+        """
+        vehicle = self.get_vehicle(vehicle_name)
+        position, orientation = pose["position"], pose["orientation"]
+        vehicle.hover(self.sim_time(), [position["x_val"], position["y_val"], position["z_val"]])
+        vehicle.yaw = 2 * np.arctan2(orientation["z_val"], orientation["w_val"])
+        vehicle.landed = position["z_val"] >= 0
+
+    def get_collision_info(self, vehicle_name):
+        """
+        Encoded CollisionInfo of a vehicle. The only collision simulated is the one with the ground after a failure
+        :param vehicle_name: name of the vehicle
+        :return: dictionary with the fields of the collision information
+        """
+        sim_time = self.sim_time()
+        vehicle = self.get_vehicle(vehicle_name)
+        if vehicle.has_collided(sim_time):
+            position = vector(vehicle.positions_at([sim_time])[0])
+            return {"has_collided": True, "normal": vector((0, 0, -1)), "impact_point": position, "position": position,
+                    "penetration_depth": 0.0, "time_stamp": int(sim_time * 1e9), "object_name": "Ground",
+                    "object_id": -1}
+        return {"has_collided": False, "normal": vector(), "impact_point": vector(), "position": vector(),
+                "penetration_depth": 0.0, "time_stamp": 0, "object_name": "", "object_id": -1}
+
+    def list_scene_objects(self, name_regex):
+        """
+        Names of the objects in the scene, including the vehicles
+        :param name_regex: regular expression that the names should match
+        :return: list of names
+        """
+        names = [mesh["name"] for mesh in self.meshes] + self.vehicle_names
+        return [name for name in names if re.fullmatch(name_regex, name)]
+
+    def geo_point(self, position):
+        """
+        Geographic coordinates of a position, with a flat Earth approximation around the home location
+        :param position: position in the NED frame, or array of shape (3, n) with several positions: m
+        :return: latitude, longitude and altitude
+        """
+        latitude = HOME_GEO_POINT[0] + np.degrees(position[0] / EARTH_RADIUS)
+        longitude = HOME_GEO_POINT[1] + np.degrees(position[1] / (EARTH_RADIUS * np.cos(np.radians(HOME_GEO_POINT[0]))))
+        return latitude, longitude, HOME_GEO_POINT[2] - position[2]
+
+    def get_images(self, requests, vehicle_name):
+        """
+        Encoded ImageResponse of each image request, with a synthetic payload
+        :param requests: list of encoded ImageRequest
+        :param vehicle_name: name of the vehicle
+        :return: list of dictionaries with the fields of the image responses
+        """
+        sim_time = self.sim_time()
+        vehicle = self.get_vehicle(vehicle_name)
+        position = vector(vehicle.positions_at([sim_time])[0])
+        width, height = self.image_size
+        responses = []
+        for request in requests:
+            image_data_uint8, image_data_float = self.image_payload(request["image_type"], request["pixels_as_float"],
+                                                                    request["compress"])
+            responses.append({"image_data_uint8": image_data_uint8, "image_data_float": image_data_float,
+                              "camera_name": request["camera_name"], "camera_position": position,
+                              "camera_orientation": quaternion(vehicle.yaw), "time_stamp": int(sim_time * 1e9),
+                              "message": "", "pixels_as_float": request["pixels_as_float"],
+                              "compress": request["compress"], "width": width, "height": height,
+                              "image_type": request["image_type"]})
+        self.n_images += len(responses)
+        return responses
+
+    def image_payload(self, image_type, pixels_as_float, compress):
+        """
+        Synthetic image of the camera size: a gradient with noise, such that its compression is not trivial. The
+        payloads are computed once for each kind of request
+        :param image_type: AirSim image type
+        :param pixels_as_float: whether the pixels are floats, as for depth images
+        :param compress: whether the image is compressed as PNG
+        :return: the uint8 and float payloads of the image response
+        """
+        key = (image_type, pixels_as_float, compress)
+        if key not in self.images:
+            width, height = self.image_size
+            random_state = np.random.RandomState(self.seed + image_type)
+            gradient = np.add.outer(np.arange(height) / height, np.arange(width) / width) * 100
+            if pixels_as_float:
+                self.images[key] = (b"", (gradient + random_state.uniform(0, 1, gradient.shape)).ravel().tolist())
+            else:
+                image = np.clip(gradient[:, :, None] + random_state.randint(0, 30, (height, width, 3)), 0, 255)
+                image = image.astype(np.uint8)
+                self.images[key] = (encode_png(image) if compress else image.tobytes(), [])
+        return self.images[key]
+
+    def get_motor_pwms(self, vehicle_name):
+        """
+        PWMs of the motors of a vehicle, the ones required to hover
+        :param vehicle_name: name of the vehicle
+        :return: dictionary with the PWM of each motor
+        """
+        self.get_vehicle(vehicle_name)
+        return {"front_left": 0.6, "front_right": 0.6, "back_right": 0.6, "back_left": 0.6,
+                "time_stamp": int(self.sim_time() * 1e9)}
+
+    def take_off(self, timeout_sec, vehicle_name):
+        """
+        Takes off a vehicle, which hovers 3 metres above its position
+        :param timeout_sec: maximum duration of the take-off: s
+        :param vehicle_name: name of the vehicle
+        :return: True
+        """
+        sim_time = self.sim_time()
+        vehicle = self.get_vehicle(vehicle_name)
+        position = vehicle.positions_at([sim_time])[0]
+        vehicle.hover(sim_time, [position[0], position[1], min(position[2], -3)])
+        vehicle.landed = False
+        return True
+
+    def move_to_z(self, z, velocity, timeout_sec, yaw_mode, lookahead, adaptive_lookahead, vehicle_name):
+        """
+        Moves a vehicle to an altitude, which it reaches immediately
+        :param z: altitude in the NED frame: m
+        :param velocity: vertical velocity: m/s
+        :param timeout_sec: maximum duration of the manoeuvre: s
+        :param yaw_mode: encoded YawMode
+        :param lookahead: lookahead of the path follower
+        :param adaptive_lookahead: adaptive lookahead of the path follower
+        :param vehicle_name: name of the vehicle
+        :return: True
+        """
+        sim_time = self.sim_time()
+        vehicle = self.get_vehicle(vehicle_name)
+        position = vehicle.positions_at([sim_time])[0]
+        vehicle.hover(sim_time, [position[0], position[1], z])
+        return True
+
+    def move_on_path(self, path, velocity, timeout_sec, drivetrain, yaw_mode, lookahead, adaptive_lookahead,
+                     vehicle_name):
+        """
+        Makes a vehicle fly a path at a constant velocity. As the response is sent immediately, the clients that do not
+        wait for the end of the path keep gathering data during the flight
+        :param path: list of encoded Vector3r
+        :param velocity: velocity along the path: m/s
+        :param timeout_sec: maximum duration of the flight: s
+        :param drivetrain: AirSim drivetrain type
+        :param yaw_mode: encoded YawMode
+        :param lookahead: lookahead of the path follower
+        :param adaptive_lookahead: adaptive lookahead of the path follower
+        :param vehicle_name: name of the vehicle
+        :return: True
+        """
+        points = [[point["x_val"], point["y_val"], point["z_val"]] for point in path]
+        self.get_vehicle(vehicle_name).fly_path(self.sim_time(), points, velocity)
+        return True
+
+    def failure_setter(self, attribute):
+        """
+        Creates the handler of a failure setter with one value per propeller
+        :param attribute: attribute of FakeVehicle that stores the values
+        :return: the handler
+        """
+        def set_failure(front_left, front_right, back_right, back_left, vehicle_name):
+            vehicle = self.get_vehicle(vehicle_name)
+            setattr(vehicle, attribute, [front_left, front_right, back_right, back_left])
+            vehicle.update_failure(self.sim_time())
+        return set_failure
+
+    def switch_blade_damage(self, switch_activate_blade_damage_advanced, vehicle_name):
+        """
+        Activates or deactivates the advanced blade damage of a vehicle
+        :param switch_activate_blade_damage_advanced: whether the blade damage is activated
+        :param vehicle_name: name of the vehicle
+        :return: None
+        """
+        vehicle = self.get_vehicle(vehicle_name)
+        vehicle.blade_damage_active = switch_activate_blade_damage_advanced
+        vehicle.update_failure(self.sim_time())
+
+    def reset_blade_damage(self, vehicle_name):
+        """
+        Removes the advanced blade damage of a vehicle
+        :param vehicle_name: name of the vehicle
+        :return: None
+        """
+        self.switch_blade_damage(False, vehicle_name)
+
+    def stored_data_activation(self, signal):
+        """
+        Creates the handler that starts or stops the storage of a signal
+        :param signal: name of the signal in the RPC methods
+        :return: the handler
+        """
+        def set_activation(activation, sample_rate, vehicle_name):
+            stored_data = self.get_vehicle(vehicle_name).stored_data
+            if activation:
+                stored_data[signal] = {"sample_rate": self.sensor_rates.get(signal, sample_rate),
+                                       "start_time": self.sim_time(), "end_time": None}
+            elif signal in stored_data and stored_data[signal]["end_time"] is None:
+                stored_data[signal]["end_time"] = self.sim_time()
+        return set_activation
+
+    def stored_data_getter(self, signal):
+        """
+        Creates the handler that retrieves the samples of a signal stored since its activation
+        :param signal: name of the signal in the RPC methods
+        :return: the handler
+        """
+        def get_stored_data(vehicle_name):
+            vehicle = self.get_vehicle(vehicle_name)
+            times = np.zeros(0)
+            if signal in vehicle.stored_data:
+                storage = vehicle.stored_data[signal]
+                end_time = self.sim_time() if storage["end_time"] is None else storage["end_time"]
+                times = np.arange(storage["start_time"], end_time, 1 / storage["sample_rate"])
+            self.n_samples += len(times)
+            return self.stored_data_values(vehicle, signal, times)
+        return get_stored_data
+
+    def stored_data_cleaner(self, signal):
+        """
+        Creates the handler that deletes the stored samples of a signal and stops its storage
+        :param signal: name of the signal in the RPC methods
+        :return: the handler
+        """
+        def clean_stored_data(vehicle_name):
+            self.get_vehicle(vehicle_name).stored_data.pop(signal, None)
+        return clean_stored_data
+
+    def stored_data_values(self, vehicle, signal, times):
+        """
+        Synthetic samples of a signal. The positions, velocities, altitudes and geographic coordinates follow the
+        motion of the drone, the accelerations include the gravity and the rest of the variables are noise
+        :param vehicle: FakeVehicle object
+        :param signal: name of the signal in the RPC methods
+        :param times: simulation times of the samples: s
+        :return: dictionary from the variable names to the list of their samples
+        """
+        fields = STORED_DATA_FIELDS[signal]
+        random_state = np.random.RandomState(self.seed + len(times))
+        positions = vehicle.positions_at(times)
+        values = {field: random_state.normal(0, 0.01, len(times)) for field in fields}
+        if signal in ("Position", "PosRef", "Vel", "VelRef"):
+            kinematics = positions if signal in ("Position", "PosRef") else vehicle.velocities_at(times)
+            for i, field in enumerate(fields):
+                values[field] = kinematics[:, i]
+        elif signal in ("Barometer", "GPS"):
+            values["altitude"] = HOME_GEO_POINT[2] - positions[:, 2]
+            if signal == "GPS":
+                values["latitude"], values["longitude"], _ = self.geo_point(positions.T)
+        if "timestamps" in values:
+            values["timestamps"] = (times * 1e9).astype(np.int64)
+        if "time" in values:
+            values["time"] = times
+        if "linear_acceleration_z" in values:
+            values["linear_acceleration_z"] -= GRAVITY
+        if "orientation_w" in values:
+            values["orientation_w"] += 1
+        return {field: values[field].tolist() for field in fields}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in of the AirSim server used by the data gathering")
+    parser.add_argument('--latency', type=float, default=0.0, help='Latency of every request: s')
+    parser.add_argument('--clock_speed', type=float, default=1.0, help='Clock speed of the simulation.')
+    parser.add_argument('--imu_rate', type=float, default=None,
+                        help='Sample rate of the IMU: Hz. If None, the rate requested by the client.')
+    parser.add_argument('--image_size', type=int, nargs=2, default=[256, 144], help='Width and height of the images.')
+    parser.add_argument('--port', type=int, default=41451, help='Port at which the server listens.')
+    args = parser.parse_args()
+
+    server = FakeAirSimServer(latency=args.latency, clock_speed=args.clock_speed, image_size=tuple(args.image_size),
+                              sensor_rates=None if args.imu_rate is None else {"Imu": args.imu_rate}, port=args.port)
+    print("Fake AirSim server listening at port %d. Press Ctrl+C to stop it." % server.start())
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
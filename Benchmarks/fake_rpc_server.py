@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Provides the FakeRPCServer class, a local msgpack-rpc server that stands in for the AirSim server in the benchmarks of
+the client side. It answers the requests with the provided handlers after a configurable latency, which models the round
+trip to the simulator, and it counts the requests and round trips that it serves.
+
+A round trip starts when a request arrives while no response is pending, so the requests that a client pipelines before
+waiting for their responses are counted as a single round trip.
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import asyncio
+import threading
+import msgpack
+
+REQUEST = 0
+RESPONSE = 1
+
+
+class FakeRPCServer:
+    """
+    Class which serves msgpack-rpc requests in a background thread with an asyncio event loop
+    """
+    def __init__(self, handlers, latency=0.0, host="127.0.0.1", port=0):
+        """
+        Initializes the FakeRPCServer object
+        :param handlers: dictionary from the name of each method to the function that computes its result
+        :param latency: time between the arrival of a request and its response: s
+        :param host: address at which the server listens
+        :param port: port at which the server listens. If 0, a free port is chosen when the server is started
+        """
+        self.handlers = handlers
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.connections = {}   # Task serving each open connection, by its stream writer
+
+        # Statistics of the served requests
+        self.n_requests = 0
+        self.n_round_trips = 0
+        self.n_pending = 0
+        self.requests_per_method = {}
+
+    def start(self):
+        """
+        Starts the server in a background thread and waits until it is listening
+        :return: the port at which the server listens
+        """
+        ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+
+        def serve():
+            asyncio.set_event_loop(self.loop)
+            self.server = self.loop.run_until_complete(asyncio.start_server(self.handle_connection, self.host,
+                                                                            self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+            ready.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=serve, daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self.port
+
+    def stop(self):
+        """
+        Stops the server and its thread
+        :return: None
+        """
+        async def close():
+            self.server.close()
+            connections = list(self.connections.items())
+            for writer, _ in connections:
+                writer.close()
+            await asyncio.gather(*[task for _, task in connections], return_exceptions=True)
+            self.loop.stop()
+        asyncio.run_coroutine_threadsafe(close(), self.loop)
+        self.thread.join()
+        self.loop.close()
+
+    def reset_statistics(self):
+        """
+        Resets the counters of requests and round trips
+        :return: None
+        """
+        self.n_requests = 0
+        self.n_round_trips = 0
+        self.requests_per_method = {}
+
+    async def handle_connection(self, reader, writer):
+        """
+        Reads the requests of a client connection and schedules their responses
+        :param reader: asyncio stream reader of the connection
+        :param writer: asyncio stream writer of the connection
+        :return: None
+        """
+        self.connections[writer] = asyncio.current_task()
+        unpacker = msgpack.Unpacker(raw=False)
+        while True:
+            try:
+                data = await reader.read(65536)
+            except ConnectionError:
+                break
+            if not data:
+                break
+            unpacker.feed(data)
+            for message in unpacker:
+                if message[0] != REQUEST:
+                    continue
+                _, msgid, method, params = message
+                self.n_requests += 1
+                self.requests_per_method[method] = self.requests_per_method.get(method, 0) + 1
+                if self.n_pending == 0:
+                    self.n_round_trips += 1
+                self.n_pending += 1
+                self.loop.call_later(self.latency, self.respond, writer, msgid, method, params)
+        del self.connections[writer]
+        writer.close()
+
+    def respond(self, writer, msgid, method, params):
+        """
+        Computes the result of a request with its handler and sends the response
+        :param writer: asyncio stream writer of the connection
+        :param msgid: identifier of the request
+        :param method: name of the requested method
+        :param params: arguments of the request
+        :return: None
+        """
+        self.n_pending -= 1
+        error, result = None, None
+        if method not in self.handlers:
+            error = "Method not found: " + method
+        else:
+            try:
+                result = self.handlers[method](*params)
+            except Exception as e:
+                error = str(e)
+        if not writer.is_closing():
+            writer.write(msgpack.packb([RESPONSE, msgid, error, result], use_bin_type=True))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the memory allocated by the decoding of the images of simGetImages. For the uncompressed and
+float images of a flight, it compares the former decoding, with the generic MsgpackMixin.from_msgpack, which kept the
+float pixels as a list of Python floats, and the np.fromstring copy made by DroneCamera when writing the uncompressed
+images, with the current ImageResponse.from_msgpack, which stores the float pixels as a float32 array, and the
+np.frombuffer view of the received bytes. The responses are unpacked as the msgpack-rpc client does, and tracemalloc
+measures the memory retained by the stored responses of the flight and the memory allocated when they are written.
+
+It requires the msgpack-rpc-python library imported by the AirSim types and it should be run from the root of the
+repository: python -m Benchmarks.image_decoding
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import msgpack
+import tracemalloc
+import numpy as np
+
+from Airsim_lib_mod.types import MsgpackMixin, ImageResponse
+from Airsim_lib_mod.utils import get_pfm_array
+
+
+def encode_response(pixels_as_float, width=256, height=144, seed=0):
+    """
+    Packs an image response as the AirSim server sends it
+    :param pixels_as_float: whether the pixels are floats, as for depth images
+    :param width: width of the image: pixels
+    :param height: height of the image: pixels
+    :param seed: seed of the random pixels
+    :return: the packed response
+    """
+    random_state = np.random.RandomState(seed)
+    image_data_uint8, image_data_float = b"", []
+    if pixels_as_float:
+        image_data_float = random_state.uniform(0, 100, width * height).tolist()
+    else:
+        image_data_uint8 = random_state.randint(0, 256, width * height * 3).astype(np.uint8).tobytes()
+    response = {"image_data_uint8": image_data_uint8, "image_data_float": image_data_float, "camera_name": "0",
+                "camera_position": {"x_val": 0.0, "y_val": 0.0, "z_val": 0.0},
+                "camera_orientation": {"w_val": 1.0, "x_val": 0.0, "y_val": 0.0, "z_val": 0.0},
+                "time_stamp": 0, "message": "", "pixels_as_float": pixels_as_float, "compress": False,
+                "width": width, "height": height, "image_type": 1 if pixels_as_float else 0}
+    return msgpack.packb(response, use_bin_type=True)
+
+
+def generic_decoding(encoded):
+    """
+    Former decoding of the image responses, shared with the rest of the AirSim types
+    :param encoded: unpacked response
+    :return: ImageResponse object
+    """
+    return MsgpackMixin.from_msgpack.__func__(ImageResponse, encoded)
+
+
+def write_former(response):
+    """
+    Arrays written to disk by DroneCamera before, copying the uncompressed images as np.fromstring did
+    :param response: ImageResponse object
+    :return: the image array
+    """
+    if response.pixels_as_float:
+        return get_pfm_array(response)
+    return np.frombuffer(response.image_data_uint8, dtype=np.uint8).copy().reshape(response.height, response.width, 3)
+
+
+def write_current(response):
+    """
+    Arrays written to disk by DroneCamera now, viewing the uncompressed images without copying them
+    :param response: ImageResponse object
+    :return: the image array
+    """
+    if response.pixels_as_float:
+        return get_pfm_array(response)
+    return response.image_data_uint8_array().reshape(response.height, response.width, 3)
+
+
+def measure(packed, decode, write):
+    """
+    Decodes and stores the responses of a flight and then writes them one by one, measuring the memory with
+    tracemalloc. The decoding is timed in a separate pass, without tracemalloc
+    :param packed: list with the packed responses
+    :param decode: decoding function
+    :param write: function that provides the array written to disk
+    :return: the memory retained by the stored responses and the peak memory allocated when writing one of them, both
+    in bytes, the time taken by the decoding and the checksum of the written arrays
+    """
+    start_time = time.perf_counter()
+    for data in packed:
+        decode(msgpack.unpackb(data, raw=False))
+    decode_time = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    stored_responses = [decode(msgpack.unpackb(data, raw=False)) for data in packed]
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Only the allocations made when writing are traced from here on
+    tracemalloc.start()
+    checksum = 0.0
+    for response in stored_responses:
+        checksum += float(write(response)[0, 0].sum())
+    written_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return retained, written_peak, decode_time, checksum
+
+
+def run_benchmark(n_images=320):
+    """
+    Measures the memory of the former and current decoding of the uncompressed and float images of a flight
+    :param n_images: number of images of the flight, e.g. 10 seconds at 32 frames per second
+    :return: dictionary with the results of each type of image
+    """
+    results = {}
+    for name, pixels_as_float in [("uncompressed", False), ("float", True)]:
+        packed = [encode_response(pixels_as_float)] * n_images
+        former = measure(packed, generic_decoding, write_former)
+        current = measure(packed, ImageResponse.from_msgpack, write_current)
+        assert np.isclose(former[3], current[3], rtol=1e-5), "The written images do not match"
+
+        results[name] = {"former_retained_bytes": former[0], "current_retained_bytes": current[0],
+                         "former_write_bytes": former[1], "current_write_bytes": current[1],
+                         "former_decode_time_s": former[2], "current_decode_time_s": current[2]}
+        print("%d %s images: %.1f MB retained by the stored responses before, %.1f MB now; %.0f kB allocated when "
+              "writing an image before, %.0f kB now; decoding %.1f ms before, %.1f ms now" %
+              (n_images, name, former[0] / 1e6, current[0] / 1e6, former[1] / 1e3, current[1] / 1e3,
+               former[2] * 1e3, current[2] * 1e3))
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the Informed RRT* planner used by GridNavigation.navigation_RRT_star. It compares the planner,
+which finds the obstacles close to each edge with a KD-tree and the nodes close to each sample with an incremental
+spatial index, with the original approach, which loops over all the obstacles for every edge and over all the nodes for
+every sample. It also checks that both grow the same tree and find the same path.
+
+It should be run from the root of the repository: python -m Benchmarks.informed_rrt_star
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import random
+import numpy as np
+from contextlib import redirect_stdout
+from io import StringIO
+from scipy.ndimage import binary_dilation
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Drone_grid_navigation.PythonRobotics.PathPlanning.InformedRRTStar.informed_rrt_star import InformedRRTStar
+
+
+class InformedRRTStarLoops(InformedRRTStar):
+    """
+    Original collision checks and node queries of InformedRRTStar, kept as reference
+    """
+    def get_nearest_index(self, rnd):
+        return self.get_nearest_list_index(self.node_list, rnd)
+
+    def find_near_nodes(self, newNode):
+        n_node = len(self.node_list)
+        r = 50.0 * np.sqrt((np.log(n_node) / n_node))
+        d_list = [(node.x - newNode.x) ** 2 + (node.y - newNode.y) ** 2 for node in self.node_list]
+        near_inds = [d_list.index(i) for i in d_list if i <= r ** 2]
+        return near_inds
+
+    def check_segment_collision(self, x1, y1, x2, y2):
+        for (ox, oy, size) in self.obstacle_list:
+            dd = self.distance_squared_point_to_segment(np.array([x1, y1]), np.array([x2, y2]), np.array([ox, oy]))
+            if dd <= size ** 2 or x2 > self.max_rand_x or y2 > self.max_rand_y or x2 < 0 or y2 < 0:
+                return False
+        return True
+
+
+def run_benchmark(shape=(100, 100), n_maps=3, n_pairs=2, max_iter=400):
+    """
+    Times the original and the accelerated Informed RRT* on synthetic maps and checks that they produce the same trees
+    and paths
+    :param shape: shape of the synthetic maps
+    :param n_maps: number of synthetic maps
+    :param n_pairs: number of start and goal pairs planned in each map
+    :param max_iter: maximum number of iterations of the planner
+    :return: dictionary with the total time of each implementation in seconds
+    """
+    times = {"loops": 0., "kd_tree": 0.}
+    for seed in range(n_maps):
+        grid = generate_occupancy_grid(shape=shape, n_obstacles=20, max_size=15, seed=seed)
+        ox, oy = np.where(grid)
+        obstacle_list = [(i, j, 3) for i, j in zip(ox.tolist(), oy.tolist())]
+        for start, goal in generate_start_goal_pairs(binary_dilation(grid, iterations=4), n_pairs=n_pairs, seed=seed):
+            results = {}
+            for name, planner in (("loops", InformedRRTStarLoops), ("kd_tree", InformedRRTStar)):
+                random.seed(seed)
+                rrt = planner(start=list(goal), goal=list(start), randArea_x=[0, shape[0]], randArea_y=[0, shape[1]],
+                              obstacleList=obstacle_list, only_integer=True, expandDis=10, maxIter=max_iter)
+                start_time = time.perf_counter()
+                with redirect_stdout(StringIO()):
+                    path = rrt.informed_rrt_star_search(animation=False)
+                times[name] += time.perf_counter() - start_time
+                results[name] = (path, [(node.x, node.y, node.cost, node.parent) for node in rrt.node_list])
+            assert results["loops"] == results["kd_tree"], "The trees or paths do not match"
+
+    print("Informed RRT* with loops over obstacles and nodes: %.4f s" % times["loops"])
+    print("Informed RRT* with KD-tree and spatial index: %.4f s" % times["kd_tree"])
+    print("Speed-up: %.1fx" % (times["loops"] / times["kd_tree"]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the Jump Point Search used by GridNavigation.navigation_JPS. It compares the query latency and
+the number of expanded nodes of JPSPlanner with those of AStarPlanner over many random start and goal pairs of the same
+inflated map, and checks that both find paths of the same length that only move between adjacent free cells, such that
+they can be smoothed in the same way. It also times the precomputation of the jump distances of the map.
+
+It should be run from the root of the repository: python -m Benchmarks.jump_point_search
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import numpy as np
+from icecream import ic
+from contextlib import redirect_stdout
+from io import StringIO
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Drone_grid_navigation.PythonRobotics.PathPlanning.AStar.a_star import AStarPlanner, inflate_obstacle_map
+from Drone_grid_navigation.PythonRobotics.PathPlanning.JumpPointSearch.jump_point_search import JPSPlanner, \
+    compute_jump_table
+
+
+def path_length(rx, ry):
+    """
+    Computes the length of a path
+    :param rx: x coordinates of the path
+    :param ry: y coordinates of the path
+    :return: length of the path
+    """
+    return float(np.sum(np.hypot(np.diff(rx), np.diff(ry))))
+
+
+def check_path(rx, ry, obstacle_map):
+    """
+    Checks that a path only moves between adjacent cells and that all its cells, except the start, are free
+    :param rx: x coordinates of the path, starting from the goal
+    :param ry: y coordinates of the path, starting from the goal
+    :param obstacle_map: inflated occupancy grid
+    :return: whether the path is valid
+    """
+    if len(rx) < 2:
+        return True
+    steps = np.maximum(np.abs(np.diff(rx)), np.abs(np.diff(ry)))
+    return bool(np.all(steps == 1)) and not np.any(obstacle_map[np.array(rx[:-1]), np.array(ry[:-1])])
+
+
+def run_benchmark(shape=(200, 200), n_pairs=1000, robot_radius=3, seed=0):
+    """
+    Times the A* and Jump Point Search queries on a synthetic map and checks that the paths are equivalent
+    :param shape: shape of the synthetic map
+    :param n_pairs: number of start and goal pairs
+    :param robot_radius: robot radius in grid cells
+    :param seed: seed of the synthetic map and pairs
+    :return: dictionary with the times in seconds and the number of expanded nodes
+    """
+    ic.disable()
+    grid = generate_occupancy_grid(shape=shape, n_obstacles=40, max_size=20, seed=seed)
+    obstacle_map = inflate_obstacle_map(grid, robot_radius)
+    results = {}
+
+    start_time = time.perf_counter()
+    jump_table = compute_jump_table(obstacle_map)
+    results["build"] = time.perf_counter() - start_time
+
+    a_star = AStarPlanner(grid, 1, robot_radius, obstacle_map)
+    jps = JPSPlanner(grid, 1, robot_radius, obstacle_map, jump_table)
+    pairs = generate_start_goal_pairs(obstacle_map, n_pairs=n_pairs, seed=seed)
+    results["A_star"], results["JPS"] = 0., 0.
+    results["A_star_expansions"], results["JPS_expansions"] = 0, 0
+    for start, goal in pairs:
+        with redirect_stdout(StringIO()):
+            start_time = time.perf_counter()
+            rx_reference, ry_reference = a_star.planning(start[0], start[1], goal[0], goal[1], False)
+            results["A_star"] += time.perf_counter() - start_time
+            results["A_star_expansions"] += a_star.n_expansions
+
+            start_time = time.perf_counter()
+            rx, ry = jps.planning(start[0], start[1], goal[0], goal[1], False)
+            results["JPS"] += time.perf_counter() - start_time
+            results["JPS_expansions"] += jps.n_expansions
+        assert abs(path_length(rx, ry) - path_length(rx_reference, ry_reference)) < 1e-6, \
+            "The path lengths do not match"
+        assert check_path(rx, ry, obstacle_map), "The path does not move between adjacent free cells"
+
+    print("Jump distances precomputation: %.4f s" % results["build"])
+    print("A* query latency: %.3f ms, %.0f expanded nodes" % (results["A_star"] / n_pairs * 1e3,
+                                                              results["A_star_expansions"] / n_pairs))
+    print("JPS query latency: %.3f ms, %.0f expanded nodes" % (results["JPS"] / n_pairs * 1e3,
+                                                               results["JPS_expansions"] / n_pairs))
+    print("Speed-up: %.1fx" % (results["A_star"] / results["JPS"]))
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
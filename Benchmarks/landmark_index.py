@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the landmark index used by GridNavigation.navigation_A_star when landmarks=True (ALT). It
+compares the query latency of the A* search guided by the landmark bounds with the A* search guided by the Euclidean
+distance over many random start and goal pairs of the same map, and checks that both find paths of the same length. It
+also times the construction of the index and its retrieval from the occupancy map cache.
+
+It should be run from the root of the repository: python -m Benchmarks.landmark_index
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import tempfile
+import numpy as np
+from icecream import ic
+from contextlib import redirect_stdout
+from io import StringIO
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Environment_extraction.OccupancyMap import OccupancyMap
+from Environment_extraction.OccupancyMapCache import OccupancyMapCache
+from Drone_grid_navigation.GridNavigation import GridNavigation
+
+
+def path_length(path):
+    """
+    Computes the length of a path
+    :param path: list of grid points
+    :return: length of the path
+    """
+    return float(np.sum(np.linalg.norm(np.diff(np.array(path, dtype=float), axis=0), axis=1)))
+
+
+def create_occupancy_map(grid, map_cache):
+    """
+    Creates an occupancy map with a synthetic grid, stored in the occupancy map cache under a fixed key
+    :param grid: occupancy grid
+    :param map_cache: OccupancyMapCache object
+    :return: OccupancyMap object
+    """
+    om = OccupancyMap(folder=tempfile.mkdtemp(), extent_x=grid.shape[0], extent_y=grid.shape[1])
+    om.grid = grid
+    om.map_cache = map_cache
+    om.map_cache_key = "synthetic"
+    return om
+
+
+def run_benchmark(shape=(200, 200), n_pairs=1000, robot_radius=3, seed=0):
+    """
+    Times the A* queries with and without the landmark index on a synthetic map and checks that the path lengths match
+    :param shape: shape of the synthetic map
+    :param n_pairs: number of start and goal pairs
+    :param robot_radius: robot radius in grid cells
+    :param seed: seed of the synthetic map and pairs
+    :return: dictionary with the times in seconds
+    """
+    ic.disable()
+    grid = generate_occupancy_grid(shape=shape, n_obstacles=40, max_size=20, seed=seed)
+    map_cache = OccupancyMapCache(folder=tempfile.mkdtemp())
+    times = {}
+
+    # Construction of the index and retrieval from the occupancy map cache by a new occupancy map of the same map
+    om = create_occupancy_map(grid, map_cache)
+    nav = GridNavigation(om, False, False)
+    start_time = time.perf_counter()
+    nav.obtain_landmark_index(robot_radius)
+    times["build"] = time.perf_counter() - start_time
+
+    nav_loaded = GridNavigation(create_occupancy_map(grid, map_cache), False, False)
+    start_time = time.perf_counter()
+    landmark_index = nav_loaded.obtain_landmark_index(robot_radius)
+    times["load"] = time.perf_counter() - start_time
+    assert np.array_equal(landmark_index.distances, nav.obtain_landmark_index(robot_radius).distances), \
+        "The stored index does not match"
+
+    # Queries
+    pairs = generate_start_goal_pairs(nav.obtain_inflated_grid(robot_radius), n_pairs=n_pairs, seed=seed)
+    times["A_star"], times["ALT"] = 0., 0.
+    for start, goal in pairs:
+        with redirect_stdout(StringIO()):
+            start_time = time.perf_counter()
+            path_reference = nav.navigation_A_star(start, goal, robot_radius)
+            times["A_star"] += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            path = nav.navigation_A_star(start, goal, robot_radius, landmarks=True)
+            times["ALT"] += time.perf_counter() - start_time
+        assert abs(path_length(path) - path_length(path_reference)) < 1e-3, "The path lengths do not match"
+
+    print("Landmark index construction: %.4f s" % times["build"])
+    print("Landmark index retrieval from the occupancy map cache: %.4f s" % times["load"])
+    print("A* query latency: %.3f ms" % (times["A_star"] / n_pairs * 1e3))
+    print("ALT query latency: %.3f ms" % (times["ALT"] / n_pairs * 1e3))
+    print("Speed-up: %.1fx" % (times["A_star"] / times["ALT"]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the identification of the grid cells inside the obstacles. It compares the scanline fill of
+OccupancyMap.identify_object_internal_points, restricted to the bounding box of each obstacle, with the original
+approach that calls matplotlib.path.Path.contains_points over the complete grid for each obstacle. It also checks that
+both produce the same object grid.
+
+It should be run from the root of the repository: python -m Benchmarks.obstacle_polygon_fill
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import tempfile
+import numpy as np
+from icecream import ic
+from matplotlib.path import Path
+
+from Environment_extraction.OccupancyMap import OccupancyMap
+from Benchmarks.synthetic_data import generate_object_grid_coord
+from utils import counter_clockwise_ordering, obtain_outer_edge
+
+
+def contains_points_object_grid(object_grid_coord, shape, alpha=200):
+    """
+    Original implementation of OccupancyMap.identify_object_internal_points, kept as reference. For each obstacle, all
+    the points of the grid are checked against the polygon of the obstacle.
+    :param object_grid_coord: dictionary with the grid coordinates of the points of each obstacle
+    :param shape: shape of the grid
+    :param alpha: alpha value of the alpha shape
+    :return object_grid: grid with the cells inside the obstacles equal to True
+    """
+    object_grid = np.zeros(shape, dtype=bool)
+    for name in object_grid_coord.keys():
+        object_points = np.array(list(object_grid_coord[name]))
+        if object_points.shape[0] > 3 and len(set(object_points[:, 0])) > 1 and len(set(object_points[:, 1])) > 1:
+            _, output_points_unordered = list(obtain_outer_edge(object_points, alpha, only_outer=True))
+            output_points_ordered = counter_clockwise_ordering(output_points_unordered)
+            x, y = np.meshgrid(np.arange(shape[0]), np.arange(shape[1]))
+            x, y = x.flatten(), y.flatten()
+            points = np.vstack((x, y)).T
+            p = Path(output_points_ordered)
+            grid = p.contains_points(points, radius=0.0000001)
+            mask = grid.reshape(shape[0], shape[1])
+            points_grid = points.reshape(shape[0], shape[1], 2)
+            internal_points = points_grid[mask]
+        else:
+            internal_points = object_points.reshape(-1, 2)
+        object_grid[internal_points[:, 0], internal_points[:, 1]] = True
+    return object_grid
+
+
+def run_benchmark(n_objects=300, shape=(500, 500), repetitions=3, map_workers=1):
+    """
+    Times the full-grid and the scanline identification of the obstacle cells on the same synthetic map and checks
+    that their output matches
+    :param n_objects: number of obstacles in the synthetic map
+    :param shape: shape of the synthetic map
+    :param repetitions: number of times that each implementation is timed. The fastest time is reported.
+    :param map_workers: number of processes among which the obstacles are distributed by the scanline implementation
+    :return: dictionary with the fastest time of each implementation in seconds
+    """
+    ic.disable()
+    object_grid_coord = generate_object_grid_coord(n_objects=n_objects, shape=shape)
+    om = OccupancyMap(folder=tempfile.mkdtemp(), extent_x=shape[0], extent_y=shape[1], map_workers=map_workers)
+
+    times = {"contains_points": np.inf, "scanline": np.inf}
+    for _ in range(repetitions):
+        start_time = time.perf_counter()
+        object_grid_reference = contains_points_object_grid(object_grid_coord, shape)
+        times["contains_points"] = min(times["contains_points"], time.perf_counter() - start_time)
+
+        om.object_grid_coord = {name: list(cells) for name, cells in object_grid_coord.items()}
+        om.object_grid = np.zeros(shape, dtype=bool)
+        start_time = time.perf_counter()
+        om.identify_object_internal_points()
+        times["scanline"] = min(times["scanline"], time.perf_counter() - start_time)
+
+    assert np.array_equal(object_grid_reference, om.object_grid), "The object grids do not match"
+
+    print("Full-grid Path.contains_points: %.4f s" % times["contains_points"])
+    print("Bounding box scanline fill with %d worker(s): %.4f s" % (map_workers, times["scanline"]))
+    print("Speed-up: %.1fx" % (times["contains_points"] / times["scanline"]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
+    run_benchmark(map_workers=4)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Provides the micro-benchmark of the rasterisation of the projected point cloud into the occupancy grid. It compares the
+array implementation of OccupancyMap.fill_grid_filtered_points and OccupancyMap.fill_grid_filtered_points_objects with
+the original point-by-point loop on a synthetic point cloud, and checks that both produce the same output.
+
+It should be run from the root of the repository: python -m Benchmarks.occupancy_map_rasterisation
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import tempfile
+import numpy as np
+from icecream import ic
+
+from Environment_extraction.OccupancyMap import OccupancyMap
+from Benchmarks.synthetic_data import generate_point_cloud, project_point_cloud
+
+
+def loop_fill_grid(om):
+    """
+    Original point-by-point implementation of OccupancyMap.fill_grid_filtered_points, kept as reference
+    :param om: occupancy map with the filtered points and the environment dimensions already computed
+    :return grid: occupancy grid with the occupied cells equal to True
+    """
+    grid = np.zeros([om.extent_x, om.extent_y], dtype=bool)
+    for i in range(om.filtered_points_array.shape[0]):
+        x_pos = om.filtered_points_array[i, 0]
+        y_pos = om.filtered_points_array[i, 1]
+        if x_pos > om.limit_x_max or x_pos < om.limit_x_min or y_pos > om.limit_y_max or y_pos < om.limit_y_min:
+            pass
+        else:
+            grid[int((x_pos - om.limit_x_min) / om.cell_size), int((y_pos - om.limit_y_min) / om.cell_size)] = True
+    return grid
+
+
+def loop_fill_grid_objects(om):
+    """
+    Original point-by-point implementation of OccupancyMap.fill_grid_filtered_points_objects, kept as reference
+    :param om: occupancy map with the filtered points and the environment dimensions already computed
+    :return object_grid_coord: grid coordinates for each object
+    """
+    object_grid_coord = {key: set() for key in om.filtered_points.keys()}
+    for name in om.filtered_points.keys():
+        points = om.filtered_points[name]
+        for i in range(points.shape[0]):
+            x_pos = points[i, 0]
+            y_pos = points[i, 1]
+            if x_pos > om.limit_x_max or x_pos < om.limit_x_min or y_pos > om.limit_y_max or y_pos < om.limit_y_min:
+                pass
+            else:
+                object_grid_coord[name].add((int((x_pos - om.limit_x_min) / om.cell_size),
+                                             int((y_pos - om.limit_y_min) / om.cell_size)))
+        object_grid_coord[name] = list(object_grid_coord[name])
+    return object_grid_coord
+
+
+def run_benchmark(n_objects=300, points_per_object=5000, cell_size=500, repetitions=3):
+    """
+    Times the loop and the array rasterisation on the same synthetic point cloud and checks that their output matches
+    :param n_objects: number of obstacles in the synthetic environment
+    :param points_per_object: number of vertices of each obstacle
+    :param cell_size: size of the grid cells in UE4 units
+    :param repetitions: number of times that each implementation is timed. The fastest time is reported.
+    :return: dictionary with the fastest time of each implementation in seconds
+    """
+    objects = generate_point_cloud(n_objects=n_objects, points_per_object=points_per_object)
+    om = OccupancyMap(folder=tempfile.mkdtemp(), cell_size=cell_size)
+    om.filtered_points = project_point_cloud(objects)
+    om.set_env_dims()
+    om.collect_all_points()
+    ic("Number of projected points: " + str(om.filtered_points_array.shape[0]))
+
+    times = {"loop": np.inf, "array": np.inf}
+    for _ in range(repetitions):
+        start_time = time.perf_counter()
+        om.limit_x_max = om.limit_x_min + om.extent_x * om.cell_size
+        om.limit_y_max = om.limit_y_min + om.extent_y * om.cell_size
+        grid_loop = loop_fill_grid(om)
+        object_grid_coord_loop = loop_fill_grid_objects(om)
+        times["loop"] = min(times["loop"], time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        om.grid[:] = False
+        grid_array = om.fill_grid_filtered_points()
+        object_grid_coord_array = om.fill_grid_filtered_points_objects()
+        times["array"] = min(times["array"], time.perf_counter() - start_time)
+
+    # Both implementations must fill the same cells
+    assert np.array_equal(grid_loop, grid_array), "The occupancy grids do not match"
+    for name in object_grid_coord_loop.keys():
+        assert set(object_grid_coord_loop[name]) == set(object_grid_coord_array[name]), \
+            "The grid coordinates of " + name + " do not match"
+
+    print("Loop rasterisation: %.4f s" % times["loop"])
+    print("Array rasterisation: %.4f s" % times["array"])
+    print("Speed-up: %.1fx" % (times["loop"] / times["array"]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the smoothing of the A* paths. It compares GridNavigation.smooth_path, which evaluates the
+B-spline paths of all the reductions at once, with the original loop of DroneFlight.navigate_drone_grid, which fits and
+checks the B-spline and the cubic spline for one reduction after the other. It also checks that the batched search
+chooses the same reduction and smoothed path as the original loop.
+
+It should be run from the root of the repository: python -m Benchmarks.path_smoothing
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import tempfile
+import warnings
+import numpy as np
+from icecream import ic
+from contextlib import redirect_stdout
+from io import StringIO
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Environment_extraction.OccupancyMap import OccupancyMap
+from Drone_grid_navigation.GridNavigation import GridNavigation
+
+
+def smooth_path_loop(nav, path):
+    """
+    Original smoothing loop of DroneFlight.navigate_drone_grid, kept as reference
+    :param nav: GridNavigation object
+    :param path: original path from one of the navigation algorithms
+    :return: smoothed path and the reduction that succeeded, None if none did
+    """
+    path_or = path.copy()
+    reduction = 0.05
+    while reduction <= 1:
+        try:
+            path, collision = nav.smooth_B_spline(path_or, reduction=reduction)
+            if not collision:
+                path, collision = nav.smooth_cubic_spline(path)
+            if not collision:
+                return path, reduction
+        except Exception:
+            pass
+        reduction = np.round(reduction + 0.05, 2)
+    return path_or, None
+
+
+def run_benchmark(shape=(200, 200), n_obstacles=40, n_maps=3, n_pairs=10, robot_radius=1.8):
+    """
+    Times the original smoothing loop and the batched search of GridNavigation.smooth_path on the A* paths of synthetic
+    maps
+    :param shape: shape of the synthetic maps
+    :param n_obstacles: number of obstacles in each synthetic map
+    :param n_maps: number of synthetic maps
+    :param n_pairs: number of start and goal pairs planned in each map
+    :param robot_radius: robot radius in grid cells
+    :return: dictionary with the total time of each implementation in seconds
+    """
+    ic.disable()
+    reductions = np.round(np.arange(1, 21) * 0.05, 2)
+    times = {"loop": 0., "linear": 0.}
+    n_paths, n_failed = 0, 0
+    for seed in range(n_maps):
+        om = OccupancyMap(folder=tempfile.mkdtemp(), extent_x=shape[0], extent_y=shape[1])
+        om.grid = generate_occupancy_grid(shape=shape, n_obstacles=n_obstacles, seed=seed)
+        nav = GridNavigation(om, False, False)
+        for start, goal in generate_start_goal_pairs(nav.obtain_inflated_grid(robot_radius), n_pairs=n_pairs,
+                                                     seed=seed):
+            with redirect_stdout(StringIO()), warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                path = nav.navigation_A_star(start, goal, robot_radius)
+
+                start_time = time.perf_counter()
+                path_reference, reduction_reference = smooth_path_loop(nav, path)
+                times["loop"] += time.perf_counter() - start_time
+
+                start_time = time.perf_counter()
+                path_linear, reduction_linear = nav.smooth_path(path, reductions)
+                times["linear"] += time.perf_counter() - start_time
+
+            assert reduction_reference == reduction_linear, "The linear search chose a different reduction"
+            assert np.allclose(path_reference, path_linear), "The smoothed paths do not match"
+            n_paths += 1
+            n_failed += reduction_reference is None
+
+    print("Smoothing of %d paths, %d of them without any successful reduction" % (n_paths, n_failed))
+    print("Original loop: %.4f s" % times["loop"])
+    print("Batched linear search: %.4f s (speed-up: %.1fx)" % (times["linear"], times["loop"] / times["linear"]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
+    run_benchmark(n_obstacles=150)
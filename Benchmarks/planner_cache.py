@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the planner cache of the occupancy map. It plans several missions on the same map with a new
+GridNavigation object per mission, as done by DroneFlight.navigate_drone_grid, once emptying the planner cache before
+every mission, such that the inflated grids, road maps and obstacle transforms are recomputed, and once keeping it. It
+also checks that the deterministic planners find the same paths in both cases.
+
+It should be run from the root of the repository: python -m Benchmarks.planner_cache
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import tempfile
+import numpy as np
+from icecream import ic
+from contextlib import redirect_stdout
+from io import StringIO
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Environment_extraction.OccupancyMap import OccupancyMap
+from Drone_grid_navigation.GridNavigation import GridNavigation
+
+# Planners compared, with whether they are deterministic and the function that plans a mission
+PLANNERS = {"A_star": (True, lambda nav, start, goal, rr: nav.navigation_A_star(start, goal, rr)),
+            "wavefront": (True, lambda nav, start, goal, rr: nav.navigate_wavefront(start, goal, rr)),
+            "Voronoid": (True, lambda nav, start, goal, rr: nav.navigate_Voronoid(start, goal, rr)),
+            "PRM": (False, lambda nav, start, goal, rr: nav.navigation_PRM(start, goal, rr))}
+
+
+def run_benchmark(shape=(60, 60), n_maps=2, n_missions=5, robot_radius=2):
+    """
+    Times the planning of several missions on the same map with and without reusing the planner cache
+    :param shape: shape of the synthetic maps
+    :param n_maps: number of synthetic maps
+    :param n_missions: number of missions planned in each map
+    :param robot_radius: robot radius in grid cells
+    :return: dictionary with the total time of each planner with and without the cache in seconds
+    """
+    ic.disable()
+    times = {(name, cached): 0. for name in PLANNERS for cached in (False, True)}
+    for seed in range(n_maps):
+        om = OccupancyMap(folder=tempfile.mkdtemp(), extent_x=shape[0], extent_y=shape[1])
+        om.grid = generate_occupancy_grid(shape=shape, n_obstacles=8, max_size=10, seed=seed)
+        pairs = generate_start_goal_pairs(GridNavigation(om, False, False).obtain_inflated_grid(robot_radius + 1),
+                                          n_pairs=n_missions, min_distance=20, seed=seed)
+        for name, (deterministic, plan) in PLANNERS.items():
+            paths = {}
+            for cached in (False, True):
+                om.planner_cache.clear()
+                paths[cached] = []
+                for start, goal in pairs:
+                    if not cached:
+                        om.planner_cache.clear()
+                    np.random.seed(seed)
+                    start_time = time.perf_counter()
+                    with redirect_stdout(StringIO()):
+                        paths[cached].append(plan(GridNavigation(om, False, False), start, goal, robot_radius))
+                    times[(name, cached)] += time.perf_counter() - start_time
+            if deterministic:
+                assert paths[False] == paths[True], "The %s paths do not match" % name
+
+    for name in PLANNERS:
+        print("%s without planner cache: %.4f s" % (name, times[(name, False)]))
+        print("%s with planner cache: %.4f s" % (name, times[(name, True)]))
+        print("Speed-up: %.1fx" % (times[(name, False)] / times[(name, True)]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
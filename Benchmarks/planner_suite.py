@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+"""
+Provides the simulator-free benchmark suite of the navigation methods of GridNavigation. It runs every navigation method
+over a fixed seeded set of start and goal pairs in occupancy grids loaded from the occupancy map cache or generated
+synthetically, and records for every flight the wall time, the peak memory, the number of expanded nodes, the path
+length and whether the smoothing succeeded. The results are written to a JSON file, such that they can be compared with
+those of a previous run in order to track regressions of the planner speed.
+
+It should be run from the root of the repository, e.g.:
+python -m Benchmarks.planner_suite --output Benchmarks/Results/planner_suite.json --baseline old_results.json
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import os
+import sys
+import json
+import time
+import pickle
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+import warnings
+import numpy as np
+import scipy
+from icecream import ic
+from contextlib import redirect_stdout
+from io import StringIO
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Environment_extraction.OccupancyMap import OccupancyMap
+from Drone_grid_navigation.GridNavigation import GridNavigation
+
+# Navigation methods of GridNavigation, with the names of the navigation types of DroneFlight.navigate_drone_grid
+PLANNERS = {"A_star": lambda nav, start, goal, rr: nav.navigation_A_star(start, goal, rr),
+            "ALT": lambda nav, start, goal, rr: nav.navigation_A_star(start, goal, rr, landmarks=True),
+            "JPS": lambda nav, start, goal, rr: nav.navigation_JPS(start, goal, rr),
+            "wavefront": lambda nav, start, goal, rr: nav.navigate_wavefront(start, goal, rr),
+            "Voronoid": lambda nav, start, goal, rr: nav.navigate_Voronoid(start, goal, rr),
+            "RRT_star": lambda nav, start, goal, rr: nav.navigation_RRT_star(start, goal),
+            "PRM": lambda nav, start, goal, rr: nav.navigation_PRM(start, goal, rr)}
+
+# Reductions tried by the smoothing, as in DroneFlight
+SMOOTHING_REDUCTIONS = np.round(np.arange(1, 21) * 0.05, 2)
+
+
+def load_occupancy_grids(folder):
+    """
+    Loads the occupancy grids stored in an occupancy map cache folder
+    :param folder: location of the OccupancyMapCache folder
+    :return: list of (name, grid) tuples, empty if the folder does not exist
+    """
+    grids = []
+    if not os.path.isdir(folder):
+        return grids
+    for file in sorted(os.listdir(folder)):
+        if file.endswith('.p'):
+            with open(os.path.join(folder, file), 'rb') as f:
+                grids.append((file[:-2], pickle.load(f)["grid"]))
+    return grids
+
+
+def generate_occupancy_grids(n_maps=3, shape=(100, 100), n_obstacles=15):
+    """
+    Generates synthetic occupancy grids
+    :param n_maps: number of grids, each of them generated with its index as seed
+    :param shape: shape of the grids
+    :param n_obstacles: number of obstacles in each grid
+    :return: list of (name, grid) tuples
+    """
+    return [("synthetic_" + str(seed), generate_occupancy_grid(shape=shape, n_obstacles=n_obstacles, seed=seed))
+            for seed in range(n_maps)]
+
+
+def path_length(path):
+    """
+    Computes the length of a path
+    :param path: list of grid points
+    :return: length of the path, 0 if it has less than two points
+    """
+    if len(path) < 2:
+        return 0.
+    return float(np.sum(np.linalg.norm(np.diff(np.array(path, dtype=float), axis=0), axis=1)))
+
+
+def path_reaches(path, start, goal):
+    """
+    Checks whether a path connects the start and the goal, in either direction
+    :param path: list of grid points
+    :param start: start location
+    :param goal: target location
+    :return: whether the path starts and ends at the start and goal locations
+    """
+    if len(path) < 2:
+        return False
+    ends = (tuple(np.round(path[0]).astype(int)), tuple(np.round(path[-1]).astype(int)))
+    return ends in ((tuple(start), tuple(goal)), (tuple(goal), tuple(start)))
+
+
+def plan_flights(om, planner, pairs, robot_radius, seed, memory=False, smooth=True):
+    """
+    Plans the flights between the start and goal pairs of a map with a new GridNavigation object per flight, as done by
+    DroneFlight.navigate_drone_grid. The planner cache of the map is emptied before the first flight, so the first
+    flight includes the computation of the planner data of the map.
+    :param om: occupancy map
+    :param planner: name of the navigation method
+    :param pairs: list of (start, goal) tuples
+    :param robot_radius: robot radius in grid cells
+    :param seed: seed of the random number generators, set before every flight
+    :param memory: whether the peak memory is traced. Since tracing slows down the planners, the times are not
+    representative when it is enabled
+    :param smooth: whether the smoothing of the paths is carried out
+    :return: list with the dictionary of metrics of each flight
+    """
+    om.planner_cache.clear()
+    records = []
+    for i, (start, goal) in enumerate(pairs):
+        np.random.seed(seed + i)
+        random.seed(seed + i)
+        nav = GridNavigation(om, False, False)
+        with redirect_stdout(StringIO()), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if memory:
+                tracemalloc.start()
+            start_time = time.perf_counter()
+            path = PLANNERS[planner](nav, start, goal, robot_radius)
+            wall_time = time.perf_counter() - start_time
+            record = {"pair": i, "start": [int(c) for c in start], "goal": [int(c) for c in goal],
+                      "time_s": wall_time, "n_expansions": nav.n_expansions, "path_length": path_length(path),
+                      "n_waypoints": len(path), "success": path_reaches(path, start, goal)}
+            if memory:
+                record["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            if smooth and record["success"]:
+                start_time = time.perf_counter()
+                _, reduction = nav.smooth_path(path, SMOOTHING_REDUCTIONS)
+                record["smoothing_time_s"] = time.perf_counter() - start_time
+                record["smoothing_success"] = reduction is not None
+                record["smoothing_reduction"] = None if reduction is None else float(reduction)
+        records.append(record)
+    return records
+
+
+def run_suite(grids, planners=tuple(PLANNERS), n_pairs=10, robot_radius=3, seed=0, memory=True, smooth=True):
+    """
+    Runs the navigation methods over the start and goal pairs of every grid. The flights are first timed without
+    tracing the memory and then repeated with the memory traced, in order to obtain the peak memory without affecting
+    the times
+    :param grids: list of (name, grid) tuples
+    :param planners: names of the navigation methods
+    :param n_pairs: number of start and goal pairs per grid
+    :param robot_radius: robot radius in grid cells
+    :param seed: seed of the start and goal pairs and of the planners
+    :param memory: whether the peak memory is measured
+    :param smooth: whether the smoothing of the paths is carried out
+    :return: list with the dictionary of metrics of each flight
+    """
+    ic.disable()
+    records = []
+    for name, grid in grids:
+        om = OccupancyMap(folder=tempfile.mkdtemp(), extent_x=grid.shape[0], extent_y=grid.shape[1])
+        om.grid = np.asarray(grid, dtype=bool)
+        min_distance = min(grid.shape) // 3
+        pairs = generate_start_goal_pairs(GridNavigation(om, False, False).obtain_inflated_grid(robot_radius + 1),
+                                          n_pairs=n_pairs, min_distance=min_distance, seed=seed)
+        for planner in planners:
+            map_records = plan_flights(om, planner, pairs, robot_radius, seed, smooth=smooth)
+            if memory:
+                memory_records = plan_flights(om, planner, pairs, robot_radius, seed, memory=True, smooth=False)
+                for record, memory_record in zip(map_records, memory_records):
+                    record["peak_memory_bytes"] = memory_record["peak_memory_bytes"]
+            for record in map_records:
+                record.update({"map": name, "planner": planner})
+            records.extend(map_records)
+            print("%s %s: %.4f s" % (name, planner, sum(record["time_s"] for record in map_records)))
+    return records
+
+
+def summarise(records):
+    """
+    Summarises the metrics of each navigation method over all the flights
+    :param records: list with the dictionary of metrics of each flight
+    :return: dictionary with the summary of each navigation method
+    """
+    summary = {}
+    for planner in dict.fromkeys(record["planner"] for record in records):
+        planner_records = [record for record in records if record["planner"] == planner]
+        smoothed = [record["smoothing_success"] for record in planner_records if "smoothing_success" in record]
+        expansions = [record["n_expansions"] for record in planner_records if record["n_expansions"] is not None]
+        summary[planner] = {
+            "n_flights": len(planner_records),
+            "total_time_s": sum(record["time_s"] for record in planner_records),
+            "median_time_s": statistics.median(record["time_s"] for record in planner_records),
+            "mean_expansions": statistics.mean(expansions) if expansions else None,
+            "mean_path_length": statistics.mean(record["path_length"] for record in planner_records),
+            "success_rate": statistics.mean(record["success"] for record in planner_records),
+            "smoothing_success_rate": statistics.mean(smoothed) if smoothed else None}
+        if all("peak_memory_bytes" in record for record in planner_records):
+            summary[planner]["max_peak_memory_bytes"] = max(record["peak_memory_bytes"] for record in planner_records)
+    return summary
+
+
+def obtain_metadata(parameters):
+    """
+    Collects the information of the environment in which the suite was run
+    :param parameters: parameters of the suite
+    :return: dictionary with the metadata
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"date": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": platform.python_version(),
+            "numpy": np.__version__, "scipy": scipy.__version__, "machine": platform.platform(),
+            "parameters": parameters}
+
+
+def write_results(path, records, parameters):
+    """
+    Writes the metrics of every flight and their summary to a JSON file
+    :param path: location of the file
+    :param records: list with the dictionary of metrics of each flight
+    :param parameters: parameters of the suite
+    :return: dictionary with the written results
+    """
+    results = {"metadata": obtain_metadata(parameters), "summary": summarise(records), "records": records}
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=1)
+    return results
+
+
+def compare_results(results, baseline, tolerance=1.2):
+    """
+    Compares the median flight time of each navigation method with that of a previous run
+    :param results: results of the current run
+    :param baseline: results of the previous run
+    :param tolerance: ratio between the current and previous median times above which a regression is reported
+    :return: list with the names of the navigation methods that regressed
+    """
+    regressions = []
+    for planner, summary in results["summary"].items():
+        if planner not in baseline["summary"]:
+            continue
+        ratio = summary["median_time_s"] / baseline["summary"][planner]["median_time_s"]
+        regressed = ratio > tolerance
+        print("%s: median time %.4f s vs %.4f s (%.2fx)%s" % (planner, summary["median_time_s"],
+                                                             baseline["summary"][planner]["median_time_s"], ratio,
+                                                             " REGRESSION" if regressed else ""))
+        if regressed:
+            regressions.append(planner)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulator-free benchmark suite of the navigation methods")
+    parser.add_argument('--maps_folder', type=str, default=None,
+                        help='OccupancyMapCache folder with the grids to use. If None, synthetic grids are generated.')
+    parser.add_argument('--n_maps', type=int, default=3, help='Number of synthetic grids.')
+    parser.add_argument('--shape', type=int, nargs=2, default=[100, 100], help='Shape of the synthetic grids.')
+    parser.add_argument('--n_pairs', type=int, default=10, help='Number of start and goal pairs per grid.')
+    parser.add_argument('--robot_radius', type=int, default=3, help='Robot radius in grid cells.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the start and goal pairs and of the planners.')
+    parser.add_argument('--planners', type=str, nargs='+', default=list(PLANNERS), choices=list(PLANNERS),
+                        help='Navigation methods to benchmark.')
+    parser.add_argument('--no_memory', action='store_true', help='Whether the peak memory measurement is skipped.')
+    parser.add_argument('--output', type=str, default=os.path.join("Benchmarks", "Results", "planner_suite.json"),
+                        help='Location of the JSON file with the results.')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='JSON file with the results of a previous run to compare with.')
+    parser.add_argument('--tolerance', type=float, default=1.2,
+                        help='Ratio of the median times above which a regression is reported.')
+    args = parser.parse_args()
+
+    if args.maps_folder is not None:
+        grids = load_occupancy_grids(args.maps_folder)
+    else:
+        grids = generate_occupancy_grids(args.n_maps, tuple(args.shape))
+    records = run_suite(grids, args.planners, args.n_pairs, args.robot_radius, args.seed, not args.no_memory)
+    results = write_results(args.output, records, vars(args))
+    for planner, summary in results["summary"].items():
+        print(planner, summary)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare_results(results, baseline, args.tolerance):
+            sys.exit(1)
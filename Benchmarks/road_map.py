@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the road map construction of the PRM and Voronoi planners used by
+GridNavigation.navigation_PRM and GridNavigation.navigate_Voronoid. It compares the construction that checks the
+candidate edges of all the nodes at once with the original approach, which checks the edges of every node one by one.
+It also measures the time saved by reusing the road map of a map for several start and goal pairs, as done with the
+road maps stored in the occupancy map.
+
+It should be run from the root of the repository: python -m Benchmarks.road_map
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import math
+import time
+import random
+import numpy as np
+from contextlib import redirect_stdout
+from io import StringIO
+from scipy.spatial import cKDTree
+from scipy.ndimage import binary_dilation
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Drone_grid_navigation.PythonRobotics.PathPlanning.ProbabilisticRoadMap.probabilistic_road_map import \
+    generate_road_map, generate_prm_road_map, sample_free_points, prm_planning, N_KNN, MAX_EDGE_LEN
+from Drone_grid_navigation.PythonRobotics.PathPlanning.VoronoiRoadMap.voronoi_road_map import VoronoiRoadMapPlanner
+
+
+def is_collision_loop(sx, sy, gx, gy, rr, obstacle_kd_tree):
+    """
+    Original collision check of a single edge, kept as reference
+    :param sx: x coordinate of the start of the edge
+    :param sy: y coordinate of the start of the edge
+    :param gx: x coordinate of the end of the edge
+    :param gy: y coordinate of the end of the edge
+    :param rr: robot radius
+    :param obstacle_kd_tree: KD-tree of the obstacles
+    :return: whether the edge is in collision
+    """
+    x = sx
+    y = sy
+    dx = gx - sx
+    dy = gy - sy
+    yaw = math.atan2(gy - sy, gx - sx)
+    d = math.hypot(dx, dy)
+
+    if d >= MAX_EDGE_LEN:
+        return True
+
+    n_step = round(d / rr)
+    for i in range(n_step):
+        dist, _ = obstacle_kd_tree.query([x, y])
+        if dist <= rr:
+            return True
+        x += rr * math.cos(yaw)
+        y += rr * math.sin(yaw)
+
+    dist, _ = obstacle_kd_tree.query([gx, gy])
+    return dist <= rr
+
+
+def generate_road_map_loop(sample_x, sample_y, rr, obstacle_kd_tree):
+    """
+    Original road map construction, which checks the edges of every node one by one, kept as reference
+    :param sample_x: x coordinates of the nodes
+    :param sample_y: y coordinates of the nodes
+    :param rr: robot radius
+    :param obstacle_kd_tree: KD-tree of the obstacles
+    :return: list with the indices of the nodes connected to each node
+    """
+    road_map = []
+    n_sample = len(sample_x)
+    sample_kd_tree = cKDTree(np.vstack((sample_x, sample_y)).T)
+
+    for (i, ix, iy) in zip(range(n_sample), sample_x, sample_y):
+        dists, indexes = sample_kd_tree.query([ix, iy], k=n_sample)
+        edge_id = []
+        for ii in range(1, len(indexes)):
+            nx = sample_x[indexes[ii]]
+            ny = sample_y[indexes[ii]]
+            if not is_collision_loop(ix, iy, nx, ny, rr, obstacle_kd_tree):
+                edge_id.append(indexes[ii])
+            if len(edge_id) >= N_KNN:
+                break
+        road_map.append(edge_id)
+    return road_map
+
+
+def run_benchmark(shape=(100, 100), n_maps=3, n_pairs=5, robot_radius=1.8):
+    """
+    Times the original and the batched road map construction of the PRM and Voronoi planners on synthetic maps and
+    checks that the PRM road maps match. The Voronoi vertices are truncated to integers, so several of them coincide and
+    the order among neighbours at the same distance, now by index, may differ from the original one. Then, only the share
+    of Voronoi vertices with the same edges is reported.
+    :param shape: shape of the synthetic maps
+    :param n_maps: number of synthetic maps
+    :param n_pairs: number of start and goal pairs planned in each map
+    :param robot_radius: robot radius used for the collision checks
+    :return: dictionary with the total time of each step in seconds
+    """
+    times = {"prm_loop": 0., "prm_batch": 0., "voronoi_loop": 0., "voronoi_batch": 0., "plan_rebuild": 0.,
+             "plan_reuse": 0.}
+    n_equal_nodes, n_nodes = 0, 0
+    for seed in range(n_maps):
+        grid = generate_occupancy_grid(shape=shape, n_obstacles=15, seed=seed)
+        ox, oy = np.where(grid)
+        ox, oy = ox.tolist(), oy.tolist()
+        obstacle_kd_tree = cKDTree(np.vstack((ox, oy)).T)
+
+        # PRM road maps
+        np.random.seed(seed)
+        sample_x, sample_y = sample_free_points(robot_radius, ox, oy, obstacle_kd_tree)
+        start_time = time.perf_counter()
+        road_map_loop = generate_road_map_loop(sample_x, sample_y, robot_radius, obstacle_kd_tree)
+        times["prm_loop"] += time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        road_map_batch = generate_road_map(sample_x, sample_y, robot_radius, obstacle_kd_tree)
+        times["prm_batch"] += time.perf_counter() - start_time
+        assert [list(map(int, e)) for e in road_map_loop] == road_map_batch, "The PRM road maps do not match"
+
+        # Voronoi road maps
+        planner = VoronoiRoadMapPlanner(max(ox), max(oy), only_integers=True, show_animation=False)
+        vertex_x, vertex_y = planner.voronoi_vertices(ox, oy, True)
+        start_time = time.perf_counter()
+        road_map_loop = generate_road_map_loop(vertex_x, vertex_y, robot_radius, obstacle_kd_tree)
+        times["voronoi_loop"] += time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        road_map_batch = planner.generate_road_map_info(vertex_x, vertex_y, robot_radius, obstacle_kd_tree)
+        times["voronoi_batch"] += time.perf_counter() - start_time
+        n_equal_nodes += sum(list(map(int, a)) == b for a, b in zip(road_map_loop, road_map_batch))
+        n_nodes += len(road_map_batch)
+
+        # Planning of several start and goal pairs with and without reusing the road map
+        pairs = generate_start_goal_pairs(binary_dilation(grid, iterations=3), n_pairs=n_pairs, seed=seed)
+        road_map_info = generate_prm_road_map(ox, oy, robot_radius)
+        for start, goal in pairs:
+            with redirect_stdout(StringIO()):
+                np.random.seed(seed)
+                random.seed(seed)
+                start_time = time.perf_counter()
+                prm_planning(*start, *goal, ox, oy, robot_radius, False)
+                times["plan_rebuild"] += time.perf_counter() - start_time
+                start_time = time.perf_counter()
+                prm_planning(*start, *goal, ox, oy, robot_radius, False, road_map_info=road_map_info)
+                times["plan_reuse"] += time.perf_counter() - start_time
+
+    print("PRM road map with edge-by-edge checks: %.4f s" % times["prm_loop"])
+    print("PRM road map with batched checks: %.4f s" % times["prm_batch"])
+    print("Speed-up: %.1fx" % (times["prm_loop"] / times["prm_batch"]))
+    print("Voronoi road map with edge-by-edge checks: %.4f s" % times["voronoi_loop"])
+    print("Voronoi road map with batched checks: %.4f s" % times["voronoi_batch"])
+    print("Speed-up: %.1fx" % (times["voronoi_loop"] / times["voronoi_batch"]))
+    print("Voronoi vertices with the same edges as the original: %d/%d" % (n_equal_nodes, n_nodes))
+    print("PRM planning rebuilding the road map: %.4f s" % times["plan_rebuild"])
+    print("PRM planning reusing the road map of the map: %.4f s" % times["plan_reuse"])
+    print("Speed-up: %.1fx" % (times["plan_rebuild"] / times["plan_reuse"]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
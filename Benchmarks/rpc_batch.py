@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the batched calls of the AirSim client (VehicleClient.batch) used once per tick by the
+TickSnapshot of DroneFlight.obtain_sensor_data. It compares, against a local fake msgpack-rpc server with a configurable
+latency, the calls that a tick of a failed flight used to make one after the other (the multirotor state for the camera,
+the vehicle pose and three multirotor states for the goal arrival check, the collision information and the multirotor
+state for the failure timestamp) with the single snapshot of multirotor state, vehicle pose and collision information
+that the tick takes now. It reports the wall time, the RPC requests and round trips per tick counted by the client and
+by the server, and the number of different timestamps seen within a tick, and checks that both return the same values.
+The client counts a round trip every time that it blocks waiting for a response, so it can count more than the server
+when the responses of a batch arrive a moment apart.
+
+It requires the msgpack-rpc-python library used by the client and it should be run from the root of the repository:
+python -m Benchmarks.rpc_batch
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+
+from Airsim_lib_mod.client import MultirotorClient
+from Drone_flight.TickSnapshot import TickSnapshot
+from Benchmarks.fake_rpc_server import FakeRPCServer
+
+
+def vector(x_val=0.0, y_val=0.0, z_val=0.0):
+    """
+    Encoded Vector3r
+    :return: dictionary with the fields of the vector
+    """
+    return {"x_val": x_val, "y_val": y_val, "z_val": z_val}
+
+
+def create_handlers():
+    """
+    Creates the handlers of the fake server for the calls of a tick. The drone hovers at 10 metres and the timestamp
+    increases with every request of the multirotor state
+    :return: dictionary from the method names to their handlers
+    """
+    timestamp = [0]
+
+    def get_multirotor_state(vehicle_name):
+        timestamp[0] += 1000000
+        return {"kinematics_estimated": {"position": vector(1.0, 2.0, -10.0),
+                                         "orientation": {"w_val": 1.0, "x_val": 0.0, "y_val": 0.0, "z_val": 0.0},
+                                         "linear_velocity": vector(), "angular_velocity": vector(),
+                                         "linear_acceleration": vector(), "angular_acceleration": vector()},
+                "timestamp": timestamp[0], "landed_state": 1, "ready": True, "ready_message": "", "can_arm": True}
+
+    def get_vehicle_pose(vehicle_name):
+        return {"position": vector(1.0, 2.0, -10.0),
+                "orientation": {"w_val": 1.0, "x_val": 0.0, "y_val": 0.0, "z_val": 0.0}}
+
+    def get_collision_info(vehicle_name):
+        return {"has_collided": False, "normal": vector(), "impact_point": vector(), "position": vector(),
+                "penetration_depth": 0.0, "time_stamp": 0, "object_name": "", "object_id": -1}
+
+    return {"getMultirotorState": get_multirotor_state, "simGetVehiclePose": get_vehicle_pose,
+            "simGetCollisionInfo": get_collision_info}
+
+
+def sequential_tick(client, vehicle_name=""):
+    """
+    Calls made by a tick of a failed flight before the batching, one after the other
+    :param client: MultirotorClient object
+    :param vehicle_name: name of the vehicle
+    :return: the vehicle pose, the collision information and the timestamps read within the tick
+    """
+    # DroneSensors.store_camera_data
+    timestamps = [client.getMultirotorState().timestamp]
+
+    # DroneFlight.check_goal_arrival
+    pose = client.simGetVehiclePose(vehicle_name=vehicle_name)
+    timestamps.append(client.getMultirotorState(vehicle_name=vehicle_name).timestamp)
+    collision_info = client.simGetCollisionInfo(vehicle_name=vehicle_name)
+    timestamps.append(client.getMultirotorState(vehicle_name=vehicle_name).timestamp)
+    timestamps.append(client.getMultirotorState(vehicle_name=vehicle_name).timestamp)
+
+    # FailureFactory.execute_failures
+    timestamps.append(client.getMultirotorState(vehicle_name=vehicle_name).timestamp)
+    return pose, collision_info, timestamps
+
+
+def batched_tick(client, vehicle_name=""):
+    """
+    Calls made by a tick with the snapshot, as in DroneFlight.obtain_sensor_data
+    :param client: MultirotorClient object
+    :param vehicle_name: name of the vehicle
+    :return: the vehicle pose, the collision information and the timestamps read within the tick
+    """
+    snapshot = TickSnapshot(client, vehicle_name)
+    return snapshot.pose, snapshot.collision_info, [snapshot.timestamp] * 5
+
+
+def run_benchmark(latencies=(0.0, 0.001, 0.005), n_ticks=200):
+    """
+    Times the ticks with and without batching for each latency of the fake server
+    :param latencies: latencies of the fake server: s
+    :param n_ticks: number of ticks timed per latency
+    :return: dictionary with the time and round trips per tick of each latency
+    """
+    results = {}
+    for latency in latencies:
+        server = FakeRPCServer(create_handlers(), latency=latency)
+        client = MultirotorClient(port=server.start())
+        rpc_counter = client.countRpcCalls()
+
+        # The batched calls return the same values as the sequential ones
+        pose_reference, collision_info_reference, _ = sequential_tick(client)
+        pose, collision_info, _ = batched_tick(client)
+        assert pose.position.z_val == pose_reference.position.z_val, "The vehicle poses do not match"
+        assert collision_info.has_collided == collision_info_reference.has_collided, \
+            "The collision information does not match"
+
+        results[latency] = {}
+        for name, tick in [("sequential", sequential_tick), ("batched", batched_tick)]:
+            server.reset_statistics()
+            rpc_counter.n_requests, rpc_counter.n_round_trips = 0, 0
+            n_timestamps = 0
+            start_time = time.perf_counter()
+            for _ in range(n_ticks):
+                n_timestamps += len(set(tick(client)[2]))
+            results[latency][name] = {"time_per_tick_s": (time.perf_counter() - start_time) / n_ticks,
+                                      "requests_per_tick": server.n_requests / n_ticks,
+                                      "round_trips_per_tick": server.n_round_trips / n_ticks,
+                                      "client_requests_per_tick": rpc_counter.n_requests / n_ticks,
+                                      "client_round_trips_per_tick": rpc_counter.n_round_trips / n_ticks,
+                                      "timestamps_per_tick": n_timestamps / n_ticks}
+        client.client.close()
+        server.stop()
+
+        sequential, batched = results[latency]["sequential"], results[latency]["batched"]
+        print("Latency %.1f ms" % (latency * 1e3))
+        for name, result in [("Sequential", sequential), ("Batched", batched)]:
+            print("    %s: %.3f ms per tick, %.1f requests and %.1f round trips per tick (%.1f and %.1f counted by the "
+                  "client), %.1f different timestamps per tick" %
+                  (name, result["time_per_tick_s"] * 1e3, result["requests_per_tick"],
+                   result["round_trips_per_tick"], result["client_requests_per_tick"],
+                   result["client_round_trips_per_tick"], result["timestamps_per_tick"]))
+        print("    Speed-up: %.1fx" % (sequential["time_per_tick_s"] / batched["time_per_tick_s"]))
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
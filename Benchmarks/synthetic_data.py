@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Provides the functions that generate synthetic environments for the benchmarks, such that the computational performance
+of the code can be evaluated without having Unreal Engine 4 running in the background.
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import numpy as np
+
+
+def generate_point_cloud(n_objects=300, points_per_object=5000, extent=50000, max_object_size=1500, max_height=3000,
+                         seed=0):
+    """
+    Generates a synthetic point cloud with the same structure as the one extracted from UE4 by the OccupancyMap class:
+    a dictionary with the name of each obstacle as key and an array with the x-y-z coordinates of its vertices as value.
+    Every obstacle is a box with random location, footprint and height.
+    :param n_objects: number of obstacles in the environment
+    :param points_per_object: number of vertices of each obstacle
+    :param extent: size of the environment along the x- and y-axes in UE4 units
+    :param max_object_size: maximum size of the footprint of an obstacle along the x- and y-axes in UE4 units
+    :param max_height: maximum height of an obstacle in UE4 units
+    :param seed: seed of the random number generator
+    :return objects: dictionary with the vertices of each of the obstacles
+    """
+    rng = np.random.default_rng(seed)
+    objects = {}
+    for i in range(n_objects):
+        corner = rng.uniform(-0.5 * extent, 0.5 * extent - max_object_size, 2)
+        size = rng.uniform(0.1 * max_object_size, max_object_size, 2)
+        height = rng.uniform(0.1 * max_height, max_height)
+        points = rng.uniform(0, 1, [points_per_object, 3]) * [size[0], size[1], height]
+        points[:, :2] += corner
+        objects['object_' + str(i)] = points
+    return objects
+
+
+def project_point_cloud(objects, h=1100, delta_h=500):
+    """
+    Projects the synthetic point cloud to the x-y plane at the sliced altitude, as done by
+    OccupancyMap.project_points_altitude
+    :param objects: dictionary with the vertices of each of the obstacles
+    :param h: altitude
+    :param delta_h: range of altitudes where points can be found
+    :return filtered_points: dictionary with the filtered point cloud for each object in the environment
+    """
+    filtered_points = {}
+    for name, points in objects.items():
+        point_filtered = points[(points[:, -1] <= h + delta_h) & (points[:, -1] >= max(h - delta_h, 150))]
+        if point_filtered.size:
+            filtered_points[name] = point_filtered[:, :-1]
+    return filtered_points
+
+
+def generate_object_grid_coord(n_objects=300, shape=(500, 500), points_per_object=40, max_radius=15, seed=0):
+    """
+    Generates the grid coordinates of the points of synthetic obstacles, with the same structure as
+    OccupancyMap.object_grid_coord: a dictionary with the name of each obstacle as key and the list of the grid cells
+    occupied by its points as value. Every obstacle is a cloud of points within a randomly located and oriented ellipse.
+    :param n_objects: number of obstacles in the grid
+    :param shape: shape of the grid
+    :param points_per_object: number of points of each obstacle before removing those falling in the same cell
+    :param max_radius: maximum semi-axis of the ellipses in grid cells
+    :param seed: seed of the random number generator
+    :return object_grid_coord: dictionary with the grid coordinates of the points of each obstacle
+    """
+    rng = np.random.default_rng(seed)
+    object_grid_coord = {}
+    for i in range(n_objects):
+        center = rng.uniform(0, 1, 2) * shape
+        semi_axes = rng.uniform(2, max_radius, 2)
+        orientation = rng.uniform(0, np.pi)
+        angle = rng.uniform(0, 2 * np.pi, points_per_object)
+        radius = np.sqrt(rng.uniform(0, 1, points_per_object))
+        x_local = radius * semi_axes[0] * np.cos(angle)
+        y_local = radius * semi_axes[1] * np.sin(angle)
+        x = center[0] + x_local * np.cos(orientation) - y_local * np.sin(orientation)
+        y = center[1] + x_local * np.sin(orientation) + y_local * np.cos(orientation)
+        cells = np.column_stack((x, y)).astype(int)
+        cells = cells[(cells[:, 0] >= 0) & (cells[:, 0] < shape[0]) & (cells[:, 1] >= 0) & (cells[:, 1] < shape[1])]
+        object_grid_coord['object_' + str(i)] = list(map(tuple, np.unique(cells, axis=0).tolist()))
+    return object_grid_coord
+
+
+def generate_occupancy_grid(shape=(200, 200), n_obstacles=40, max_size=20, seed=0):
+    """
+    Generates a synthetic occupancy grid, as the one stored in OccupancyMap.grid, with randomly located rectangular
+    and elliptical obstacles
+    :param shape: shape of the grid
+    :param n_obstacles: number of obstacles in the grid
+    :param max_size: maximum size of an obstacle along the x- and y-axes in grid cells
+    :param seed: seed of the random number generator
+    :return grid: occupancy grid with the cells occupied by obstacles equal to True
+    """
+    rng = np.random.default_rng(seed)
+    x, y = np.meshgrid(np.arange(shape[0]), np.arange(shape[1]), indexing='ij')
+    grid = np.zeros(shape, dtype=bool)
+    for i in range(n_obstacles):
+        center = rng.uniform(0, 1, 2) * shape
+        semi_axes = rng.uniform(1, 0.5 * max_size, 2)
+        if rng.uniform() < 0.5:
+            grid |= (np.abs(x - center[0]) <= semi_axes[0]) & (np.abs(y - center[1]) <= semi_axes[1])
+        else:
+            grid |= ((x - center[0]) / semi_axes[0]) ** 2 + ((y - center[1]) / semi_axes[1]) ** 2 <= 1
+    return grid
+
+
+def generate_start_goal_pairs(grid, n_pairs=20, min_distance=50, seed=0):
+    """
+    Generates random start and goal locations in the free cells of the occupancy grid
+    :param grid: occupancy grid
+    :param n_pairs: number of start and goal pairs
+    :param min_distance: minimum distance between the start and the goal in grid cells
+    :param seed: seed of the random number generator
+    :return pairs: list of (start, goal) tuples of grid coordinates
+    """
+    rng = np.random.default_rng(seed)
+    free_cells = np.argwhere(~grid)
+    pairs = []
+    while len(pairs) < n_pairs:
+        start, goal = free_cells[rng.integers(0, free_cells.shape[0], 2)]
+        if np.hypot(*(start - goal)) >= min_distance:
+            pairs.append((tuple(start.tolist()), tuple(goal.tolist())))
+    return pairs
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Provides the benchmark of the path transform used by GridNavigation.navigate_wavefront. It compares the transform that
+obtains the blocked cells and the obstacle transform with scipy and the wavefront from the goal with a single Dijkstra
+search over the graph of the free cells, with the original approach, which loops over all the cells and propagates the
+wavefront with a Python breadth-first traversal. It also checks that both block the same cells and reach the same
+cells, that the new transform is never larger than the original single-pass one and that the followed paths reach the
+goal.
+
+It should be run from the root of the repository: python -m Benchmarks.wavefront_transform
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import time
+import numpy as np
+from scipy import ndimage
+from scipy.spatial import cKDTree
+from contextlib import redirect_stdout
+from io import StringIO
+
+from Benchmarks.synthetic_data import generate_occupancy_grid, generate_start_goal_pairs
+from Drone_grid_navigation.PythonRobotics.PathPlanning.WavefrontCPP.wavefront_coverage_path_planner import transform, \
+    obstacle_transform, wavefront
+
+
+def transform_loop(grid_map, src, rr, alpha=0.01):
+    """
+    Original chessboard path transform, which blocks the cells with a loop over all of them and propagates the wavefront
+    with a Python breadth-first traversal, kept as reference
+    :param grid_map: occupancy grid as float array
+    :param src: source of the transform
+    :param rr: robot radius
+    :param alpha: weight of the obstacle transform
+    :return: path transform and the map of the blocked cells
+    """
+    grid_map = grid_map.copy()
+    ox, oy = np.where(grid_map == True)
+    obstacle_tree = cKDTree(np.vstack((ox, oy)).T)
+    n_rows, n_cols = grid_map.shape
+    inc_order = [[0, 1], [1, 1], [1, 0], [1, -1], [0, -1], [-1, -1], [-1, 0], [-1, 1]]
+    cost = [1, 1, 1, 1, 1, 1, 1, 1]
+
+    transform_matrix = float('inf') * np.ones_like(grid_map, dtype=float)
+    transform_matrix[src[0], src[1]] = 0
+    eT = ndimage.distance_transform_cdt(1 - grid_map, 'chessboard')
+    for i in range(n_rows):
+        for j in range(n_cols):
+            if obstacle_tree.query([i, j])[0] <= rr:
+                grid_map[i][j] = True
+    is_visited = np.zeros_like(transform_matrix, dtype=bool)
+    is_visited[src[0], src[1]] = True
+    traversal_queue = [src]
+    calculated = [(src[0] - 1) * n_cols + src[1]]
+
+    def is_valid_neighbor(g_i, g_j):
+        return 0 <= g_i < n_rows and 0 <= g_j < n_cols and not grid_map[g_i][g_j]
+
+    while traversal_queue:
+        i, j = traversal_queue.pop(0)
+        for k, inc in enumerate(inc_order):
+            ni = i + inc[0]
+            nj = j + inc[1]
+            if is_valid_neighbor(ni, nj):
+                is_visited[i][j] = True
+                transform_matrix[i][j] = min(transform_matrix[i][j],
+                                             transform_matrix[ni][nj] + cost[k] + alpha * eT[ni][nj])
+                if not is_visited[ni][nj] and ((ni - 1) * n_cols + nj) not in calculated:
+                    traversal_queue.append((ni, nj))
+                    calculated.append((ni - 1) * n_cols + nj)
+    return transform_matrix, grid_map == True
+
+
+def run_benchmark(shape=(80, 80), n_maps=3, n_pairs=3, robot_radius=2):
+    """
+    Times the original and the new path transform on synthetic maps and checks their consistency
+    :param shape: shape of the synthetic maps
+    :param n_maps: number of synthetic maps
+    :param n_pairs: number of start and goal pairs planned in each map
+    :param robot_radius: robot radius in grid cells
+    :return: dictionary with the total time of each implementation in seconds
+    """
+    times = {"loop": 0., "dijkstra": 0., "dijkstra_cached": 0.}
+    for seed in range(n_maps):
+        grid = generate_occupancy_grid(shape=shape, n_obstacles=10, max_size=12, seed=seed).astype(float)
+        obstacle_info = obstacle_transform(grid, robot_radius, distance_type='chessboard', transform_type='path')
+        pairs = generate_start_goal_pairs(obstacle_info[0], n_pairs=n_pairs, min_distance=30, seed=seed)
+        for start, goal in pairs:
+            start_time = time.perf_counter()
+            transform_reference, blocked_reference = transform_loop(grid, goal, robot_radius)
+            times["loop"] += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            transform_matrix = transform(grid, goal, robot_radius, distance_type='chessboard', transform_type='path')
+            times["dijkstra"] += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            transform(grid, goal, robot_radius, distance_type='chessboard', transform_type='path',
+                      obstacle_info=obstacle_info)
+            times["dijkstra_cached"] += time.perf_counter() - start_time
+
+            assert np.array_equal(obstacle_info[0], blocked_reference), "The blocked cells do not match"
+            assert np.array_equal(np.isinf(transform_matrix), np.isinf(transform_reference)), \
+                "The reached cells do not match"
+            reached = ~np.isinf(transform_matrix)
+            assert np.all(transform_matrix[reached] <= transform_reference[reached] + 1e-9), \
+                "The transform is larger than the original one"
+            with redirect_stdout(StringIO()):
+                path = wavefront(transform_matrix, start, goal)
+            assert path[-2] != path[-1] and max(abs(path[-2][0] - goal[0]), abs(path[-2][1] - goal[1])) <= 1, \
+                "The path does not reach the goal"
+
+    print("Path transform with loops and breadth-first traversal: %.4f s" % times["loop"])
+    print("Path transform with scipy and Dijkstra search: %.4f s" % times["dijkstra"])
+    print("Speed-up: %.1fx" % (times["loop"] / times["dijkstra"]))
+    print("Path transform reusing the obstacle half: %.4f s" % times["dijkstra_cached"])
+    print("Speed-up: %.1fx" % (times["loop"] / times["dijkstra_cached"]))
+    return times
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -110,7 +110,7 @@ class DroneCamera:
         :return: None
         """
         timestamp = response.time_stamp
-        if self.pixels_as_float:
+        if self.pixels_as_float or not self.compress:
             self.stored_responses[timestamp] = response
         else:
             image = response.image_data_uint8
@@ -132,8 +132,9 @@ class DroneCamera:
                 print("Type %d, size %d" % (self.image_type, len(self.stored_responses[timestamp])))
                 airsim.write_file(os.path.normpath(filename + '.png'), self.stored_responses[timestamp])
             else:  # uncompressed array
-                print("Type %d, size %d" % (self.image_type, len(self.stored_responses[timestamp])))
-                img1d = np.fromstring(self.stored_responses[timestamp], dtype=np.uint8)  # get numpy array
+                response = self.stored_responses[timestamp]
+                print("Type %d, size %d" % (self.image_type, len(response.image_data_uint8)))
+                img1d = response.image_data_uint8_array()  # numpy view of the received bytes
                 img_rgb = img1d.reshape(self.height, self.width, 3)  # reshape array to 4 channel image array H X W X 3
                 cv2.imwrite(os.path.normpath(filename + '.png'), img_rgb)  # write to png
 
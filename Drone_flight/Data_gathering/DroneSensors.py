@@ -139,14 +139,20 @@ class DroneSensors:
         name_func = "".join(['set' + sensor_type.capitalize() + 'Activation'])
         getattr(self.client, name_func)(activation=True, sample_rate=sample_rate, vehicle_name=self.vehicle_name)
 
-    def store_camera_data(self):
+    def store_camera_data(self, snapshot=None):
         """
         Store the camera information
+        :param snapshot: state of the drone in the current tick. If not provided, only the multirotor state is requested
+        to AirSim
         :return: None
         """
+        if snapshot is None:
+            time_now = self.client.getMultirotorState(vehicle_name=self.vehicle_name).timestamp
+        else:
+            time_now = snapshot.timestamp
+
         # Check when was the last time an image was taken
-        sample_rate, time_old, time_now = self.sample_rates['camera'], self.last_sample_time['camera'], \
-                                          self.client.getMultirotorState().timestamp
+        sample_rate, time_old = self.sample_rates['camera'], self.last_sample_time['camera']
 
         # If it is longer than a threshold, request to take an image
         if (self.UE4_second / sample_rate + time_old) < time_now:
@@ -156,12 +162,13 @@ class DroneSensors:
             for i in range(self.number_cameras):
                 self.cameras[i].store_camera_image(responses[i])
 
-    def store_sensors_data(self):
+    def store_sensors_data(self, snapshot=None):
         """
         Store the information from all the sensors
+        :param snapshot: state of the drone in the current tick. If not provided, it is retrieved from AirSim
         :return: None
         """
-        self.store_camera_data()
+        self.store_camera_data(snapshot)
 
     def write_signal_sensor_to_file(self):
         """
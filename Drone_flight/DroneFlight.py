@@ -26,9 +26,11 @@ from icecream import ic
 from datetime import datetime
 from math import atan2, pi, sin, cos, degrees
 
-from utils import compute_distance_points
 from Drone_flight.ControllerTuning import ControllerTuning
+from Drone_flight.TickSnapshot import TickSnapshot
 from Environment_extraction.OccupancyMap import OccupancyMap
+from Environment_extraction.OccupancyMapCache import OccupancyMapCache
+from Environment_extraction.StartGoalSampler import StartGoalSampler
 from Drone_grid_navigation.GridNavigation import GridNavigation
 from Drone_flight.Data_gathering.DroneSensors import DroneSensors
 from Drone_flight.Failure_injection.FailureFactory import FailureFactory
@@ -65,6 +67,9 @@ class DroneFlight:
         self.vehicle_name = vehicle_name
         self.vehicle_start_position = vehicle_start_position
         self.smooth = user_input.smooth
+        self.smoothing_reductions = np.round(np.arange(1, 21) * 0.05, 2)
+        self.smoothing_reduction = None
+        self.smoothing_time = None
 
         # Initializing some useful parameters for navigation
         self.start_grid = None
@@ -73,6 +78,9 @@ class DroneFlight:
         self.goal_world = None
         self.path = None
         self.heading_start = None
+        self.start_goal_sampler = None
+        self.mission_queue = []
+        self.constant_altitude_iterations = user_input.constant_altitude_iterations
 
         # Parameters for the obstacle avoidance
         self.ue4_airsim_factor = user_input.ue4_airsim_conversion_units
@@ -88,6 +96,11 @@ class DroneFlight:
 
         # Environment related parameters
         self.env_map = None
+        self.map_workers = user_input.map_workers
+        self.map_cache = None
+        if user_input.occupancy_map_cache_size > 0:
+            self.map_cache = OccupancyMapCache(user_input.occupancy_map_cache_folder,
+                                               user_input.occupancy_map_cache_size)
 
         # Initializing drone sensors
         self.sensors = user_input.sensors_lst
@@ -97,6 +110,7 @@ class DroneFlight:
         # Initializing the failure factory
         self.failure_factory = FailureFactory(user_input, self.client, self.clock_speed, vehicle_name=self.vehicle_name)
         self.collision_type = -1
+        self.rpc_calls_per_tick = []    # RPC requests and blocking round trips of each tick of the last flight
 
         self.activate_take_off = user_input.activate_take_off
 
@@ -171,6 +185,7 @@ class DroneFlight:
         """
         # Connect to the AirSim simulator
         self.client = airsim.MultirotorClient()
+        self.client.countRpcCalls()
         self.client.confirmConnection()
         self.client.enableApiControl(True, self.vehicle_name)
         self.client.armDisarm(False, self.vehicle_name)
@@ -187,33 +202,33 @@ class DroneFlight:
 
         # Extract occupancy grid
         self.env_map = OccupancyMap(cell_size=self.cell_size, ue4_airsim_conv=self.ue4_airsim_factor,
-                                    client=self.client)
+                                    client=self.client, map_workers=self.map_workers)
         self.env_map.run(self.altitude, self.altitude_range, self.saved_vertices_filename, self.update_saved_vertices,
-                         self.plot2D, self.plot3D)
+                         self.plot2D, self.plot3D, map_cache=self.map_cache)
+
+        # The start and goal locations of the previous map are not valid anymore
+        self.start_goal_sampler = None
+        self.mission_queue = []
 
     def obtain_start_goal(self):
         """
         Method to obtain a random start and goal location within the constraints that they need to be separated with
-        a minimum distance and that they need to be separated from the obstacles with a minimum distance of robot_radius
+        a minimum distance and that they need to be separated from the obstacles with a minimum distance of robot_radius.
+        The locations are drawn in batches of constant_altitude_iterations flights, since the map does not change
+        between those flights
         :return: None
         """
-        x_dim = self.env_map.extent_x - 1
-        y_dim = self.env_map.extent_y - 1
-
-        # Min distance in grid coordinates
-        min_distance_grid = np.ceil(self.min_flight_distance_m / self.cell_size_m)
-        max_distance_grid = np.ceil(self.max_flight_distance_m / self.cell_size_m)
-        self.start_grid = (random.randint(0, x_dim), random.randint(0, y_dim))
-        self.goal_grid = self.start_grid
-
-        # Generate new points as long as the points are not generated on top of an obstacle or the distance between
-        # them is below the defined threshold.
-        while compute_distance_points(self.start_grid, self.goal_grid) < min_distance_grid or \
-                compute_distance_points(self.start_grid, self.goal_grid) > max_distance_grid or \
-                self.env_map.check_obstacle(self.goal_grid, self.robot_radius) or \
-                self.env_map.check_obstacle(self.start_grid, self.robot_radius):
-            self.start_grid = (random.randint(0, x_dim), random.randint(0, y_dim))
-            self.goal_grid = (random.randint(0, x_dim), random.randint(0, y_dim))
+        if not self.mission_queue:
+            if self.start_goal_sampler is None:
+                # Min distance in grid coordinates
+                min_distance_grid = np.ceil(self.min_flight_distance_m / self.cell_size_m)
+                max_distance_grid = np.ceil(self.max_flight_distance_m / self.cell_size_m)
+                self.start_goal_sampler = StartGoalSampler(self.env_map, self.robot_radius, min_distance_grid,
+                                                           max_distance_grid)
+
+            # Pre-generate the start and goal locations of all the flights that are carried out with the same map
+            self.mission_queue = self.start_goal_sampler.sample(self.constant_altitude_iterations)
+        self.start_grid, self.goal_grid = self.mission_queue.pop(0)
         ic(self.start_grid, self.goal_grid)
 
     def navigate_drone_grid(self, navigation_type="A_star", start_point=None, goal_point=None):
@@ -244,6 +259,10 @@ class DroneFlight:
         start_time_nav = time.time()
         if navigation_type == "A_star":
             path = nav.navigation_A_star(self.start_grid, self.goal_grid, self.robot_radius)
+        elif navigation_type == "ALT":
+            path = nav.navigation_A_star(self.start_grid, self.goal_grid, self.robot_radius, landmarks=True)
+        elif navigation_type == "JPS":
+            path = nav.navigation_JPS(self.start_grid, self.goal_grid, self.robot_radius)
         elif navigation_type == "wavefront":
             path = nav.navigate_wavefront(self.start_grid, self.goal_grid, self.robot_radius)
         elif navigation_type == "Voronoid":
@@ -272,28 +291,17 @@ class DroneFlight:
 
         end_time_nav = time.time()
         ic(end_time_nav - start_time_nav)
-        # Smoothen the path with a B-spline
+        # Smoothen the path with a B-spline followed by a cubic spline, maintaining the lowest percentage of waypoints
+        # for which the smoothened path does not collide
         if self.smooth:
-            path_or = path.copy()
-            success = False
-            reduction = 0.05
-            # Repeat the smoothening as long as the reduction is less than 1 (a smoothening is performed) or there is
-            # a collision along the smoothened path
-            while not success and reduction <= 1:
-                try:
-                    path, collision = nav.smooth_B_spline(path_or, reduction=reduction)
-                    if not collision:
-                        path, collision = nav.smooth_cubic_spline(path)
-                    success = not collision
-                except:
-                    success = False
-                if not success:
-                    path = path_or
-                    ic('Smoothening with a reduction of ' + str(reduction) + ' did not succeed.')
-                    reduction += 0.05
-                    reduction = np.round(reduction, 2)
-                    if reduction > 1:
-                        ic('Smoothening did not succeed.')
+            start_time_smooth = time.time()
+            path, self.smoothing_reduction = nav.smooth_path(path, self.smoothing_reductions)
+            self.smoothing_time = time.time() - start_time_smooth
+            if self.smoothing_reduction is None:
+                ic('Smoothening did not succeed.')
+            else:
+                ic('Smoothening succeeded with a reduction of ' + str(self.smoothing_reduction))
+            ic(self.smoothing_time)
 
         # Translate the path to AirSim coordinates and save the AirSim coordinates of the start and goal locations
         path_world_coord = self.env_map.translate_path_to_world_coord(path, self.altitude)
@@ -430,30 +438,34 @@ class DroneFlight:
         self.client.moveOnPathAsync(self.path, 1, 10000, airsim.DrivetrainType.ForwardOnly,
                                     airsim.YawMode(False, 0), 2, 1, vehicle_name=self.vehicle_name)
 
-    def check_goal_arrival(self, failed):
+    def check_goal_arrival(self, failed, snapshot=None):
         """
         Method that checks whether the drone has arrived to its destination. It is considered that the drone has arrived
         to its destination if the distance between its position and the goal is less than 2 AirSim distance units.
+        :param failed: whether the failure has been injected
+        :param snapshot: state of the drone in the current tick. If not provided, it is retrieved from AirSim
         :return: whether the drone has arrived to its goal, the distance to the destination and the code that
         encapsulates whether the reason why the drone did not reach the destination
         """
+        if snapshot is None:
+            snapshot = TickSnapshot(self.client, self.vehicle_name)
+
         # Obtain drone and goal locations
-        drone_location = self.client.simGetVehiclePose(vehicle_name=self.vehicle_name)
+        drone_location = snapshot.pose
         real_x, real_y, goal_x, goal_y = drone_location.position.x_val, drone_location.position.y_val, \
                                          self.goal_world[0], self.goal_world[1]
         # Compute the distance between both locations
         distance = np.sqrt((goal_x - real_x) ** 2 + (goal_y - real_y) ** 2)
         message = "".join([self.vehicle_name, '. Goal: (', str(goal_x), ',', str(goal_y), '). Drone location: (',
                            str(real_x), ',', str(real_y), '). Distance: ', str(distance), '. Altitude: ',
-                           str(-self.client.getMultirotorState(vehicle_name=self.vehicle_name).kinematics_estimated.
-                               position.z_val), '. Desired altitude: ', str(-self.altitude_m), '.'])
+                           str(-snapshot.kinematics.position.z_val), '. Desired altitude: ', str(-self.altitude_m), '.'])
         ic(message)
 
         # Check whether the drone has collided
         if failed:
-            collision_info = self.client.simGetCollisionInfo(vehicle_name=self.vehicle_name)
-            z_val = -self.client.getMultirotorState(vehicle_name=self.vehicle_name).kinematics_estimated.position.z_val
-            current_time = self.client.getMultirotorState(vehicle_name=self.vehicle_name).timestamp/1e9
+            collision_info = snapshot.collision_info
+            z_val = -snapshot.kinematics.position.z_val
+            current_time = snapshot.time
             collided = collision_info.has_collided
             ic(collided)
             if collided:
@@ -503,11 +515,15 @@ class DroneFlight:
         # While the drone has not reached destination or collided. Initializing loop parameters
         not_arrived = 1
         self.collision_type = 0
+        self.rpc_calls_per_tick = []
         start_time = time.time()
         while not_arrived:
+            # Retrieve the state of the drone once per tick, shared by all the consumers of the tick
+            snapshot = TickSnapshot(self.client, self.vehicle_name)
+
             # When tuning the controller, storing the sensor data is not required
             if not self.controller_tuning_switch:
-                self.sensors.store_sensors_data()
+                self.sensors.store_sensors_data(snapshot)
 
             # Print the timestamp
             now = datetime.now()
@@ -515,11 +531,11 @@ class DroneFlight:
             ic("Current Time =", current_time)
 
             # Obtain the distance to destination
-            not_arrived, distance, self.collision_type = self.check_goal_arrival(failed)
+            not_arrived, distance, self.collision_type = self.check_goal_arrival(failed, snapshot)
 
             # When tuning the controller, executing failures is not required
             if not self.controller_tuning_switch:
-                failed = self.failure_factory.execute_failures(distance)
+                failed = self.failure_factory.execute_failures(distance, snapshot)
 
             # Manual break in the collection of data
             if keyboard.is_pressed('K'):
@@ -531,6 +547,15 @@ class DroneFlight:
             if (end_time-start_time) > 40/self.clock_speed:
                 not_arrived, distance, self.collision_type = [0, 100, 5]
 
+            # Keep track of the RPC traffic with AirSim of the tick
+            rpc_calls = snapshot.rpc_calls()
+            if rpc_calls is not None:
+                self.rpc_calls_per_tick.append(rpc_calls)
+
+        if self.rpc_calls_per_tick:
+            rpc_requests_per_tick, rpc_round_trips_per_tick = np.mean(self.rpc_calls_per_tick, axis=0)
+            ic(rpc_requests_per_tick, rpc_round_trips_per_tick)
+
         # Once the drone has arrived to its destination, the sensor and failure data is stored in their respective files
         # When the controller is being tuned, failure and sensor information is not collected
         if not self.controller_tuning_switch:
@@ -189,16 +189,21 @@ class FailureFactory:
             ic("No failure will be injected.")
         self.start_timestamp = self.client.getMultirotorState(vehicle_name=self.vehicle_name).timestamp
 
-    def execute_failures(self, distance):
+    def execute_failures(self, distance, snapshot=None):
         """
         Once the distance along the flight has been reached, this function will be called and the failure
         will be injected.
         :param distance: distance between the current vehicle location and the goal
+        :param snapshot: state of the drone in the current tick. If not provided, only the multirotor state is requested
+        to AirSim
         :return: None
         """
         if (self.chosen_mode != 1 and distance <= self.injection_distance) or self.failure_timestamp is not None:
             self.chosen_failure.activate_failure()
-            self.failure_timestamp = self.client.getMultirotorState(vehicle_name=self.vehicle_name).timestamp/1e9
+            if snapshot is None:
+                self.failure_timestamp = self.client.getMultirotorState(vehicle_name=self.vehicle_name).timestamp / 1e9
+            else:
+                self.failure_timestamp = snapshot.time
             return 1
         return 0
 
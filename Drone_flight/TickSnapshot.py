@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Provides the TickSnapshot class which retrieves the state of the drone from AirSim once per control tick, with a single
+batch of requests, and shares it with all the consumers of the tick: DroneFlight, DroneSensors and FailureFactory.
+Since all of them read the same snapshot, the decisions taken within a tick are consistent with a single timestamp.
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+
+class TickSnapshot:
+    """
+    Class which stores the multirotor state, the vehicle pose and the collision information of a control tick
+    """
+    def __init__(self, client, vehicle_name=''):
+        """
+        Initializes the TickSnapshot object by retrieving the state of the drone from AirSim
+        :param client: the client object
+        :param vehicle_name: the name of the vehicle
+        """
+        # Counts of the RPC calls when the tick started, if the client counts them
+        self.rpc_counter = getattr(client, "client", None)
+        self.start_requests = getattr(self.rpc_counter, "n_requests", None)
+        self.start_round_trips = getattr(self.rpc_counter, "n_round_trips", None)
+
+        with client.batch() as batch:
+            state = batch.getMultirotorState(vehicle_name=vehicle_name)
+            pose = batch.simGetVehiclePose(vehicle_name=vehicle_name)
+            collision_info = batch.simGetCollisionInfo(vehicle_name=vehicle_name)
+        self.state = state.get()
+        self.pose = pose.get()
+        self.collision_info = collision_info.get()
+
+        self.kinematics = self.state.kinematics_estimated
+        self.timestamp = self.state.timestamp      # UE4 time stamp: ns
+        self.time = self.timestamp / 1e9           # UE4 time stamp: s
+
+    def rpc_calls(self):
+        """
+        Number of RPC requests and round trips made since the snapshot was taken, including those of the snapshot. The
+        round trips are the times that the client blocked waiting for a response which had not been received yet
+        :return: the number of requests and the number of round trips, or None if the client does not count them
+        """
+        if self.start_requests is None:
+            return None
+        return self.rpc_counter.n_requests - self.start_requests, \
+            self.rpc_counter.n_round_trips - self.start_round_trips
@@ -22,15 +22,22 @@ __status__ = "Stable"
 # Imports
 from user_input import load_user_input
 from Environment_extraction.OccupancyMap import OccupancyMap
-from Drone_grid_navigation.PythonRobotics.PathPlanning.AStar.a_star import AStarPlanner
+from Drone_grid_navigation.LandmarkIndex import LandmarkIndex
+from Drone_grid_navigation.PythonRobotics.PathPlanning.AStar.a_star import AStarPlanner, \
+    inflate_obstacle_map
+from Drone_grid_navigation.PythonRobotics.PathPlanning.JumpPointSearch.jump_point_search import JPSPlanner, \
+    compute_jump_table
 from Drone_grid_navigation.PythonRobotics.PathPlanning.CubicSpline.cubic_spline_planner import Spline2D
 from Drone_grid_navigation.PythonRobotics.PathPlanning.VoronoiRoadMap.voronoi_road_map import VoronoiRoadMapPlanner
 from Drone_grid_navigation.PythonRobotics.PathPlanning.InformedRRTStar.informed_rrt_star import InformedRRTStar
-from Drone_grid_navigation.PythonRobotics.PathPlanning.BSplinePath.bspline_path import approximate_b_spline_path
-from Drone_grid_navigation.PythonRobotics.PathPlanning.ProbabilisticRoadMap.probabilistic_road_map import prm_planning
+from Drone_grid_navigation.PythonRobotics.PathPlanning.BSplinePath.bspline_path import approximate_b_spline_path, \
+    approximate_b_spline_paths
+from Drone_grid_navigation.PythonRobotics.PathPlanning.ProbabilisticRoadMap.probabilistic_road_map import prm_planning, \
+    generate_prm_road_map
 from Drone_grid_navigation.PythonRobotics.PathPlanning.WavefrontCPP.wavefront_coverage_path_planner import wavefront, \
-    transform, visualize_path
+    transform, obstacle_transform, visualize_path
 
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -50,6 +57,7 @@ class GridNavigation:
         self.grid = om.grid.copy()
         self.plotter_2D = plotter_2D
         self.plotter_3D = plotter_3D
+        self.n_expansions = None  # Number of nodes expanded by the search of the last computed path
 
     def navigate_wavefront(self, start, goal, robot_radius):
         """
@@ -59,9 +67,18 @@ class GridNavigation:
         :param goal: target location
         :return path: path of points in grid coordinates that the drone must follow
         """
+        # The cells blocked by the obstacles and the graph of the free cells weighted with the obstacle transform only
+        # depend on the map, so they are stored in the planner cache of the occupancy map. Only the wavefront from the
+        # goal is computed for every flight
         grid_wavefront = self.grid.astype('float')
-        PT = transform(grid_wavefront, goal, robot_radius, transform_type='path', distance_type='euclidean', alpha=0.01)
+        obstacle_info = self.om.planner_cache.get(
+            "wavefront_obstacles", robot_radius,
+            lambda: obstacle_transform(grid_wavefront, robot_radius, distance_type='euclidean', transform_type='path',
+                                       alpha=0.01))
+        PT = transform(grid_wavefront, goal, robot_radius, transform_type='path', distance_type='euclidean', alpha=0.01,
+                       obstacle_info=obstacle_info)
         PT_path = wavefront(PT, start, goal)
+        self.n_expansions = int(np.sum(np.isfinite(PT)))
 
         if self.plotter_2D:  # 2D plot
             visualize_path(self.grid.astype('float'), start, goal, PT_path)
@@ -92,10 +109,13 @@ class GridNavigation:
         ox = np.where(self.grid == True)[0].tolist()
         oy = np.where(self.grid == True)[1].tolist()
 
-        # Obtain deconflicted path
-        rx, ry = VoronoiRoadMapPlanner(max(ox), max(oy), only_integers=True, show_animation=self.plotter_2D).planning(
-            sx, sy, gx, gy, ox,
-            oy, robot_size)
+        # Obtain deconflicted path. The road map only depends on the map, so it is stored in the planner cache of the
+        # occupancy map
+        planner = VoronoiRoadMapPlanner(max(ox), max(oy), only_integers=True, show_animation=self.plotter_2D)
+        road_map_info = self.om.planner_cache.get("Voronoid_road_map", robot_size,
+                                                  lambda: planner.generate_voronoi_road_map(ox, oy, robot_size))
+        rx, ry = planner.planning(sx, sy, gx, gy, ox, oy, robot_size, road_map_info=road_map_info)
+        self.n_expansions = planner.n_expansions
         path = [(i, j) for i, j in zip(rx, ry)]
 
         if self.plotter_2D:  # 2D plot
@@ -141,6 +161,7 @@ class GridNavigation:
                               only_integer=True,
                               expandDis=10, maxIter=400)
         path = rrt.informed_rrt_star_search(animation=False)
+        self.n_expansions = len(rrt.node_list)
         print("Done!!")
 
         # Plot path
@@ -157,13 +178,15 @@ class GridNavigation:
         print('RRT_star path has been computed')
         return path
 
-    def navigation_A_star(self, start, goal, robot_radius=3):
+    def navigation_A_star(self, start, goal, robot_radius=3, landmarks=False):
         """
         A* navigation as explained in https://pythonrobotics.readthedocs.io/en/latest/
         :param start: start location
         :param goal: target location
         :param robot_radius: size of the robot in order to maintain a minimum distance from the obstacles and avoid
         collisions
+        :param landmarks: whether the search is guided by the landmark index of the map (ALT) instead of the Euclidean
+        distance to the goal. The path has the same length, but fewer cells are expanded
         :return path: path of points in grid coordinates that the drone must follow
         """
         # Coordinates of the start and goal locations
@@ -174,8 +197,10 @@ class GridNavigation:
         grid_size = 1
 
         # Coordinates of the obstacles
-        a_star = AStarPlanner(self.grid, grid_size, robot_radius)
-        rx, ry = a_star.planning(sx, sy, gx, gy, self.plotter_2D)
+        a_star = AStarPlanner(self.grid, grid_size, robot_radius, self.obtain_inflated_grid(robot_radius))
+        heuristic = self.obtain_landmark_index(robot_radius).heuristic(start, goal) if landmarks else None
+        rx, ry = a_star.planning(sx, sy, gx, gy, self.plotter_2D, heuristic=heuristic)
+        self.n_expansions = a_star.n_expansions
         path = [(i, j) for i, j in zip(rx, ry)]
 
         # Reverse the path because the A* algorithm returns the path starting from the goal.
@@ -199,6 +224,95 @@ class GridNavigation:
         print('A_star path has been computed')
         return path
 
+    def navigation_JPS(self, start, goal, robot_radius=3):
+        """
+        Jump Point Search navigation. It finds paths of the same length as A* over the same inflated grid, but it only
+        expands the cells where the path may change its direction
+        :param start: start location
+        :param goal: target location
+        :param robot_radius: size of the robot in order to maintain a minimum distance from the obstacles and avoid
+        collisions
+        :return path: path of points in grid coordinates that the drone must follow
+        """
+        # Coordinates of the start and goal locations
+        sx = start[0]
+        sy = start[1]
+        gx = goal[0]
+        gy = goal[1]
+        grid_size = 1
+
+        # Coordinates of the obstacles
+        jps = JPSPlanner(self.grid, grid_size, robot_radius, self.obtain_inflated_grid(robot_radius),
+                         self.obtain_jump_table(robot_radius))
+        rx, ry = jps.planning(sx, sy, gx, gy, self.plotter_2D)
+        self.n_expansions = jps.n_expansions
+        path = [(i, j) for i, j in zip(rx, ry)]
+
+        # Reverse the path because the search returns the path starting from the goal.
+        path.reverse()
+
+        if self.plotter_2D:  # 2D plot
+            ox = np.where(self.grid==True)[0].tolist()
+            oy = np.where(self.grid==True)[1].tolist()
+            plt.plot(oy, ox, ".k")
+            plt.plot(sy, sx, "og")
+            plt.plot(gy, gx, "xb")
+            plt.grid(True)
+            plt.axis("equal")
+            plt.plot(ry, rx, "-r")
+            plt.pause(0.001)
+            plt.show()
+
+        if self.plotter_3D:  # 3D plot
+            self.om.plot_trajectory_3d_grid(path)
+
+        print('JPS path has been computed')
+        return path
+
+    def obtain_inflated_grid(self, robot_radius):
+        """
+        Obtains the occupancy grid with the obstacles inflated with the robot radius. Since it only depends on the map
+        and the radius, it is computed once and stored in the planner cache of the occupancy map for the following
+        flights
+        :param robot_radius: size of the robot in grid cells
+        :return: inflated occupancy grid
+        """
+        return self.om.planner_cache.get("inflated_grid", robot_radius,
+                                         lambda: inflate_obstacle_map(self.grid, robot_radius))
+
+    def obtain_jump_table(self, robot_radius):
+        """
+        Obtains the jump distances of the occupancy grid inflated with the robot radius, used by the Jump Point Search.
+        They are computed once per map and radius and stored in the planner cache of the occupancy map
+        :param robot_radius: size of the robot in grid cells
+        :return: dictionary with the jump distances in each direction
+        """
+        return self.om.planner_cache.get("jump_table", robot_radius,
+                                         lambda: compute_jump_table(self.obtain_inflated_grid(robot_radius)))
+
+    def obtain_landmark_index(self, robot_radius):
+        """
+        Obtains the landmark index of the occupancy grid inflated with the robot radius. It is stored in the planner
+        cache of the occupancy map and, if the map comes from an OccupancyMapCache, on disk next to the map, such that it
+        is only computed the first time that a map is flown
+        :param robot_radius: size of the robot in grid cells
+        :return: LandmarkIndex object
+        """
+        def compute():
+            obstacle_map = self.obtain_inflated_grid(robot_radius)
+            if self.om.map_cache is None:
+                return LandmarkIndex(obstacle_map)
+
+            path = self.om.map_cache.get_planner_data_path(self.om.map_cache_key, "landmarks_" + str(robot_radius))
+            if os.path.isfile(path):
+                landmark_index = LandmarkIndex.load(path, obstacle_map)
+                if landmark_index is not None:
+                    return landmark_index
+            landmark_index = LandmarkIndex(obstacle_map)
+            landmark_index.save(path)
+            return landmark_index
+        return self.om.planner_cache.get("landmark_index", robot_radius, compute)
+
     def smooth_B_spline(self, path, reduction=0.5):
         """
         B spline navigation path smoother as explained in https://pythonrobotics.readthedocs.io/en/latest/
@@ -236,11 +350,12 @@ class GridNavigation:
 
         return path_a, collision
 
-    def smooth_cubic_spline(self, path):
+    def smooth_cubic_spline(self, path, plot=True):
         """
         Cubic spline navigation path smoother in continuous space as explained in
         https://pythonrobotics.readthedocs.io/en/latest/
         :param path: original path from one of the other navigation algorithms
+        :param plot: whether the smoothed path should be plotted when it does not collide
         :return path_a: smoothed path of points in grid coordinates that the drone must follow
                 collision: whether the generated path collides with any of the created obstacles
         """
@@ -251,18 +366,14 @@ class GridNavigation:
         sp = Spline2D(way_point_x, way_point_y)
         ds = 1  # [m] distance of each intepolated points
         s = np.arange(0, sp.s[-1], ds)
-        rx, ry = [], []
-        for i_s in s:
-            ix, iy = sp.calc_position(i_s)
-            rx.append(ix)
-            ry.append(iy)
-        rx.append(way_point_x[-1])
-        ry.append(way_point_y[-1])
+        rx, ry = sp.calc_position(s)
+        rx = rx.tolist() + [way_point_x[-1]]
+        ry = ry.tolist() + [way_point_y[-1]]
 
         # Compile path and check for obstacles
         path_a = [(i, j) for i, j in zip(rx, ry)]
         collision = self.check_collision(path_a)
-        if self.plotter_2D and not collision:  # 2D plot
+        if self.plotter_2D and plot and not collision:  # 2D plot
             plt.plot(way_point_x, way_point_y, '-og', label="way points")
             plt.plot(rx, ry, '-r', label="Approximated cubic spline path")
             plt.grid(True)
@@ -270,71 +381,167 @@ class GridNavigation:
             plt.axis("equal")
             plt.show()
 
-        if self.plotter_3D and not collision:  # 3D plot
+        if self.plotter_3D and plot and not collision:  # 3D plot
             self.om.plot_trajectory_3d_grid(path_a, color='red')
 
         return path_a, collision
 
+    def smooth_path(self, path, reductions):
+        """
+        Smooths the path with the B-spline followed by the cubic spline, using the lowest of the provided reductions
+        for which neither of the smoothed paths collides. The B-spline paths of all the reductions are evaluated at
+        once and their collisions are checked in batches of doubling size, with a single collision call per batch.
+        Then, the cubic spline is only computed for the B-spline paths without collision, in order of increasing
+        reduction.
+        :param path: original path from one of the other navigation algorithms
+        :param reductions: percentages of path waypoints that should be maintained [0,1], in increasing order
+        :return path: smoothed path, or the original path if the smoothing did not succeed for any reduction
+                reduction: reduction used for the smoothed path, None if the smoothing did not succeed
+        """
+        way_point_x = [i[0] for i in path]
+        way_point_y = [i[1] for i in path]
+        n_course_points = [max(int(len(path) * reduction), 2) for reduction in reductions]
+        try:
+            b_spline_paths = [list(zip(np.round(rax).astype(int).tolist(), np.round(ray).astype(int).tolist()))
+                              for rax, ray in approximate_b_spline_paths(way_point_x, way_point_y, n_course_points,
+                                                                         degree=2)]
+        except Exception:
+            return path, None
+
+        # The collisions are checked in batches of doubling size, since the lowest reductions succeed most often
+        best, smoothed_path = None, None
+        batch_start, batch_size = 0, 1
+        while best is None and batch_start < len(reductions):
+            batch = range(batch_start, min(batch_start + batch_size, len(reductions)))
+            first_collisions = self.find_collisions([b_spline_paths[index] for index in batch])
+            for index, first_collision in zip(batch, first_collisions):
+                if first_collision is not None:
+                    continue
+                try:
+                    path_c, collision = self.smooth_cubic_spline(b_spline_paths[index], plot=False)
+                except Exception:
+                    continue
+                if not collision:
+                    best, smoothed_path = index, path_c
+                    break
+            batch_start, batch_size = batch_start + batch_size, 2 * batch_size
+
+        if best is None:
+            return path, None
+
+        # Plot the chosen smoothed paths
+        if self.plotter_2D or self.plotter_3D:
+            self.smooth_B_spline(path, reduction=reductions[best])
+            self.smooth_cubic_spline(b_spline_paths[best])
+
+        return smoothed_path, reductions[best]
+
     def check_collision(self, path, distanced_obs=True):
         """
-        Check whether the proposed path collides with an obstacle. For that purpose, the trajectory is sliced 1000 times
-        and it is checked whether the grid cell of any of the points along the sliced path falls on an occupied cell.
-        If there is an obstacle, then return True
+        Check whether the proposed path collides with an obstacle. If there is an obstacle, then return True
         :param path: proposed path that the drone must follow
         :param distanced_obs: whether a minimum distance of 1 cell should be kept from the obstacles
         :return: whether the path collides with an obstacle
         """
-        # For each connection between 2 points along the path
-        for i in range(len(path) - 1):
-            # Retrieve the 2 points
-            local_start = path[i][:2]
-            local_goal = path[i + 1][:2]
-            # Check whether the trajectory moves only along the y-direction
-            if local_goal[0] != local_start[0]:
-                # Obtain the slope of the line connecting both points and its line equation
-                m = (local_goal[1] - local_start[1]) / (local_goal[0] - local_start[0])
-                line_equation = lambda x: m * (x - local_start[0]) + local_start[1]
-
-                # Obtain the line equations of the lines parallel and 1 cell apart
-                if distanced_obs:
-                    line_equation_parallel_1 = lambda x: m * (x - local_start[0] - 1) + local_start[1]
-                    line_equation_parallel_2 = lambda x: m * (x - local_start[0] + 1) + local_start[1]
-
-                    # Obtain linspace of the x axis
-                    x0 = np.linspace(local_start[0], local_goal[0], 1000)
-                    x1 = np.linspace(local_start[0] + 1, local_goal[0] + 1, 1000)
-                    x2 = np.linspace(local_start[0] - 1, local_goal[0] - 1, 1000)
-
-                    # Obtain the corresponding coordinates in the y-direction
-                    y = np.array(list(map(line_equation, x0)) + list(map(line_equation_parallel_1, x1)) + list(
-                        map(line_equation_parallel_2, x2)))
-                    x = np.vstack((x0, x1, x2)).flatten()
-                else:  # In the case that we do not care about a collision a cell away from the obstacle
-                    x = np.linspace(local_start[0], local_goal[0], 1000)
-                    y = np.array(list(map(line_equation, x)))
-            else:  # Only slice the y-axis
-                if distanced_obs:
-                    x0 = np.ones(1000) * local_start[0]
-                    x1 = np.ones(1000) * local_start[0] + 1
-                    x2 = np.ones(1000) * local_start[0] - 1
-                    x = np.vstack((x0, x1, x2)).flatten()
-                    y0 = np.linspace(local_start[1], local_goal[1], 1000)
-                    y = np.vstack((y0, y0, y0)).flatten()
-                else:
-                    x = np.ones(1000) * local_start[0]
-                    y = np.linspace(local_start[1], local_goal[1], 1000)
-
-            x_int = np.round(x).astype(int)
-            y_int = np.round(y).astype(int)
-            coord = np.vstack((x_int, y_int)).T
-            grids_cells = np.unique(coord, axis=0)
-
-            # Check whether the cells along the trajectory are occupied by an obstacle
-            for cell in grids_cells:
-                if self.om.extent_x > cell[0] >= 0 and self.om.extent_y > cell[1] >= 0:
-                    if self.grid[cell[0], cell[1]]:
-                        return True
-        return False
+        collision, _ = self.find_collision(path, distanced_obs)
+        return collision
+
+    def obtain_collision_mask(self, distanced_obs=True):
+        """
+        Obtains the occupancy mask against which the cells traversed by the path are checked. When a distance of 1 cell
+        should be kept from the obstacles, the obstacles are grown by one cell along the x-axis, which is equivalent to
+        checking the lines parallel to the path and 1 cell apart along the x-axis. The mask is padded with one row at
+        each side of the x-axis such that the cells right outside of the grid are also checked.
+        :param distanced_obs: whether a minimum distance of 1 cell should be kept from the obstacles
+        :return: occupancy mask and the offset of its rows with respect to the grid
+        """
+        def compute():
+            if not distanced_obs:
+                return self.grid, 0
+            padded_grid = np.pad(self.grid, ((1, 1), (0, 0)))
+            mask = padded_grid.copy()
+            mask[1:] |= padded_grid[:-1]
+            mask[:-1] |= padded_grid[1:]
+            return mask, 1
+        return self.om.planner_cache.get("collision_mask", distanced_obs, compute)
+
+    def find_collision(self, path, distanced_obs=True):
+        """
+        Finds the first segment of the proposed path that collides with an obstacle
+        :param path: proposed path that the drone must follow
+        :param distanced_obs: whether a minimum distance of 1 cell should be kept from the obstacles
+        :return: whether the path collides with an obstacle and the index of the first colliding segment
+        """
+        first_collision = self.find_collisions([path], distanced_obs)[0]
+        return first_collision is not None, first_collision
+
+    def find_collisions(self, paths, distanced_obs=True):
+        """
+        Finds the first segment of each of the proposed paths that collides with an obstacle. The cells traversed by
+        each segment are obtained with an exact supercover traversal (Amanatides-Woo): the parameters at which the
+        segment crosses the cell boundaries split it in pieces that lie within a single cell, and the cells touched at
+        the crossings are also included. All the segments of all the paths are traversed at once.
+        :param paths: list of proposed paths that the drone must follow
+        :param distanced_obs: whether a minimum distance of 1 cell should be kept from the obstacles
+        :return: list with the index of the first colliding segment of each path, None if the path does not collide
+        """
+        points = [np.array([point[:2] for point in path], dtype=float).reshape(-1, 2) for path in paths]
+        path_lengths = np.array([path_points.shape[0] for path_points in points])
+        first_collisions = [None] * len(paths)
+        if np.all(path_lengths < 2):
+            return first_collisions
+        points = np.concatenate(points)
+        path_ids = np.repeat(np.arange(len(paths)), path_lengths)
+        path_starts = np.cumsum(path_lengths) - path_lengths
+
+        # Segments between consecutive points of the same path
+        segment_starts = np.flatnonzero(path_ids[1:] == path_ids[:-1])
+        segment_paths = path_ids[segment_starts]
+        start_points = points[segment_starts]
+        end_points = points[segment_starts + 1]
+        directions = end_points - start_points
+        segments = np.arange(segment_starts.shape[0])
+
+        mask, offset = self.obtain_collision_mask(distanced_obs)
+
+        # Parameters at which each segment starts, ends and crosses the cell boundaries, located at k + 0.5
+        segment_events = [segments, segments]
+        t_events = [np.zeros(segments.shape[0]), np.ones(segments.shape[0])]
+        for axis in range(2):
+            first = np.ceil(np.minimum(start_points[:, axis], end_points[:, axis]) - 0.5)
+            last = np.floor(np.maximum(start_points[:, axis], end_points[:, axis]) - 0.5)
+            n_crossings = np.where(directions[:, axis] != 0, np.maximum(last - first + 1, 0), 0).astype(int)
+            crossing_segments = np.repeat(segments, n_crossings)
+            k = first[crossing_segments] + np.arange(crossing_segments.shape[0]) - \
+                np.repeat(np.cumsum(n_crossings) - n_crossings, n_crossings)
+            segment_events.append(crossing_segments)
+            t_events.append((k + 0.5 - start_points[crossing_segments, axis]) / directions[crossing_segments, axis])
+        segment_events = np.concatenate(segment_events)
+        t_events = np.concatenate(t_events)
+        order = np.lexsort((t_events, segment_events))
+        segment_events, t_events = segment_events[order], t_events[order]
+
+        # The crossing points and the midpoints between consecutive crossings of the same segment
+        same_segment = segment_events[1:] == segment_events[:-1]
+        segment_points = np.concatenate((segment_events, segment_events[:-1][same_segment]))
+        t_points = np.concatenate((t_events, 0.5 * (t_events[:-1] + t_events[1:])[same_segment]))
+        traversed_points = start_points[segment_points] + t_points[:, None] * directions[segment_points]
+
+        # All the cells whose closed square contains the points
+        cells_low = np.floor(traversed_points + 0.5 - 1e-9).astype(int)
+        cells_high = np.floor(traversed_points + 0.5 + 1e-9).astype(int)
+        cells_x = np.concatenate((cells_low[:, 0], cells_high[:, 0], cells_low[:, 0], cells_high[:, 0])) + offset
+        cells_y = np.concatenate((cells_low[:, 1], cells_low[:, 1], cells_high[:, 1], cells_high[:, 1]))
+        cells_segment = np.tile(segment_points, 4)
+
+        # Check whether the cells along the trajectory are occupied by an obstacle
+        inside = (cells_x >= 0) & (cells_x < mask.shape[0]) & (cells_y >= 0) & (cells_y < mask.shape[1])
+        occupied = mask[cells_x[inside], cells_y[inside]]
+        colliding_segments = np.unique(cells_segment[inside][occupied])
+        colliding_paths, first_index = np.unique(segment_paths[colliding_segments], return_index=True)
+        for path_id, segment in zip(colliding_paths, colliding_segments[first_index]):
+            first_collisions[path_id] = int(segment_starts[segment] - path_starts[path_id])
+        return first_collisions
 
     def navigation_PRM(self, start, goal, robot_size=3):
         """
@@ -355,7 +562,13 @@ class GridNavigation:
         ox = np.where(self.grid == True)[0].tolist()
         oy = np.where(self.grid == True)[1].tolist()
 
-        rx, ry = prm_planning(sx, sy, gx, gy, ox, oy, robot_size, self.plotter_2D)
+        # The road map only depends on the map, so it is stored in the planner cache of the occupancy map
+        road_map_info = self.om.planner_cache.get("PRM_road_map", robot_size,
+                                                  lambda: generate_prm_road_map(ox, oy, robot_size))
+        search_stats = {}
+        rx, ry = prm_planning(sx, sy, gx, gy, ox, oy, robot_size, self.plotter_2D, road_map_info=road_map_info,
+                              search_stats=search_stats)
+        self.n_expansions = search_stats["n_expansions"]
         path = [(i, j) for i, j in zip(rx, ry)]
 
         # The path is reversed because the PRM algorithm returns the path starting from the goal
@@ -395,7 +608,7 @@ if __name__ == "__main__":
     # nav.navigate_wavefront(args.start, args.goal)
     # nav.navigate_Voronoid(args.start, args.goal, args.robot_radius)
     # nav.navigation_RRT_star(args.start, args.goal)
-    path = nav.navigation_A_start(args.start, args.goal, args.robot_radius)
+    path = nav.navigation_A_star(args.start, args.goal, args.robot_radius)
     path, collision = nav.smooth_B_spline(path, reduction=0.2)
     # path = nav.navigation_PRM(args.start, args.goal, args.robot_radius)
     # path = nav.smooth_B_spline(path, reduction=0.5)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Provides the LandmarkIndex class which stores, for an inflated occupancy grid, the shortest path distances from a few
+landmark cells to all the free cells. By the triangle inequality, they provide a lower bound of the distance between
+any two cells (ALT: A*, landmarks and triangle inequality) that guides the A* search much more tightly than the
+Euclidean distance, such that every start and goal query of the same map expands a fraction of the cells.
+
+The index only depends on the map and the robot radius, so it is computed once and it can be stored next to the map in
+the occupancy map cache.
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import os
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+
+class LandmarkIndex:
+    """
+    Class which computes the landmark distances of an inflated occupancy grid and the A* heuristic of a goal from them
+    """
+    def __init__(self, obstacle_map, n_landmarks=16, n_active=4, landmarks=None, distances=None):
+        """
+        Initializes the LandmarkIndex object. If the landmarks and their distances are not provided, they are computed
+        :param obstacle_map: occupancy grid inflated with the robot radius, as used by the A* planner
+        :param n_landmarks: number of landmarks
+        :param n_active: number of landmarks used by the heuristic of each query
+        :param landmarks: grid indices of the landmarks
+        :param distances: array with the distances from each landmark to every cell, infinite if it cannot be reached
+        """
+        self.obstacle_map = np.asarray(obstacle_map, dtype=bool)
+        self.n_landmarks = n_landmarks
+        self.n_active = n_active
+        self.landmarks = landmarks
+        self.distances = distances
+        if self.landmarks is None or self.distances is None:
+            self.compute_landmarks()
+
+    def compute_graph(self):
+        """
+        Builds the graph of the free cells with the motion model of the A* planner: the 8 neighbours of every cell,
+        with a cost of 1 along the axes and sqrt(2) along the diagonals
+        :return: sparse matrix with the cost of moving between each pair of neighbouring free cells
+        """
+        x_width, y_width = self.obstacle_map.shape
+        free = ~self.obstacle_map
+        index = np.arange(x_width * y_width).reshape(x_width, y_width)
+        padded_free = np.pad(free, 1)
+        rows, cols, costs = [], [], []
+        for dx, dy in [(1, 0), (0, 1), (-1, 0), (0, -1), (-1, -1), (-1, 1), (1, -1), (1, 1)]:
+            neighbour_free = padded_free[1 + dx:1 + dx + x_width, 1 + dy:1 + dy + y_width]
+            x, y = np.nonzero(free & neighbour_free)
+            rows.append(index[x, y])
+            cols.append(index[x + dx, y + dy])
+            costs.append(np.full(x.shape[0], np.hypot(dx, dy)))
+        return csr_matrix((np.concatenate(costs), (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(x_width * y_width, x_width * y_width))
+
+    def compute_landmarks(self):
+        """
+        Chooses the landmarks by farthest point selection: every new landmark is the free cell farthest from the
+        landmarks already chosen. The cells that cannot be reached from any landmark are the farthest, so every
+        disconnected region of the map gets a landmark before a second landmark is placed in any of them
+        :return: None
+        """
+        free_cells = np.flatnonzero(~self.obstacle_map)
+        if free_cells.shape[0] == 0:
+            self.landmarks = np.zeros(0, dtype=int)
+            self.distances = np.zeros((0, self.obstacle_map.size), dtype=np.float32)
+            return
+
+        graph = self.compute_graph()
+        free = ~self.obstacle_map.ravel()
+
+        # The first landmark is the farthest cell from an arbitrary free cell, which lies in the periphery of the map
+        distance = dijkstra(graph, indices=free_cells[0])
+        candidate = int(np.argmax(np.where(free & np.isfinite(distance), distance, -1)))
+
+        # Distance from every free cell to its closest landmark, -1 for the blocked cells
+        closest = np.where(free, np.inf, -1)
+        landmarks = []
+        distances = []
+        for i in range(min(self.n_landmarks, free_cells.shape[0])):
+            distance = dijkstra(graph, indices=candidate)
+            landmarks.append(candidate)
+            distances.append(distance)
+            closest = np.minimum(closest, distance)
+            candidate = int(np.argmax(closest))
+            if closest[candidate] <= 0:
+                break
+        self.landmarks = np.array(landmarks, dtype=int)
+        self.distances = np.array(distances, dtype=np.float32)
+
+    def heuristic(self, start, goal):
+        """
+        Computes, for every cell, the lower bound of its distance to the goal: the maximum of the octile distance and
+        the landmark bounds |d(landmark, cell) - d(landmark, goal)|. Only the n_active landmarks with the largest bound
+        between the start and the goal are used, since they are the ones that guide the search. The bound is infinite
+        for the free cells that cannot reach the goal
+        :param start: start location in grid coordinates
+        :param goal: target location in grid coordinates
+        :return: flat list with the estimate of every cell, indexed by the grid index
+        """
+        x_width, y_width = self.obstacle_map.shape
+        dx = np.abs(np.arange(x_width) - goal[0])[:, None]
+        dy = np.abs(np.arange(y_width) - goal[1])[None, :]
+        estimate = (np.maximum(dx, dy) + (np.sqrt(2) - 1) * np.minimum(dx, dy)).ravel()
+        if self.distances.shape[0]:
+            start_index = int(start[0]) * y_width + int(start[1])
+            goal_index = int(goal[0]) * y_width + int(goal[1])
+            with np.errstate(invalid='ignore'):
+                start_goal_bounds = np.abs(self.distances[:, start_index] - self.distances[:, goal_index])
+            active = np.argsort(-np.nan_to_num(start_goal_bounds))[:self.n_active]
+            with np.errstate(invalid='ignore'):
+                bounds = np.abs(self.distances[active] - self.distances[active, goal_index][:, None])
+            # Two cells that cannot be reached from the same landmark provide no bound
+            bounds[np.isnan(bounds)] = 0
+            # The float32 distances are rounded down to keep the bound admissible
+            estimate = np.maximum(estimate, np.max(bounds, axis=0) * (1 - 1e-6))
+        return estimate.tolist()
+
+    def save(self, path):
+        """
+        Stores the landmarks and their distances. They are first written to a temporary file such that other processes
+        never read a half written index
+        :param path: location of the file
+        :return: None
+        """
+        path_tmp = path + '.' + str(os.getpid()) + '.tmp'
+        with open(path_tmp, 'wb') as f:
+            np.savez(f, landmarks=self.landmarks, distances=self.distances)
+        os.replace(path_tmp, path)
+
+    @classmethod
+    def load(cls, path, obstacle_map, n_active=4):
+        """
+        Retrieves the landmarks and their distances of an inflated occupancy grid
+        :param path: location of the file
+        :param obstacle_map: occupancy grid inflated with the robot radius
+        :param n_active: number of landmarks used by the heuristic of each query
+        :return: LandmarkIndex object, or None if the stored index does not match the grid
+        """
+        with np.load(path) as data:
+            landmarks, distances = data["landmarks"], data["distances"]
+        if distances.ndim != 2 or distances.shape[1] != np.size(obstacle_map):
+            return None
+        return cls(obstacle_map, landmarks.shape[0], n_active, landmarks, distances)
@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 """
 Provides the code for the generation of histograms that allow the comparison of the computational performance of the
-different navigation approaches considered. With computational performance it is referred to computational time.
+different navigation approaches considered. With computational performance it is referred to computational time. The
+computational times are obtained with the simulator-free benchmark suite in Benchmarks/planner_suite.py.
 
 A* is used as baseline as it is expected to be the most efficient for the chosen metric. Finally, the user can find the
 plot generated in Figure 8.29 of the author's master thesis.
@@ -17,22 +18,15 @@ __email__ = "jialvear@hotmail.com"
 __status__ = "Stable"
 
 # Imports
-import sys
-import time
-import random
-import pickle
+import json
 import statistics
 import matplotlib
 import numpy as np
-from icecream import ic
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 
 from user_input import load_user_input
-from _init_json_config import find_config_json
-from Drone_flight.DroneFlight import DroneFlight
-from Environment_extraction.OccupancyMap import OccupancyMap
-from Drone_grid_navigation.GridNavigation import GridNavigation
+from Benchmarks.planner_suite import run_suite, write_results, load_occupancy_grids, generate_occupancy_grids
 
 # Plotting settings
 mpl.rcParams['font.family'] = 'Arial'
@@ -42,89 +36,31 @@ font = {'size': 30,
         'family': "Arial"}
 mpl.rc('font', **font)
 
-# Whether the simulations need to be run or the computation time information has already been obtained and is saved in a
-# directory waiting to be loaded
+# Whether the planners need to be run or the computation time information has already been obtained and is saved in a
+# file waiting to be loaded. The planners are run with the simulator-free benchmark suite in Benchmarks/planner_suite.py
+# on the occupancy maps stored in the occupancy map cache or, if there are none, on synthetic maps
 recompute_statistics = False
+results_file = "Benchmarks/Results/planner_suite.json"
 if recompute_statistics:
-    # Obtain the user input and the information stored in the settings json file
     args = load_user_input()
-    location_json_file, data = find_config_json(args)
-
-    # Debugging with icecream
-    gettrace = getattr(sys, 'gettrace', None)
-    if gettrace() and not args.PSO_tuning_switch:
-        ic.enable()
-    else:
-        ic.disable()
-
-    # Retrieving the start position of the drone
-    vehicle_name = list(data['Vehicles'].keys())[0]
-    coord = data['Vehicles'][vehicle_name]
-    start_coord = (coord['X'], coord['Y'], coord['Z'])
-
-    # Obtaining the clock speed information
-    clock_speed = data['ClockSpeed']
-    sample_rates = {key: value * clock_speed for key, value in {}.items()}
-
-    # Create a Drone
-    # Creating a drone flight to exploit some of the functions
-    drone_flight = DroneFlight(args, sample_rates, clock_speed=clock_speed, vehicle_name=vehicle_name,
-                               vehicle_start_position=start_coord)
-
-    # Parameters that define the performance comparison
+    grids = load_occupancy_grids(args.occupancy_map_cache_folder)
+    if not grids:
+        grids = generate_occupancy_grids()
     n_iterations = 100
-    PP_computation_time = {"A_star": [], "Wavefront": [], "Voronoi": [], "RRT*": [], "PRM": []}
-    for run in range(n_iterations):
-        # Obtaining the occupancy grid
-        drone_flight.altitude_m = -random.randint(3, 11)
-        drone_flight.altitude = drone_flight.distance_to_ue4(drone_flight.altitude_m, True)
-
-        # Extract occupancy grid
-        drone_flight.env_map = OccupancyMap(cell_size=drone_flight.cell_size,
-                                            ue4_airsim_conv=drone_flight.ue4_airsim_factor,
-                                            client=drone_flight.client)
-        drone_flight.env_map.run(drone_flight.altitude, drone_flight.altitude_range, drone_flight.saved_vertices_filename,
-                                 drone_flight.update_saved_vertices, drone_flight.plot2D, drone_flight.plot3D)
-
-        drone_flight.obtain_start_goal()
-
-        # Plot the start and goal points on the 3D grid
-        if drone_flight.plot3D:
-            drone_flight.env_map.plot_start_goal_3D_grid(drone_flight.start_grid, drone_flight.goal_grid)
-
-        # Compute the computational time with the chosen navigation type and store it
-        nav = GridNavigation(drone_flight.env_map, drone_flight.plot2D, drone_flight.plot3D)
-        start_time_nav = time.time()
-        _ = nav.navigation_A_star(drone_flight.start_grid, drone_flight.goal_grid, drone_flight.robot_radius)
-        end_time_nav = time.time()
-        PP_computation_time["A_star"].append(end_time_nav - start_time_nav)
-
-        nav = GridNavigation(drone_flight.env_map, drone_flight.plot2D, drone_flight.plot3D)
-        start_time_nav = time.time()
-        _ = nav.navigate_wavefront(drone_flight.start_grid, drone_flight.goal_grid, drone_flight.robot_radius)
-        end_time_nav = time.time()
-        PP_computation_time["Wavefront"].append(end_time_nav - start_time_nav)
-
-        nav = GridNavigation(drone_flight.env_map, drone_flight.plot2D, drone_flight.plot3D)
-        start_time_nav = time.time()
-        _ = nav.navigate_Voronoid(drone_flight.start_grid, drone_flight.goal_grid, drone_flight.robot_radius)
-        end_time_nav = time.time()
-        PP_computation_time["Voronoi"].append(end_time_nav - start_time_nav)
-
-        nav = GridNavigation(drone_flight.env_map, drone_flight.plot2D, drone_flight.plot3D)
-        start_time_nav = time.time()
-        _ = nav.navigation_RRT_star(drone_flight.start_grid, drone_flight.goal_grid)
-        end_time_nav = time.time()
-        PP_computation_time["RRT*"].append(end_time_nav - start_time_nav)
-
-        nav = GridNavigation(drone_flight.env_map, drone_flight.plot2D, drone_flight.plot3D)
-        start_time_nav = time.time()
-        _ = nav.navigation_PRM(drone_flight.start_grid, drone_flight.goal_grid, drone_flight.robot_radius)
-        end_time_nav = time.time()
-        PP_computation_time["PRM"].append(end_time_nav - start_time_nav)
+    records = run_suite(grids, ["A_star", "wavefront", "Voronoid", "RRT_star", "PRM"],
+                        n_pairs=int(np.ceil(n_iterations / len(grids))), robot_radius=args.robot_radius, memory=False,
+                        smooth=False)
+    parameters = {"n_iterations": n_iterations, "robot_radius": args.robot_radius}
+    write_results(results_file, records, parameters)
 else:  # it has already been obtained and it will be loaded next
-    with open('../PP_computation_time.pickle', 'rb') as infile:
-        PP_computation_time = pickle.load(infile)
+    with open(results_file) as infile:
+        records = json.load(infile)["records"]
+
+# Computation time of each flight, for every algorithm. The flights are in the same order for all of them
+PP_computation_time = {}
+for record in records:
+    if record["planner"] not in ("ALT", "JPS"):
+        PP_computation_time.setdefault(record["planner"], []).append(record["time_s"])
 
 # Obtaining the name of the algorithms considered
 keys = PP_computation_time.keys()
@@ -147,6 +83,8 @@ for key in keys:
             key = 'RRT*'
         elif key == 'wavefront':
             key = 'Wavefront'
+        elif key == 'Voronoid':
+            key = 'Voronoi'
         plt.xlabel('m(' + key + ')')
         plt.ylabel('Frequency')
         matplotlib.rc('xtick')
@@ -10,23 +10,57 @@ See Wikipedia article (https://en.wikipedia.org/wiki/A*_search_algorithm)
 """
 
 import math
+import heapq
+import numpy as np
 from icecream import ic
 import matplotlib.pyplot as plt
 from math import sqrt, ceil
+from scipy.ndimage import binary_dilation
 
 show_animation = True
 
 
+def inflation_structure(rr):
+    """
+    Structuring element equivalent to the iterative obstacle inflation: int(rr) growth steps of one cell, of which the
+    first ceil(rr/sqrt(2)) also grow along the diagonals
+
+    rr: robot radius [cells]
+    """
+    n_steps = int(rr)
+    repeated_diagonals = ceil(rr / sqrt(2))
+    square = np.ones((3, 3), dtype=bool)
+    cross = np.array([[False, True, False], [True, True, True], [False, True, False]])
+    structure = np.zeros((2 * n_steps + 1, 2 * n_steps + 1), dtype=bool)
+    structure[n_steps, n_steps] = True
+    for i in range(n_steps):
+        structure = binary_dilation(structure, structure=square if i < repeated_diagonals else cross)
+    return structure
+
+
+def inflate_obstacle_map(grid, rr):
+    """
+    Inflate the obstacles of the grid with the robot radius with a single morphological dilation
+
+    grid: occupancy grid
+    rr: robot radius [cells]
+    """
+    grid = np.asarray(grid, dtype=bool)
+    if int(rr) < 1:
+        return grid.copy()
+    return binary_dilation(grid, structure=inflation_structure(rr))
+
+
 class AStarPlanner:
 
-    def __init__(self, grid, resolution, rr):
+    def __init__(self, grid, resolution, rr, obstacle_map=None):
         """
         Initialize grid map for a star planning
 
-        ox: x position list of Obstacles [m]
-        oy: y position list of Obstacles [m]
+        grid: occupancy grid
         resolution: grid resolution [m]
         rr: robot radius[m]
+        obstacle_map: occupancy grid already inflated with rr. If not provided, it is computed from grid
         """
 
         self.resolution = resolution
@@ -35,121 +69,125 @@ class AStarPlanner:
         self.max_x, self.max_y = 0, 0
         self.obstacle_map = None
         self.x_width, self.y_width = 0, 0
+        self.n_expansions = 0
         self.motion = self.get_motion_model()
-        self.calc_obstacle_map(grid)
+        self.calc_obstacle_map(grid, obstacle_map)
 
-    class Node:
-        def __init__(self, x, y, cost, parent_index):
-            self.x = x  # index of grid
-            self.y = y  # index of grid
-            self.cost = cost
-            self.parent_index = parent_index
-
-        def __str__(self):
-            return str(self.x) + "," + str(self.y) + "," + str(
-                self.cost) + "," + str(self.parent_index)
-
-    def planning(self, sx, sy, gx, gy, animation=True):
+    def planning(self, sx, sy, gx, gy, animation=True, heuristic=None):
         """
-        A star path search
+        A star path search. The open set is a binary heap with lazy deletion and the costs, parents and closed flags
+        are flat lists indexed by the grid index of the cells.
 
         input:
             s_x: start x position [m]
             s_y: start y position [m]
             gx: goal x position [m]
             gy: goal y position [m]
+            heuristic: flat list with the admissible and consistent estimate of the cost to the goal of every cell,
+                indexed by the grid index. Cells with an infinite estimate cannot reach the goal and are not opened.
+                If not provided, the Euclidean distance to the goal is used
 
         output:
             rx: x position list of the final path
             ry: y position list of the final path
         """
-
-        start_node = self.Node(self.calc_xy_index(sx, self.min_x),
-                               self.calc_xy_index(sy, self.min_y), 0.0, -1)
-        goal_node = self.Node(self.calc_xy_index(gx, self.min_x),
-                              self.calc_xy_index(gy, self.min_y), 0.0, -1)
-
-        open_set, closed_set = dict(), dict()
-        open_set[self.calc_grid_index(start_node)] = start_node
-
-        while 1:
-            if len(open_set) == 0:
-                print("Open set is empty..")
-                print("Start: (", sx, ",", sy, "). Goal: (", gx, ",", gy, ").")
-                break
-
-            c_id = min(
-                open_set,
-                key=lambda o: open_set[o].cost + self.calc_heuristic(goal_node,
-                                                                     open_set[
-                                                                         o]))
-            current = open_set[c_id]
+        start_x = self.calc_xy_index(sx, self.min_x)
+        start_y = self.calc_xy_index(sy, self.min_y)
+        goal_x = self.calc_xy_index(gx, self.min_x)
+        goal_y = self.calc_xy_index(gy, self.min_y)
+
+        x_width, y_width = self.x_width, self.y_width
+        n_cells = x_width * y_width
+        start_index = self.calc_grid_index(start_x, start_y)
+        goal_index = self.calc_grid_index(goal_x, goal_y)
+
+        cost = [math.inf] * n_cells
+        parent = [-1] * n_cells
+        closed = bytearray(n_cells)
+        blocked = self.blocked
+        motion = self.motion
+        hypot = math.hypot
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        cost[start_index] = 0.0
+        open_heap = [(hypot(start_x - goal_x, start_y - goal_y), start_index)]
+        found = False
+        self.n_expansions = 0
+        while open_heap:
+            _, c_id = heappop(open_heap)
+            if closed[c_id]:
+                continue
+            closed[c_id] = 1
+            self.n_expansions += 1
+            current_x, current_y = divmod(c_id, y_width)
 
             # show graph
             if animation:  # pragma: no cover
-                plt.plot(self.calc_grid_position(current.y, self.min_y),
-                         self.calc_grid_position(current.x, self.min_x), "xc")
+                plt.plot(self.calc_grid_position(current_y, self.min_y),
+                         self.calc_grid_position(current_x, self.min_x), "xc")
                 # for stopping simulation with the esc key.
                 plt.gcf().canvas.mpl_connect('key_release_event',
                                              lambda event: [exit(
                                                  0) if event.key == 'escape' else None])
-                if len(closed_set.keys()) % 10 == 0:
+                if self.n_expansions % 10 == 0:
                     plt.pause(0.001)
 
-            if current.x == goal_node.x and current.y == goal_node.y:
+            if c_id == goal_index:
                 print("Find goal")
-                goal_node.parent_index = current.parent_index
-                goal_node.cost = current.cost
+                found = True
                 break
 
-            # Remove the item from the open set
-            del open_set[c_id]
-
-            # Add it to the closed set
-            closed_set[c_id] = current
-
             # expand_grid search grid based on motion model
-            for i, _ in enumerate(self.motion):
-                node = self.Node(current.x + self.motion[i][0],
-                                 current.y + self.motion[i][1],
-                                 current.cost + self.motion[i][2], c_id)
-                n_id = self.calc_grid_index(node)
+            current_cost = cost[c_id]
+            for dx, dy, move_cost in motion:
+                x = current_x + dx
+                y = current_y + dy
 
                 # If the node is not safe, do nothing
-                if not self.verify_node(node):
+                if x < 0 or y < 0 or x >= x_width or y >= y_width:
                     continue
-
-                if n_id in closed_set:
+                n_id = x * y_width + y
+                if blocked[n_id] or closed[n_id]:
                     continue
 
-                if n_id not in open_set:
-                    open_set[n_id] = node  # discovered a new node
-                else:
-                    if open_set[n_id].cost > node.cost:
-                        # This path is the best until now. record it
-                        open_set[n_id] = node
-
-        rx, ry = self.calc_final_path(goal_node, closed_set)
+                new_cost = current_cost + move_cost
+                if new_cost < cost[n_id]:
+                    # This path is the best until now. record it
+                    if heuristic is None:
+                        h = hypot(x - goal_x, y - goal_y)
+                    else:
+                        h = heuristic[n_id]
+                        if h == math.inf:
+                            continue
+                    cost[n_id] = new_cost
+                    parent[n_id] = c_id
+                    heappush(open_heap, (new_cost + h, n_id))
+
+        if not found:
+            print("Open set is empty..")
+            print("Start: (", sx, ",", sy, "). Goal: (", gx, ",", gy, ").")
+            parent[goal_index] = -1
+
+        rx, ry = self.calc_final_path(goal_index, parent)
 
         return rx, ry
 
-    def calc_final_path(self, goal_node, closed_set):
+    def calc_final_path(self, goal_index, parent):
         # generate final course
-        rx, ry = [self.calc_grid_position(goal_node.x, self.min_x)], [
-            self.calc_grid_position(goal_node.y, self.min_y)]
-        parent_index = goal_node.parent_index
-        while parent_index != -1:
-            n = closed_set[parent_index]
-            rx.append(self.calc_grid_position(n.x, self.min_x))
-            ry.append(self.calc_grid_position(n.y, self.min_y))
-            parent_index = n.parent_index
+        rx, ry = [], []
+        index = goal_index
+        while index != -1:
+            x, y = divmod(index, self.y_width)
+            rx.append(self.calc_grid_position(x, self.min_x))
+            ry.append(self.calc_grid_position(y, self.min_y))
+            index = parent[index]
 
         return rx, ry
 
     @staticmethod
     def calc_heuristic(n1, n2):
         w = 1.0  # weight of heuristic
-        d = w * math.hypot(n1.x - n2.x, n1.y - n2.y)
+        d = w * math.hypot(n1[0] - n2[0], n1[1] - n2[1])
         return d
 
     def calc_grid_position(self, index, min_position):
@@ -166,81 +204,33 @@ class AStarPlanner:
     def calc_xy_index(self, position, min_pos):
         return round((position - min_pos) / self.resolution)
 
-    def calc_grid_index(self, node):
-        return (node.y - self.min_y) * self.x_width + (node.x - self.min_x)
-
-    def verify_node(self, node):
-        px = self.calc_grid_position(node.x, self.min_x)
-        py = self.calc_grid_position(node.y, self.min_y)
+    def calc_grid_index(self, x, y):
+        return (x - self.min_x) * self.y_width + (y - self.min_y)
 
-        if px < self.min_x:
-            return False
-        elif py < self.min_y:
-            return False
-        elif px > self.max_x:
-            return False
-        elif py > self.max_y:
+    def verify_node(self, x, y):
+        if x < 0 or y < 0 or x >= self.x_width or y >= self.y_width:
             return False
 
         # collision check
-        if self.obstacle_map[node.x][node.y]:
-            return False
-
-        return True
+        return not self.blocked[self.calc_grid_index(x, y)]
 
-    def calc_obstacle_map(self, grid):
+    def calc_obstacle_map(self, grid, obstacle_map=None):
 
         self.min_x = 0
         self.min_y = 0
         self.max_x = grid.shape[0] - 1
         self.max_y = grid.shape[1] - 1
-        ic(self.min_x)
-        ic(self.min_y)
-        ic(self.max_x)
-        ic(self.max_y)
 
-        self.x_width = round((self.max_x - self.min_x) / self.resolution)
-        self.y_width = round((self.max_y - self.min_y) / self.resolution)
+        self.x_width = grid.shape[0]
+        self.y_width = grid.shape[1]
         ic(self.x_width)
         ic(self.y_width)
 
-        self.obstacle_map = grid.copy()
-        obstacle_map_new = grid.copy()
-        repeated_diagonals = ceil(self.rr/sqrt(2))
-        it_diag = 0
         # obstacle map generation
-        for i in range(int(self.rr)):
-            for x in range(self.x_width):
-                for y in range(self.y_width):
-                    if self.obstacle_map[x, y]:
-                        # In the x-y direction
-                        obstacle_map_new[max(x - 1, 0), y] = True
-                        obstacle_map_new[min(x + 1, self.x_width-1), y] = True
-                        obstacle_map_new[x, max(y - 1, 0)] = True
-                        obstacle_map_new[x, min(y + 1, self.y_width-1)] = True
-                        # Diagonals
-                        if it_diag < repeated_diagonals:
-                            obstacle_map_new[max(x - 1, 0), max(y - 1, 0)] = True
-                            obstacle_map_new[min(x + 1, self.x_width-1), max(y - 1, 0)] = True
-                            obstacle_map_new[max(x - 1, 0), min(y + 1, self.y_width-1)] = True
-                            obstacle_map_new[min(x + 1, self.x_width-1), min(y + 1, self.y_width-1)] = True
-            it_diag += 1
-            self.obstacle_map = obstacle_map_new.copy()
-        self.obstacle_map = self.obstacle_map.tolist()
-
-
-
-        # self.obstacle_map = [[False for _ in range(self.y_width+1)]
-        #                      for _ in range(self.x_width+1)]
-        # for ix in range(self.x_width+1):
-        #     x = self.calc_grid_position(ix, self.min_x)
-        #     for iy in range(self.y_width+1):
-        #         y = self.calc_grid_position(iy, self.min_y)
-        #         for iox, ioy in zip(ox, oy):
-        #             d = math.hypot(iox - x, ioy - y)
-        #             if d <= self.rr:
-        #                 self.obstacle_map[ix][iy] = True
-        #                 break
+        if obstacle_map is None:
+            obstacle_map = inflate_obstacle_map(grid, self.rr)
+        self.obstacle_map = obstacle_map
+        self.blocked = np.asarray(obstacle_map, dtype=bool).ravel().tolist()
 
     @staticmethod
     def get_motion_model():
@@ -39,6 +39,38 @@ def approximate_b_spline_path(x: list, y: list, n_path_points: int,
     return rx, ry
 
 
+def approximate_b_spline_paths(x: list, y: list, n_path_points_list: list,
+                               degree: int = 3) -> list:
+    """
+    approximate points with a B-Spline path sampled with each of the given
+    numbers of path points. The B-Spline is only fitted once and all the
+    samples are evaluated in a single call.
+
+    :param x: x position list of approximated points
+    :param y: y position list of approximated points
+    :param n_path_points_list: list with the number of path points of each path
+    :param degree: (Optional) B Spline curve degree
+    :return: list with the x and y position lists of each result path
+    """
+    t = range(len(x))
+    x_tup = scipy_interpolate.splrep(t, x, k=degree)
+    y_tup = scipy_interpolate.splrep(t, y, k=degree)
+
+    x_list = list(x_tup)
+    x_list[1] = x + [0.0, 0.0, 0.0, 0.0]
+
+    y_list = list(y_tup)
+    y_list[1] = y + [0.0, 0.0, 0.0, 0.0]
+
+    ipl_t = np.concatenate([np.linspace(0.0, len(x) - 1, n_path_points)
+                            for n_path_points in n_path_points_list])
+    rx = scipy_interpolate.splev(ipl_t, x_list)
+    ry = scipy_interpolate.splev(ipl_t, y_list)
+
+    splits = np.cumsum(n_path_points_list)[:-1]
+    return list(zip(np.split(rx, splits), np.split(ry, splits)))
+
+
 def interpolate_b_spline_path(x: list, y: list, n_path_points: int,
                               degree: int = 3) -> tuple:
     """
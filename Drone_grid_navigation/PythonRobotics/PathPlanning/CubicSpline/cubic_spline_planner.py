@@ -6,7 +6,6 @@ Author: Atsushi Sakai(@Atsushi_twi)
 """
 import math
 import numpy as np
-import bisect
 
 
 class Spline:
@@ -19,6 +18,7 @@ class Spline:
 
         self.x = x
         self.y = y
+        self.x_array = np.asarray(x, dtype=float)
 
         self.nx = len(x)  # dimension of x
         h = np.diff(x)
@@ -39,63 +39,84 @@ class Spline:
                 (self.c[i + 1] + 2.0 * self.c[i]) / 3.0
             self.b.append(tb)
 
+        # arrays of the coefficients for the evaluation of multiple points
+        self.a = np.array(self.a, dtype=float)
+        self.b = np.array(self.b, dtype=float)
+        self.d = np.array(self.d, dtype=float)
+
     def calc(self, t):
         """
         Calc position
 
-        if t is outside of the input x, return None
-
+        t can be a scalar or an array. If a scalar t is outside of the
+        input x, return None. For an array, the positions outside of the
+        input x are nan.
         """
-
-        if t < self.x[0]:
+        i, dx, outside = self.__search_index(t)
+        if i is None:
             return None
-        elif t > self.x[-1]:
-            return None
-
-        i = self.__search_index(t)
-        dx = t - self.x[i]
-        result = self.a[i] + self.b[i] * dx + \
-            self.c[i] * dx ** 2.0 + self.d[i] * dx ** 3.0
 
-        return result
+        # Horner evaluation of a + b * dx + c * dx ** 2 + d * dx ** 3
+        result = self.a[i] + dx * (self.b[i] + dx * (self.c[i] + dx * self.d[i]))
+        return self.__format_result(result, outside)
 
     def calcd(self, t):
         """
         Calc first derivative
 
-        if t is outside of the input x, return None
+        t can be a scalar or an array. If a scalar t is outside of the
+        input x, return None. For an array, the derivatives outside of the
+        input x are nan.
         """
-
-        if t < self.x[0]:
-            return None
-        elif t > self.x[-1]:
+        i, dx, outside = self.__search_index(t)
+        if i is None:
             return None
 
-        i = self.__search_index(t)
-        dx = t - self.x[i]
-        result = self.b[i] + 2.0 * self.c[i] * dx + 3.0 * self.d[i] * dx ** 2.0
-        return result
+        result = self.b[i] + dx * (2.0 * self.c[i] + 3.0 * self.d[i] * dx)
+        return self.__format_result(result, outside)
 
     def calcdd(self, t):
         """
         Calc second derivative
-        """
 
-        if t < self.x[0]:
-            return None
-        elif t > self.x[-1]:
+        t can be a scalar or an array. If a scalar t is outside of the
+        input x, return None. For an array, the derivatives outside of the
+        input x are nan.
+        """
+        i, dx, outside = self.__search_index(t)
+        if i is None:
             return None
 
-        i = self.__search_index(t)
-        dx = t - self.x[i]
         result = 2.0 * self.c[i] + 6.0 * self.d[i] * dx
-        return result
+        return self.__format_result(result, outside)
+
+    def __search_index(self, t):
+        """
+        search data segment index of each t with a binary search over the
+        input x
 
-    def __search_index(self, x):
+        return the segment indices, the distances of t to the start of their
+        segments and whether t is outside of the input x. The indices are
+        None if a scalar t is outside of the input x.
         """
-        search data segment index
+        t_array = np.asarray(t, dtype=float)
+        outside = (t_array < self.x_array[0]) | (t_array > self.x_array[-1])
+        if t_array.ndim == 0 and outside:
+            return None, None, outside
+        i = np.clip(np.searchsorted(self.x_array, t_array, side='right') - 1,
+                    0, self.nx - 2)
+        dx = t_array - self.x_array[i]
+        return i, dx, outside
+
+    @staticmethod
+    def __format_result(result, outside):
         """
-        return bisect.bisect(self.x, x) - 1
+        return a float for a scalar t and set the results outside of the
+        input x to nan for an array t
+        """
+        if np.ndim(result) == 0:
+            return float(result)
+        return np.where(outside, np.nan, result)
 
     def __calc_A(self, h):
         """
@@ -148,6 +169,8 @@ class Spline2D:
     def calc_position(self, s):
         """
         calc position
+
+        s can be a scalar or an array of arc lengths
         """
         x = self.sx.calc(s)
         y = self.sy.calc(s)
@@ -157,6 +180,8 @@ class Spline2D:
     def calc_curvature(self, s):
         """
         calc curvature
+
+        s can be a scalar or an array of arc lengths
         """
         dx = self.sx.calcd(s)
         ddx = self.sx.calcdd(s)
@@ -168,26 +193,26 @@ class Spline2D:
     def calc_yaw(self, s):
         """
         calc yaw
+
+        s can be a scalar or an array of arc lengths
         """
         dx = self.sx.calcd(s)
         dy = self.sy.calcd(s)
-        yaw = math.atan2(dy, dx)
+        if np.ndim(dx) == 0:
+            return math.atan2(dy, dx)
+        yaw = np.arctan2(dy, dx)
         return yaw
 
 
 def calc_spline_course(x, y, ds=0.1):
     sp = Spline2D(x, y)
-    s = list(np.arange(0, sp.s[-1], ds))
+    s = np.arange(0, sp.s[-1], ds)
 
-    rx, ry, ryaw, rk = [], [], [], []
-    for i_s in s:
-        ix, iy = sp.calc_position(i_s)
-        rx.append(ix)
-        ry.append(iy)
-        ryaw.append(sp.calc_yaw(i_s))
-        rk.append(sp.calc_curvature(i_s))
+    rx, ry = sp.calc_position(s)
+    ryaw = sp.calc_yaw(s)
+    rk = sp.calc_curvature(s)
 
-    return rx, ry, ryaw, rk, s
+    return rx.tolist(), ry.tolist(), ryaw.tolist(), rk.tolist(), s.tolist()
 
 
 def main():  # pragma: no cover
@@ -15,6 +15,7 @@ import math
 import random
 
 import matplotlib.pyplot as plt
+from scipy.spatial import cKDTree
 from scipy.spatial.transform import Rotation as Rot
 import numpy as np
 
@@ -38,10 +39,20 @@ class InformedRRTStar:
         self.max_iter = maxIter
         self.obstacle_list = obstacleList
         self.node_list = None
+        self.node_index = None
+
+        # KD-tree of the obstacle centres for the collision checks
+        obstacles = np.array(obstacleList, dtype=float).reshape(-1, 3)
+        self.obstacle_xy = obstacles[:, :2]
+        self.obstacle_size = obstacles[:, 2]
+        self.max_obstacle_size = np.max(obstacles[:, 2]) if len(obstacleList) else 0.0
+        self.obstacle_tree = cKDTree(self.obstacle_xy) if len(obstacleList) else None
 
     def informed_rrt_star_search(self, animation=True):
 
         self.node_list = [self.start]
+        self.node_index = NodeIndex(self.expand_dis)
+        self.node_index.insert(self.start.x, self.start.y)
         # max length we expect to find in our 'informed' sample space,
         # starts as infinite
         cBest = float('inf')
@@ -72,7 +83,7 @@ class InformedRRTStar:
             # cBest changes when a new path is found
 
             rnd = self.informed_sample(cBest, cMin, xCenter, C)
-            n_ind = self.get_nearest_list_index(self.node_list, rnd)
+            n_ind = self.get_nearest_index(rnd)
             nearestNode = self.node_list[n_ind]
             # steer
             theta = math.atan2(rnd[1] - nearestNode.y, rnd[0] - nearestNode.x)
@@ -86,6 +97,7 @@ class InformedRRTStar:
                 newNode = self.choose_parent(newNode, nearInds)
 
                 self.node_list.append(newNode)
+                self.node_index.insert(newNode.x, newNode.y)
                 self.rewire(newNode, nearInds)
 
                 if self.is_near_goal(newNode):
@@ -141,10 +153,13 @@ class InformedRRTStar:
     def find_near_nodes(self, newNode):
         n_node = len(self.node_list)
         r = 50.0 * math.sqrt((math.log(n_node) / n_node))
-        d_list = [(node.x - newNode.x) ** 2 + (node.y - newNode.y) ** 2
-                  for node in self.node_list]
-        near_inds = [d_list.index(i) for i in d_list if i <= r ** 2]
-        return near_inds
+        near_inds, d_list = self.node_index.query_radius(newNode.x, newNode.y, r)
+        # Nodes at the same distance are represented by the first of them,
+        # as done by the original search over the complete list of nodes
+        first_ind = {}
+        for i, d in zip(near_inds, d_list):
+            first_ind.setdefault(d, i)
+        return [first_ind[d] for d in d_list]
 
     def informed_sample(self, cMax, cMin, xCenter, C):
         if cMax < float('inf'):
@@ -199,6 +214,9 @@ class InformedRRTStar:
     def line_cost(node1, node2):
         return math.sqrt((node1.x - node2.x) ** 2 + (node1.y - node2.y) ** 2)
 
+    def get_nearest_index(self, rnd):
+        return self.node_index.nearest(rnd[0], rnd[1])
+
     @staticmethod
     def get_nearest_list_index(nodes, rnd):
         dList = [(node.x - rnd[0]) ** 2
@@ -207,7 +225,7 @@ class InformedRRTStar:
         return minIndex
 
     def get_new_node(self, theta, n_ind, nearestNode):
-        newNode = copy.deepcopy(nearestNode)
+        newNode = copy.copy(nearestNode)
         if self.only_integers:
             newNode.x += int(self.expand_dis * math.cos(theta))
             newNode.y += int(self.expand_dis * math.sin(theta))
@@ -260,20 +278,35 @@ class InformedRRTStar:
         return (p - projection).dot(p - projection)
 
     def check_segment_collision(self, x1, y1, x2, y2):
-        for (ox, oy, size) in self.obstacle_list:
-            dd = self.distance_squared_point_to_segment(
-                np.array([x1, y1]),
-                np.array([x2, y2]),
-                np.array([ox, oy]))
-            if dd <= size ** 2 or x2 > self.max_rand_x or y2 > self.max_rand_y or x2 < 0 or y2 < 0:
-                return False  # collision
-        return True
+        if self.obstacle_tree is None:
+            return True
+        if x2 > self.max_rand_x or y2 > self.max_rand_y or x2 < 0 or y2 < 0:
+            return False  # collision
+
+        # Only the obstacles within reach of the segment are checked: their
+        # distance to its midpoint is at most half its length plus their size
+        v = np.array([x1, y1], dtype=float)
+        w = np.array([x2, y2], dtype=float)
+        reach = 0.5 * math.hypot(x2 - x1, y2 - y1) + self.max_obstacle_size
+        candidates = self.obstacle_tree.query_ball_point(
+            0.5 * (v + w), reach * (1 + 1e-9) + 1e-9)
+        if not candidates:
+            return True
+        p = self.obstacle_xy[candidates]
+        vw = w - v
+        l2 = vw.dot(vw)
+        if l2 == 0:
+            projection = v
+        else:
+            t = np.clip((p - v).dot(vw) / l2, 0, 1)
+            projection = v + t[:, None] * vw
+        dd = np.sum((p - projection) ** 2, axis=1)
+        return not np.any(dd <= self.obstacle_size[candidates] ** 2)
 
     def check_collision(self, nearNode, theta, d):
-        tmpNode = copy.deepcopy(nearNode)
-        end_x = tmpNode.x + math.cos(theta) * d
-        end_y = tmpNode.y + math.sin(theta) * d
-        return self.check_segment_collision(tmpNode.x, tmpNode.y, end_x, end_y)
+        end_x = nearNode.x + math.cos(theta) * d
+        end_y = nearNode.y + math.sin(theta) * d
+        return self.check_segment_collision(nearNode.x, nearNode.y, end_x, end_y)
 
     def get_final_course(self, lastIndex):
         path = [[self.goal.x, self.goal.y]]
@@ -330,6 +363,75 @@ class InformedRRTStar:
         plt.plot(px, py, "--c")
 
 
+class NodeIndex:
+    """
+    Incremental spatial index of the tree nodes. The nodes are stored in a
+    uniform grid of buckets, such that the nearest and near node queries
+    only inspect the buckets around the queried point.
+    """
+
+    def __init__(self, bucket_size):
+        self.bucket_size = float(bucket_size)
+        self.buckets = {}
+        self.x, self.y = [], []
+        self.min_key = None
+        self.max_key = None
+
+    def get_key(self, x, y):
+        return (math.floor(x / self.bucket_size),
+                math.floor(y / self.bucket_size))
+
+    def insert(self, x, y):
+        key = self.get_key(x, y)
+        self.buckets.setdefault(key, []).append(len(self.x))
+        self.x.append(x)
+        self.y.append(y)
+        if self.min_key is None:
+            self.min_key, self.max_key = list(key), list(key)
+        for axis in range(2):
+            self.min_key[axis] = min(self.min_key[axis], key[axis])
+            self.max_key[axis] = max(self.max_key[axis], key[axis])
+
+    def nearest(self, x, y):
+        """
+        index of the nearest node. In case of a tie, the lowest index
+        """
+        kx, ky = self.get_key(x, y)
+        max_ring = max(abs(kx - self.min_key[0]), abs(kx - self.max_key[0]),
+                       abs(ky - self.min_key[1]), abs(ky - self.max_key[1]))
+        best = (float('inf'), -1)
+        for ring in range(max_ring + 1):
+            # The nodes outside of the ring are further than the ring border
+            if best[0] < ((ring - 1) * self.bucket_size) ** 2:
+                break
+            for bx in range(kx - ring, kx + ring + 1):
+                step = 1 if abs(bx - kx) == ring else 2 * ring
+                for by in range(ky - ring, ky + ring + 1, max(step, 1)):
+                    for i in self.buckets.get((bx, by), ()):
+                        d = (self.x[i] - x) ** 2 + (self.y[i] - y) ** 2
+                        if (d, i) < best:
+                            best = (d, i)
+        return best[1]
+
+    def query_radius(self, x, y, r):
+        """
+        indices, in increasing order, and squared distances of the nodes
+        within a distance r
+        """
+        kx_min, ky_min = self.get_key(x - r, y - r)
+        kx_max, ky_max = self.get_key(x + r, y + r)
+        inds = []
+        for bx in range(max(kx_min, self.min_key[0]),
+                        min(kx_max, self.max_key[0]) + 1):
+            for by in range(max(ky_min, self.min_key[1]),
+                            min(ky_max, self.max_key[1]) + 1):
+                inds.extend(self.buckets.get((bx, by), ()))
+        inds.sort()
+        d_list = [(self.x[i] - x) ** 2 + (self.y[i] - y) ** 2 for i in inds]
+        near = [(i, d) for i, d in zip(inds, d_list) if d <= r ** 2]
+        return [i for i, _ in near], [d for _, d in near]
+
+
 class Node:
 
     def __init__(self, x, y):
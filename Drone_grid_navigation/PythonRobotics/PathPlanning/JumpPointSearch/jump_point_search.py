@@ -0,0 +1,310 @@
+"""
+
+Jump Point Search grid planning
+
+author: Jose Ignacio de Alvear Cardenas (@joigalcar3)
+
+On uniform-cost 8-connected grids, most of the cells that A* opens lie on straight or diagonal runs of free cells that
+no optimal path needs to stop at. Jump Point Search only opens the cells where an optimal path may change its
+direction (jump points), so it finds paths of the same cost as A* with a fraction of the expanded nodes.
+
+The jump distances of every cell in the 8 directions only depend on the map, so they are precomputed with numpy (as
+in JPS+) and the search only looks them up.
+
+See Harabor and Grastien, "Online Graph Pruning for Pathfinding on Grid Maps", AAAI 2011.
+
+"""
+
+import math
+import heapq
+import numpy as np
+import matplotlib.pyplot as plt
+
+from Drone_grid_navigation.PythonRobotics.PathPlanning.AStar.a_star import AStarPlanner
+
+show_animation = True
+
+STRAIGHT_DIRECTIONS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+DIAGONAL_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+def shift(padded, dx, dy):
+    """
+    Values of a padded array at the cells displaced by (dx, dy) from every cell inside the padding
+
+    padded: array padded with one cell at every side
+    dx, dy: displacement [cells], at most 1 along each axis
+    """
+    x_width, y_width = padded.shape[0] - 2, padded.shape[1] - 2
+    return padded[1 + dx:1 + dx + x_width, 1 + dy:1 + dy + y_width]
+
+
+def straight_jump_table(blocked, jump, step):
+    """
+    Jump distances of the cells of a padded grid when moving along the second axis. For every cell, the value is the
+    number of steps to the first jump point if it is positive, or minus the number of free cells before the first
+    blocked one otherwise
+
+    blocked: padded occupancy grid
+    jump: padded array which tells whether each cell is a jump point when reached in this direction
+    step: direction of the movement, 1 or -1
+    """
+    table = np.zeros(blocked.shape, dtype=np.int32)
+    y_width = blocked.shape[1] - 2
+    columns = range(y_width, 0, -1) if step > 0 else range(1, y_width + 1)
+    for y in columns:
+        following = table[:, y + step]
+        table[:, y] = np.where(blocked[:, y + step], 0,
+                               np.where(jump[:, y + step], 1, following + np.where(following > 0, 1, -1)))
+    return table
+
+
+def diagonal_jump_table(blocked, jump, dx, dy):
+    """
+    Jump distances of the cells of a padded grid when moving along a diagonal, with the same meaning as in
+    straight_jump_table
+
+    blocked: padded occupancy grid
+    jump: padded array which tells whether each cell is a jump point when reached in this direction
+    dx, dy: direction of the movement
+    """
+    table = np.zeros(blocked.shape, dtype=np.int32)
+    x_width, y_width = blocked.shape[0] - 2, blocked.shape[1] - 2
+    rows = range(x_width, 0, -1) if dx > 0 else range(1, x_width + 1)
+    following_columns = slice(1 + dy, 1 + dy + y_width)
+    for x in rows:
+        following = table[x + dx, following_columns]
+        table[x, 1:1 + y_width] = np.where(blocked[x + dx, following_columns], 0,
+                                           np.where(jump[x + dx, following_columns], 1,
+                                                    following + np.where(following > 0, 1, -1)))
+    return table
+
+
+def compute_jump_table(obstacle_map):
+    """
+    Precompute the jump distances of every cell in the 8 directions. A cell is a jump point when it has a forced
+    neighbour: a free cell next to an obstacle that can only be reached optimally through it. When moving along a
+    diagonal, it is also a jump point when one of the two straight movements that compose the diagonal reaches a jump
+    point. The cells outside the grid are considered blocked
+
+    obstacle_map: occupancy grid inflated with the robot radius
+    output: dictionary with the flat list of jump distances of the padded grid for each direction
+    """
+    blocked = np.pad(np.asarray(obstacle_map, dtype=bool), 1, constant_values=True)
+    free = ~blocked
+
+    tables = {}
+    for dx, dy in STRAIGHT_DIRECTIONS:
+        forced = np.zeros(blocked.shape, dtype=bool)
+        for px, py in [(dy, dx), (-dy, -dx)]:
+            forced[1:-1, 1:-1] |= shift(blocked, px, py) & shift(free, px + dx, py + dy)
+        if dx == 0:
+            tables[(dx, dy)] = straight_jump_table(blocked, forced, dy)
+        else:
+            tables[(dx, dy)] = straight_jump_table(blocked.T, forced.T, dx).T
+
+    for dx, dy in DIAGONAL_DIRECTIONS:
+        jump = (tables[(dx, 0)] > 0) | (tables[(0, dy)] > 0)
+        jump[1:-1, 1:-1] |= (shift(blocked, -dx, 0) & shift(free, -dx, dy)) | \
+                            (shift(blocked, 0, -dy) & shift(free, dx, -dy))
+        tables[(dx, dy)] = diagonal_jump_table(blocked, jump, dx, dy)
+
+    return {direction: table.ravel().tolist() for direction, table in tables.items()}
+
+
+class JPSPlanner(AStarPlanner):
+
+    def __init__(self, grid, resolution, rr, obstacle_map=None, jump_table=None):
+        """
+        Initialize grid map for jump point search planning
+
+        grid: occupancy grid
+        resolution: grid resolution [m]
+        rr: robot radius[m]
+        obstacle_map: occupancy grid already inflated with rr. If not provided, it is computed from grid
+        jump_table: jump distances of obstacle_map, as returned by compute_jump_table. If not provided, they are
+            computed
+        """
+        super().__init__(grid, resolution, rr, obstacle_map)
+        if jump_table is None:
+            jump_table = compute_jump_table(self.obstacle_map)
+        self.jump_table = jump_table
+        self.padded_blocked = np.pad(np.asarray(self.obstacle_map, dtype=bool), 1,
+                                     constant_values=True).ravel().tolist()
+
+    def planning(self, sx, sy, gx, gy, animation=True):
+        """
+        Jump point search. It is an A* search over the jump points, with the octile distance to the goal as heuristic.
+        The costs, parents and closed flags are flat lists indexed by the index of the cells in the padded grid.
+
+        input:
+            s_x: start x position [m]
+            s_y: start y position [m]
+            gx: goal x position [m]
+            gy: goal y position [m]
+
+        output:
+            rx: x position list of the final path, with all the cells between the jump points
+            ry: y position list of the final path, with all the cells between the jump points
+        """
+        start_x = self.calc_xy_index(sx, self.min_x)
+        start_y = self.calc_xy_index(sy, self.min_y)
+        goal_x = self.calc_xy_index(gx, self.min_x)
+        goal_y = self.calc_xy_index(gy, self.min_y)
+
+        padded_width = self.y_width + 2
+        n_cells = (self.x_width + 2) * padded_width
+        start_index = self.calc_padded_index(start_x, start_y)
+        goal_index = self.calc_padded_index(goal_x, goal_y)
+
+        cost = [math.inf] * n_cells
+        parent = [-1] * n_cells
+        closed = bytearray(n_cells)
+        blocked = self.padded_blocked
+        jump_table = self.jump_table
+        diagonal_cost = math.sqrt(2) - 1
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        cost[start_index] = 0.0
+        open_heap = [(0.0, start_index)]
+        found = False
+        self.n_expansions = 0
+        while open_heap:
+            _, c_id = heappop(open_heap)
+            if closed[c_id]:
+                continue
+            closed[c_id] = 1
+            self.n_expansions += 1
+            current_x, current_y = divmod(c_id, padded_width)
+            current_x -= 1
+            current_y -= 1
+
+            # show graph
+            if animation:  # pragma: no cover
+                plt.plot(self.calc_grid_position(current_y, self.min_y),
+                         self.calc_grid_position(current_x, self.min_x), "xc")
+                # for stopping simulation with the esc key.
+                plt.gcf().canvas.mpl_connect('key_release_event',
+                                             lambda event: [exit(
+                                                 0) if event.key == 'escape' else None])
+                plt.pause(0.001)
+
+            if c_id == goal_index:
+                print("Find goal")
+                found = True
+                break
+
+            # Directions in which the optimal paths through the current node can continue
+            if parent[c_id] == -1:
+                directions = STRAIGHT_DIRECTIONS + DIAGONAL_DIRECTIONS
+            else:
+                parent_x, parent_y = divmod(parent[c_id], padded_width)
+                directions = self.prune_directions(c_id, (current_x + 1 > parent_x) - (current_x + 1 < parent_x),
+                                                   (current_y + 1 > parent_y) - (current_y + 1 < parent_y), blocked)
+
+            current_cost = cost[c_id]
+            for dx, dy in directions:
+                n_steps = jump_table[(dx, dy)][c_id]
+                n_steps = self.jump_to_goal(current_x, current_y, dx, dy, goal_x, goal_y, n_steps)
+                if n_steps == 0:
+                    continue
+                n_id = c_id + n_steps * (dx * padded_width + dy)
+                if closed[n_id]:
+                    continue
+
+                new_cost = current_cost + (n_steps if dx == 0 or dy == 0 else n_steps * math.sqrt(2))
+                if new_cost < cost[n_id]:
+                    # This path is the best until now. record it
+                    distance_x = abs(current_x + n_steps * dx - goal_x)
+                    distance_y = abs(current_y + n_steps * dy - goal_y)
+                    h = max(distance_x, distance_y) + diagonal_cost * min(distance_x, distance_y)
+                    cost[n_id] = new_cost
+                    parent[n_id] = c_id
+                    heappush(open_heap, (new_cost + h, n_id))
+
+        if not found:
+            print("Open set is empty..")
+            print("Start: (", sx, ",", sy, "). Goal: (", gx, ",", gy, ").")
+            parent[goal_index] = -1
+
+        rx, ry = self.calc_final_path(goal_index, parent)
+
+        return rx, ry
+
+    @staticmethod
+    def jump_to_goal(x, y, dx, dy, goal_x, goal_y, n_steps):
+        """
+        Number of steps of the jump from a cell in a direction, taking into account that the jump stops at the goal or,
+        when moving along a diagonal, at the cell aligned with the goal, from which the goal can be reached straight
+
+        x, y: cell from which the jump starts
+        dx, dy: direction of the jump
+        goal_x, goal_y: goal cell
+        n_steps: jump distance of the cell in the direction, as stored in the jump table
+        output: number of steps to the next jump point, 0 if there is none
+        """
+        reach = n_steps if n_steps > 0 else -n_steps
+        to_goal_x = (goal_x - x) * dx
+        to_goal_y = (goal_y - y) * dy
+        if dx == 0:
+            if goal_x == x and 0 < to_goal_y <= reach:
+                return to_goal_y
+        elif dy == 0:
+            if goal_y == y and 0 < to_goal_x <= reach:
+                return to_goal_x
+        elif to_goal_x > 0 and to_goal_y > 0 and min(to_goal_x, to_goal_y) <= reach:
+            return min(to_goal_x, to_goal_y)
+        return n_steps if n_steps > 0 else 0
+
+    def prune_directions(self, c_id, dx, dy, blocked):
+        """
+        Directions that have to be explored from a jump point reached in a given direction: the natural ones, which
+        keep the direction of the movement, and the forced ones, towards the free cells behind the adjacent obstacles
+
+        c_id: index of the jump point in the padded grid
+        dx, dy: direction in which the jump point was reached
+        blocked: flat list of the padded occupancy grid
+        """
+        padded_width = self.y_width + 2
+        if dy == 0:
+            directions = [(dx, 0)]
+            for py in (1, -1):
+                if blocked[c_id + py]:
+                    directions.append((dx, py))
+        elif dx == 0:
+            directions = [(0, dy)]
+            for px in (1, -1):
+                if blocked[c_id + px * padded_width]:
+                    directions.append((px, dy))
+        else:
+            directions = [(dx, 0), (0, dy), (dx, dy)]
+            if blocked[c_id - dx * padded_width]:
+                directions.append((-dx, dy))
+            if blocked[c_id - dy]:
+                directions.append((dx, -dy))
+        return directions
+
+    def calc_final_path(self, goal_index, parent):
+        # generate final course, including the cells between consecutive jump points
+        rx, ry = [], []
+        padded_width = self.y_width + 2
+        index = goal_index
+        while index != -1:
+            x, y = divmod(index, padded_width)
+            x, y = x - 1, y - 1
+            rx.append(self.calc_grid_position(x, self.min_x))
+            ry.append(self.calc_grid_position(y, self.min_y))
+            if parent[index] != -1:
+                parent_x, parent_y = divmod(parent[index], padded_width)
+                parent_x, parent_y = parent_x - 1, parent_y - 1
+                dx = (parent_x > x) - (parent_x < x)
+                dy = (parent_y > y) - (parent_y < y)
+                for i in range(1, max(abs(parent_x - x), abs(parent_y - y))):
+                    rx.append(self.calc_grid_position(x + i * dx, self.min_x))
+                    ry.append(self.calc_grid_position(y + i * dy, self.min_y))
+            index = parent[index]
+
+        return rx, ry
+
+    def calc_padded_index(self, x, y):
+        return (x - self.min_x + 1) * (self.y_width + 2) + (y - self.min_y + 1)
@@ -16,6 +16,7 @@ from scipy.spatial import cKDTree
 N_SAMPLE = 500  # number of sample_points
 N_KNN = 10  # number of edge from one sampled point
 MAX_EDGE_LEN = 30.0  # [m] Maximum edge length
+ROAD_MAP_CHUNK = 1000  # number of nodes whose candidate edges are built at once
 
 show_animation = True
 
@@ -36,89 +37,234 @@ class Node:
                str(self.cost) + "," + str(self.parent_index)
 
 
-def prm_planning(sx, sy, gx, gy, ox, oy, rr, animation):
+def prm_planning(sx, sy, gx, gy, ox, oy, rr, animation, road_map_info=None,
+                 search_stats=None):
+    """
+    PRM planning
+
+    road_map_info: road map of the sampled points as returned by
+    generate_prm_road_map. It only depends on the obstacles, so it can be
+    reused for multiple start and goal positions. If not provided, it is
+    generated.
+    search_stats: dictionary where the number of nodes expanded by the
+    search is stored under "n_expansions", if provided
+    """
 
-    obstacle_kd_tree = cKDTree(np.vstack((ox, oy)).T)
+    if road_map_info is None:
+        road_map_info = generate_prm_road_map(ox, oy, rr)
+    sample_x, sample_y, road_map, obstacle_kd_tree = road_map_info
 
-    sample_x, sample_y = sample_points(sx, sy, gx, gy,
-                                       rr, ox, oy, obstacle_kd_tree)
+    sample_x, sample_y, road_map = connect_start_goal(
+        road_map, sample_x, sample_y, sx, sy, gx, gy, rr, obstacle_kd_tree)
     if animation:
         plt.plot(sample_y, sample_x, ".b")
 
-    road_map = generate_road_map(sample_x, sample_y, rr, obstacle_kd_tree)
-
     rx, ry = dijkstra_planning(
-        sx, sy, gx, gy, road_map, sample_x, sample_y, animation)
+        sx, sy, gx, gy, road_map, sample_x, sample_y, animation, search_stats)
 
     return rx, ry
 
 
-def is_collision(sx, sy, gx, gy, rr, obstacle_kd_tree):
-    x = sx
-    y = sy
+def generate_prm_road_map(ox, oy, rr):
+    """
+    Samples the free space and generates the road map between the samples
+
+    @return: x and y positions of the samples, road map and KDTree object of
+    obstacles
+    """
+
+    obstacle_kd_tree = cKDTree(np.vstack((ox, oy)).T)
+    sample_x, sample_y = sample_free_points(rr, ox, oy, obstacle_kd_tree)
+    road_map = generate_road_map(sample_x, sample_y, rr, obstacle_kd_tree)
+
+    return sample_x, sample_y, road_map, obstacle_kd_tree
+
+
+def is_collision(sx, sy, gx, gy, rr, obstacle_kd_tree,
+                 max_edge_len=MAX_EDGE_LEN):
+    return bool(is_collision_batch([sx], [sy], [gx], [gy], rr,
+                                   obstacle_kd_tree, max_edge_len)[0])
+
+
+def is_collision_batch(sx, sy, gx, gy, rr, obstacle_kd_tree,
+                       max_edge_len=MAX_EDGE_LEN):
+    """
+    Collision check of multiple edges at once. Every edge is stepped with
+    the robot radius from its start and the stepped points of all the edges,
+    together with their end points, are checked with a single query to the
+    obstacle KDTree.
+
+    sx, sy: [m] arrays with the start positions of the edges
+    gx, gy: [m] arrays with the end positions of the edges
+
+    @return: boolean array, True for the edges in collision
+    """
+
+    sx, sy, gx, gy = (np.asarray(v, dtype=float).ravel()
+                      for v in (sx, sy, gx, gy))
     dx = gx - sx
     dy = gy - sy
-    yaw = math.atan2(gy - sy, gx - sx)
-    d = math.hypot(dx, dy)
-
-    if d >= MAX_EDGE_LEN:
-        return True
+    yaw = np.arctan2(dy, dx)
+    d = np.hypot(dx, dy)
 
+    collision = d >= max_edge_len
     D = rr
-    n_step = round(d / D)
+    n_step = np.where(collision, 0, np.round(d / D)).astype(int)
 
-    for i in range(n_step):
-        dist, _ = obstacle_kd_tree.query([x, y])
-        if dist <= rr:
-            return True  # collision
-        x += D * math.cos(yaw)
-        y += D * math.sin(yaw)
+    # stepped points of all the edges
+    edge = np.repeat(np.arange(sx.shape[0]), n_step)
+    step = np.arange(edge.shape[0]) - np.repeat(np.cumsum(n_step) - n_step,
+                                                n_step)
+    x = sx[edge] + step * D * np.cos(yaw[edge])
+    y = sy[edge] + step * D * np.sin(yaw[edge])
 
     # goal point check
-    dist, _ = obstacle_kd_tree.query([gx, gy])
-    if dist <= rr:
-        return True  # collision
+    goal_edge = np.flatnonzero(~collision)
+    edge = np.concatenate((edge, goal_edge))
+    x = np.concatenate((x, gx[goal_edge]))
+    y = np.concatenate((y, gy[goal_edge]))
+
+    if edge.shape[0]:
+        dist, _ = obstacle_kd_tree.query(np.column_stack((x, y)))
+        collision[edge[dist <= rr]] = True
 
-    return False  # OK
+    return collision
 
 
-def generate_road_map(sample_x, sample_y, rr, obstacle_kd_tree):
+def generate_road_map(sample_x, sample_y, rr, obstacle_kd_tree,
+                      n_knn=N_KNN, max_edge_len=MAX_EDGE_LEN):
     """
     Road map generation
 
+    Every point is connected to its n_knn nearest points, in order of
+    distance and then index, with a collision free edge. The candidate edges
+    of all the points are built at once and their collisions are checked in
+    batches: first the 2 * n_knn nearest of each point and then windows of
+    doubling size for the points that still lack edges.
+
     sample_x: [m] x positions of sampled points
     sample_y: [m] y positions of sampled points
     rr: Robot Radius[m]
     obstacle_kd_tree: KDTree object of obstacles
     """
 
+    xy = np.column_stack((sample_x, sample_y)).astype(float)
+    n_sample = xy.shape[0]
+    sample_kd_tree = cKDTree(xy)
     road_map = []
-    n_sample = len(sample_x)
-    sample_kd_tree = cKDTree(np.vstack((sample_x, sample_y)).T)
 
-    for (i, ix, iy) in zip(range(n_sample), sample_x, sample_y):
+    for chunk_start in range(0, n_sample, ROAD_MAP_CHUNK):
+        rows = np.arange(chunk_start, min(chunk_start + ROAD_MAP_CHUNK,
+                                          n_sample))
+        edge_i, edge_j = candidate_edges(
+            xy, sample_kd_tree, xy[rows], rows, max_edge_len)
+
+        # rank of each candidate edge among those of its point
+        row_start = np.searchsorted(edge_i, rows)
+        row_end = np.searchsorted(edge_i, rows, side="right")
+        rank = np.arange(edge_i.shape[0]) - row_start[edge_i - chunk_start]
+
+        valid = np.zeros(edge_i.shape[0], dtype=bool)
+        n_valid = np.zeros(rows.shape[0], dtype=int)
+        low, high = 0, 2 * n_knn
+        while True:
+            window = (rank >= low) & (rank < high) & \
+                     (n_valid[edge_i - chunk_start] < n_knn)
+            if not window.any():
+                break
+            valid[window] = ~is_collision_batch(
+                xy[edge_i[window], 0], xy[edge_i[window], 1],
+                xy[edge_j[window], 0], xy[edge_j[window], 1],
+                rr, obstacle_kd_tree, max_edge_len)
+            n_valid = np.bincount(edge_i[valid] - chunk_start,
+                                  minlength=rows.shape[0])
+            low, high = high, 2 * high
+
+        for start, end in zip(row_start, row_end):
+            road_map.append(
+                edge_j[start:end][valid[start:end]][:n_knn].tolist())
 
-        dists, indexes = sample_kd_tree.query([ix, iy], k=n_sample)
-        edge_id = []
+    #  plot_road_map(road_map, sample_x, sample_y)
 
-        for ii in range(1, len(indexes)):
-            nx = sample_x[indexes[ii]]
-            ny = sample_y[indexes[ii]]
+    return road_map
 
-            if not is_collision(ix, iy, nx, ny, rr, obstacle_kd_tree):
-                edge_id.append(indexes[ii])
 
-            if len(edge_id) >= N_KNN:
-                break
+def candidate_edges(xy, kd_tree, query_xy, query_ids, max_edge_len):
+    """
+    Edges from the queried points to all the points closer than
+    max_edge_len, sorted by queried point, distance and index
 
-        road_map.append(edge_id)
+    @return: arrays with the start and end indices of the edges
+    """
 
-    #  plot_road_map(road_map, sample_x, sample_y)
+    neighbours = kd_tree.query_ball_point(query_xy, max_edge_len)
+    counts = np.array([len(n) for n in neighbours], dtype=int)
+    edge_i = np.repeat(query_ids, counts)
+    edge_j = np.concatenate(
+        [np.asarray(n, dtype=int) for n in neighbours] + [np.zeros(0, int)])
+    d = np.hypot(xy[edge_j, 0] - xy[edge_i, 0], xy[edge_j, 1] - xy[edge_i, 1])
+    keep = (edge_j != edge_i) & (d < max_edge_len)
+    edge_i, edge_j, d = edge_i[keep], edge_j[keep], d[keep]
+    order = np.lexsort((edge_j, d, edge_i))
+    return edge_i[order], edge_j[order]
+
+
+def connect_start_goal(road_map, sample_x, sample_y, sx, sy, gx, gy, rr,
+                       obstacle_kd_tree, n_knn=N_KNN,
+                       max_edge_len=MAX_EDGE_LEN):
+    """
+    Adds the start and goal positions as the last two points of a road map.
+    They are connected to their n_knn nearest points with a collision free
+    edge, and they replace the furthest edges of the points for which they
+    are one of their n_knn nearest points. This leads to the road map that
+    would have been generated with the start and goal among the samples.
+    The provided road map is not modified.
+
+    @return: x and y positions of the points and road map
+    """
 
-    return road_map
+    sample_x = list(sample_x) + [sx, gx]
+    sample_y = list(sample_y) + [sy, gy]
+    road_map = [list(edges) for edges in road_map]
+    xy = np.column_stack((sample_x, sample_y)).astype(float)
+    n_sample = xy.shape[0] - 2
+    kd_tree = cKDTree(xy)
+    new_ids = np.array([n_sample, n_sample + 1])
+
+    # edges from the start and the goal
+    edge_i, edge_j = candidate_edges(xy, kd_tree, xy[new_ids], new_ids,
+                                     max_edge_len)
+    valid = ~is_collision_batch(xy[edge_i, 0], xy[edge_i, 1],
+                                xy[edge_j, 0], xy[edge_j, 1],
+                                rr, obstacle_kd_tree, max_edge_len)
+    for new_id in new_ids:
+        road_map.append(
+            edge_j[(edge_i == new_id) & valid][:n_knn].tolist())
+
+    # edges to the start and the goal
+    samples = edge_j < n_sample
+    edge_k, edge_j = edge_i[samples], edge_j[samples]
+    valid = ~is_collision_batch(xy[edge_j, 0], xy[edge_j, 1],
+                                xy[edge_k, 0], xy[edge_k, 1],
+                                rr, obstacle_kd_tree, max_edge_len)
+    for j, k in zip(edge_j[valid], edge_k[valid]):
+        edges = road_map[j]
+        d_new = math.hypot(xy[k, 0] - xy[j, 0], xy[k, 1] - xy[j, 1])
+        position = len(edges)
+        for ii, e in enumerate(edges):
+            d_e = math.hypot(xy[e, 0] - xy[j, 0], xy[e, 1] - xy[j, 1])
+            if (d_new, k) < (d_e, e):
+                position = ii
+                break
+        if position < n_knn:
+            edges.insert(position, int(k))
+            del edges[n_knn:]
+
+    return sample_x, sample_y, road_map
 
 
-def dijkstra_planning(sx, sy, gx, gy, road_map, sample_x, sample_y, animation):
+def dijkstra_planning(sx, sy, gx, gy, road_map, sample_x, sample_y, animation,
+                      search_stats=None):
     """
     s_x: start x position [m]
     s_y: start y position [m]
@@ -130,6 +276,8 @@ def dijkstra_planning(sx, sy, gx, gy, road_map, sample_x, sample_y, animation):
     road_map: ??? [m]
     sample_x: ??? [m]
     sample_y: ??? [m]
+    search_stats: dictionary where the number of expanded nodes is stored
+    under "n_expansions", if provided
 
     @return: Two lists of path coordinates ([x1, x2, ...], [y1, y2, ...]), empty list when no path was found
     """
@@ -190,6 +338,9 @@ def dijkstra_planning(sx, sy, gx, gy, road_map, sample_x, sample_y, animation):
             else:
                 open_set[n_id] = node
 
+    if search_stats is not None:
+        search_stats["n_expansions"] = len(closed_set)
+
     if path_found is False:
         return [], []
 
@@ -216,6 +367,17 @@ def plot_road_map(road_map, sample_x, sample_y):  # pragma: no cover
 
 
 def sample_points(sx, sy, gx, gy, rr, ox, oy, obstacle_kd_tree):
+    sample_x, sample_y = sample_free_points(rr, ox, oy, obstacle_kd_tree)
+
+    sample_x.append(sx)
+    sample_y.append(sy)
+    sample_x.append(gx)
+    sample_y.append(gy)
+
+    return sample_x, sample_y
+
+
+def sample_free_points(rr, ox, oy, obstacle_kd_tree):
     max_x = max(ox)
     max_y = max(oy)
     min_x = min(ox)
@@ -233,11 +395,6 @@ def sample_points(sx, sy, gx, gy, rr, ox, oy, obstacle_kd_tree):
             sample_x.append(tx)
             sample_y.append(ty)
 
-    sample_x.append(sx)
-    sample_y.append(sy)
-    sample_x.append(gx)
-    sample_y.append(gy)
-
     return sample_x, sample_y
 
 
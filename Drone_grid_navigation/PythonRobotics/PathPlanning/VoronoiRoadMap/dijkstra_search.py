@@ -30,6 +30,7 @@ class DijkstraSearch:
 
     def __init__(self, show_animation):
         self.show_animation = show_animation
+        self.n_expansions = 0  # number of nodes expanded by the last search
 
     def search(self, sx, sy, gx, gy, node_x, node_y, edge_ids_list):
         """
@@ -97,6 +98,8 @@ class DijkstraSearch:
                 else:
                     open_set[n_id] = node
 
+        self.n_expansions = len(close_set)
+
         # generate final course
         rx, ry = self.generate_final_path(close_set, goal_node)
 
@@ -6,10 +6,11 @@ author: Atsushi Sakai (@Atsushi_twi)
 
 """
 
-import math
 import numpy as np
 import matplotlib.pyplot as plt
 from Drone_grid_navigation.PythonRobotics.PathPlanning.VoronoiRoadMap.dijkstra_search import DijkstraSearch
+from Drone_grid_navigation.PythonRobotics.PathPlanning.ProbabilisticRoadMap.probabilistic_road_map import \
+    is_collision_batch, generate_road_map, connect_start_goal
 from scipy.spatial import cKDTree, Voronoi
 
 
@@ -23,85 +24,54 @@ class VoronoiRoadMapPlanner:
         self.show_animation = show_animation
         self.x_limit = x_limit
         self.y_limit = y_limit
+        self.n_expansions = 0  # number of nodes expanded by the last search
 
-    def planning(self, sx, sy, gx, gy, ox, oy, robot_radius):
-        obstacle_tree = cKDTree(np.vstack((ox, oy)).T)
+    def planning(self, sx, sy, gx, gy, ox, oy, robot_radius, road_map_info=None):
+        """
+        Voronoi road map planning
+        :param road_map_info: road map of the Voronoi vertices as returned by generate_voronoi_road_map. It only depends
+        on the obstacles, so it can be reused for multiple start and goal positions. If not provided, it is generated.
+        """
+        if road_map_info is None:
+            road_map_info = self.generate_voronoi_road_map(ox, oy, robot_radius)
+        sample_x, sample_y, road_map, obstacle_tree = road_map_info
 
-        sample_x, sample_y = self.voronoi_sampling(sx, sy, gx, gy, ox, oy, self.only_integers)
+        sample_x, sample_y, road_map_info = connect_start_goal(road_map, sample_x, sample_y, sx, sy, gx, gy,
+                                                               robot_radius, obstacle_tree, self.N_KNN,
+                                                               self.MAX_EDGE_LEN)
         if self.show_animation:  # pragma: no cover
             plt.plot(sample_y, sample_x, ".b")
 
-        road_map_info = self.generate_road_map_info(
-            sample_x, sample_y, robot_radius, obstacle_tree)
-
-        rx, ry = DijkstraSearch(self.show_animation).search(sx, sy, gx, gy,
-                                                       sample_x, sample_y,
-                                                       road_map_info)
+        dijkstra = DijkstraSearch(self.show_animation)
+        rx, ry = dijkstra.search(sx, sy, gx, gy, sample_x, sample_y,
+                                 road_map_info)
+        self.n_expansions = dijkstra.n_expansions
         return rx, ry
 
-    def is_collision(self, sx, sy, gx, gy, rr, obstacle_kd_tree):
-        x = sx
-        y = sy
-        dx = gx - sx
-        dy = gy - sy
-        yaw = math.atan2(gy - sy, gx - sx)
-        d = math.hypot(dx, dy)
-
-        if d >= self.MAX_EDGE_LEN:
-            return True
-
-        D = rr
-        n_step = round(d / D)
-
-        for i in range(n_step):
-            dist, _ = obstacle_kd_tree.query([x, y])
-            if dist <= rr:
-                return True  # collision
-            x += D * math.cos(yaw)
-            y += D * math.sin(yaw)
-
-        # goal point check
-        dist, _ = obstacle_kd_tree.query([gx, gy])
-        if dist <= rr:
-            return True  # collision
+    def generate_voronoi_road_map(self, ox, oy, robot_radius):
+        """
+        Computes the Voronoi vertices of the obstacles and generates the road map between them
+        :return: x and y positions of the vertices, road map and KDTree object of obstacles
+        """
+        obstacle_tree = cKDTree(np.vstack((ox, oy)).T)
+        sample_x, sample_y = self.voronoi_vertices(ox, oy, self.only_integers)
+        road_map = self.generate_road_map_info(sample_x, sample_y, robot_radius, obstacle_tree)
+        return sample_x, sample_y, road_map, obstacle_tree
 
-        return False  # OK
+    def is_collision(self, sx, sy, gx, gy, rr, obstacle_kd_tree):
+        return bool(is_collision_batch([sx], [sy], [gx], [gy], rr, obstacle_kd_tree, self.MAX_EDGE_LEN)[0])
 
     def generate_road_map_info(self, node_x, node_y, rr, obstacle_tree):
         """
-        Road map generation
+        Road map generation. The candidate edges of all the nodes are checked at once, as explained in
+        probabilistic_road_map.generate_road_map
 
         node_x: [m] x positions of sampled points
         node_y: [m] y positions of sampled points
         rr: Robot Radius[m]
         obstacle_tree: KDTree object of obstacles
         """
-
-        road_map = []
-        n_sample = len(node_x)
-        node_tree = cKDTree(np.vstack((node_x, node_y)).T)
-
-        for (i, ix, iy) in zip(range(n_sample), node_x, node_y):
-
-            dists, indexes = node_tree.query([ix, iy], k=n_sample)
-
-            edge_id = []
-
-            for ii in range(1, len(indexes)):
-                nx = node_x[indexes[ii]]
-                ny = node_y[indexes[ii]]
-
-                if not self.is_collision(ix, iy, nx, ny, rr, obstacle_tree):
-                    edge_id.append(indexes[ii])
-
-                if len(edge_id) >= self.N_KNN:
-                    break
-
-            road_map.append(edge_id)
-
-        #  plot_road_map(road_map, sample_x, sample_y)
-
-        return road_map
+        return generate_road_map(node_x, node_y, rr, obstacle_tree, self.N_KNN, self.MAX_EDGE_LEN)
 
     @staticmethod
     def plot_road_map(road_map, sample_x, sample_y):  # pragma: no cover
@@ -114,34 +84,37 @@ class VoronoiRoadMapPlanner:
                          [sample_y[i], sample_y[ind]], "-k")
 
     def voronoi_sampling(self, sx, sy, gx, gy, ox, oy, only_integers):
+        sample_x, sample_y = self.voronoi_vertices(ox, oy, only_integers)
+
+        sample_x.append(sx)
+        sample_y.append(sy)
+        sample_x.append(gx)
+        sample_y.append(gy)
+
+        return sample_x, sample_y
+
+    def voronoi_vertices(self, ox, oy, only_integers):
         oxy = np.vstack((ox, oy)).T
 
         # generate voronoi point
         vor = Voronoi(oxy)
-        sample_x = []
-        sample_y = []
+        vertices = vor.vertices
         if only_integers:
-            for [ix, iy] in vor.vertices:
-                if not any(np.equal(oxy, [int(ix), int(iy)]).all(1)) and (0 <= int(ix) <= self.x_limit) and\
-                        (0 <= int(iy) <= self.y_limit):
-                    sample_x.append(int(ix))
-                    sample_y.append(int(iy))
-
-            # sample_x = [int(ix) for [ix, _] in vor.vertices]
-            # sample_y = [int(iy) for [_, iy] in vor.vertices]
+            vertices = np.trunc(vertices)
+            inside = (vertices[:, 0] >= 0) & (vertices[:, 0] <= self.x_limit) & \
+                     (vertices[:, 1] >= 0) & (vertices[:, 1] <= self.y_limit)
         else:
-            for [ix, iy] in vor.vertices:
-                if not any(np.equal(oxy, [ix, iy]).all(1)):
-                    sample_x.append(ix)
-                    sample_y.append(iy)
+            inside = np.ones(vertices.shape[0], dtype=bool)
 
-            # sample_x = [ix for [ix, _] in vor.vertices]
-            # sample_y = [iy for [_, iy] in vor.vertices]
+        # The vertices located on an obstacle are discarded
+        obstacles = set(map(tuple, oxy.tolist()))
+        keep = [i and (x, y) not in obstacles for i, (x, y) in zip(inside.tolist(), vertices.tolist())]
+        vertices = vertices[np.array(keep, dtype=bool).reshape(-1)]
 
-        sample_x.append(sx)
-        sample_y.append(sy)
-        sample_x.append(gx)
-        sample_y.append(gy)
+        if only_integers:
+            vertices = vertices.astype(int)
+        sample_x = vertices[:, 0].tolist()
+        sample_y = vertices[:, 1].tolist()
 
         return sample_x, sample_y
 
@@ -13,34 +13,65 @@ import sys
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy import ndimage
-import math
-from scipy.spatial import cKDTree
+from scipy.sparse import csgraph, csr_matrix
 
 do_animation = True
 
 
 def transform(
         grid_map, src, rr, distance_type='chessboard',
-        transform_type='path', alpha=0.01
+        transform_type='path', alpha=0.01, obstacle_info=None
 ):
     """transform
 
     calculating transform of transform_type from src
     in given distance_type
 
+    The transform is the cost of the cheapest path to src through the free
+    cells, where moving from a cell costs the step length plus alpha times
+    the Obstacle Transform of that cell. It is computed with a single
+    Dijkstra search over the graph of the free cells.
+
     :param rr: robot radius
     :param grid_map: 2d binary map
     :param src: distance transform source
     :param distance_type: type of distance used
     :param transform_type: type of transform used
     :param alpha: weight of Obstacle Transform used when using path_transform
+    :param obstacle_info: blocked cells and graph of the free cells as
+        returned by obstacle_transform. They do not depend on src, so they can
+        be reused for multiple sources. If not provided, they are computed.
     """
-    # Obstacle coordinates
-    ox = np.where(grid_map == True)[0].tolist()
-    oy = np.where(grid_map == True)[1].tolist()
-    obstacle_tree = cKDTree(np.vstack((ox, oy)).T)
+    if obstacle_info is None:
+        obstacle_info = obstacle_transform(grid_map, rr, distance_type,
+                                           transform_type, alpha)
+    blocked, graph = obstacle_info
+
+    n_rows, n_cols = blocked.shape
+    transform_matrix = csgraph.dijkstra(
+        graph, indices=src[0] * n_cols + src[1]).reshape(n_rows, n_cols)
+    transform_matrix[src[0], src[1]] = 0
+
+    return transform_matrix
+
 
-    n_rows, n_cols = grid_map.shape
+def obstacle_transform(grid_map, rr, distance_type='chessboard',
+                       transform_type='path', alpha=0.01):
+    """obstacle_transform
+
+    calculating the cells blocked by the obstacles for the robot radius and
+    the graph of the free cells weighted with the Obstacle Transform, which
+    only depend on the map
+
+    :param grid_map: 2d binary map
+    :param rr: robot radius
+    :param distance_type: type of distance used
+    :param transform_type: type of transform used
+    :param alpha: weight of Obstacle Transform used when using path_transform
+    :return: boolean map of the blocked cells and graph of the free cells
+    """
+    obstacles = np.asarray(grid_map) == True
+    n_rows, n_cols = obstacles.shape
 
     if n_rows == 0 or n_cols == 0:
         sys.exit('Empty grid_map.')
@@ -51,61 +82,40 @@ def transform(
         cost = [1, 1, 1, 1, 1, 1, 1, 1]
     elif distance_type == 'euclidean':
         cost = [1, np.sqrt(2), 1, np.sqrt(2), 1, np.sqrt(2), 1, np.sqrt(2)]
-        distance_type = np.reshape(np.array([np.sqrt(2), 1, np.sqrt(2), 1, 0, 1, np.sqrt(2), 1, np.sqrt(2)]), (3, 3))
     else:
         sys.exit('Unsupported distance type.')
 
-    transform_matrix = float('inf') * np.ones_like(grid_map, dtype=float)
-    transform_matrix[src[0], src[1]] = 0
     if transform_type == 'distance':
-        eT = np.zeros_like(grid_map)
+        eT = np.zeros(obstacles.shape)
+    elif transform_type == 'path' and distance_type == 'euclidean':
+        eT = ndimage.distance_transform_edt(~obstacles)
     elif transform_type == 'path':
-        eT = ndimage.distance_transform_cdt(1 - grid_map, distance_type)
+        eT = ndimage.distance_transform_cdt(~obstacles, distance_type)
     else:
         sys.exit('Unsupported transform type.')
 
-    # set obstacle transform_matrix value to infinity
-    for i in range(n_rows):
-        for j in range(n_cols):
-            # if grid_map[i][j] == 1.0:
-            #     transform_matrix[i][j] = float('inf')
-            if is_collision(i, j, rr, obstacle_tree):
-                grid_map[i][j] = True
-    is_visited = np.zeros_like(transform_matrix, dtype=bool)
-    is_visited[src[0], src[1]] = True
-    traversal_queue = [src]
-    calculated = [(src[0] - 1) * n_cols + src[1]]
-
-    def is_valid_neighbor(g_i, g_j):
-        return 0 <= g_i < n_rows and 0 <= g_j < n_cols \
-               and not grid_map[g_i][g_j]
-
-    while traversal_queue:
-        i, j = traversal_queue.pop(0)
-        for k, inc in enumerate(inc_order):
-            ni = i + inc[0]
-            nj = j + inc[1]
-            if is_valid_neighbor(ni, nj):
-                is_visited[i][j] = True
-                # update transform_matrix
-                transform_matrix[i][j] = min(
-                    transform_matrix[i][j],
-                    transform_matrix[ni][nj] + cost[k] + alpha * eT[ni][nj])
-
-                if not is_visited[ni][nj] \
-                        and ((ni - 1) * n_cols + nj) not in calculated:
-                    traversal_queue.append((ni, nj))
-                    calculated.append((ni - 1) * n_cols + nj)
-
-    return transform_matrix
-
-
-def is_collision(gx, gy, rr, obstacle_kd_tree):
-    # goal point check
-    dist, _ = obstacle_kd_tree.query([gx, gy])
-    if dist <= rr:
-        return True  # collision
-    return False  # OK
+    # the cells within the robot radius of an obstacle are blocked
+    if obstacles.any():
+        blocked = ndimage.distance_transform_edt(~obstacles) <= rr
+    else:
+        blocked = obstacles.copy()
+
+    # edges from every free cell to its free neighbours, weighted with the
+    # step length and the Obstacle Transform of the cell they leave
+    index = np.arange(n_rows * n_cols).reshape(n_rows, n_cols)
+    padded = np.pad(~blocked, 1)
+    rows, cols, weights = [], [], []
+    for k, (di, dj) in enumerate(inc_order):
+        neighbour = padded[1 + di:1 + di + n_rows, 1 + dj:1 + dj + n_cols]
+        i, j = np.nonzero(~blocked & neighbour)
+        rows.append(index[i, j])
+        cols.append(index[i + di, j + dj])
+        weights.append(cost[k] + alpha * eT[i, j])
+    graph = csr_matrix(
+        (np.concatenate(weights), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n_rows * n_cols, n_rows * n_cols))
+
+    return blocked, graph
 
 
 def get_search_order_increment(start, goal):
@@ -138,45 +148,37 @@ def wavefront(transform_matrix, start, goal):
     """
 
     path = []
-    n_rows, n_cols = transform_matrix.shape
-
-    def is_valid_neighbor(g_i, g_j):
-        is_i_valid_bounded = 0 <= g_i < n_rows
-        is_j_valid_bounded = 0 <= g_j < n_cols
-        if is_i_valid_bounded and is_j_valid_bounded:
-            return not is_visited[g_i][g_j] and \
-                   transform_matrix[g_i][g_j] != float('inf')
-        return False
 
-    inc_order = get_search_order_increment(start, goal)
+    # the visited cells are set to infinity in a copy of the transform
+    # matrix, which is padded with infinity such that the neighbours of the
+    # border cells can be read without bound checks
+    remaining = np.pad(np.asarray(transform_matrix, dtype=float), 1,
+                       constant_values=float('inf'))
+    inc_order = np.array(get_search_order_increment(start, goal))
 
     current_node = start
-    is_visited = np.zeros_like(transform_matrix, dtype=bool)
 
     while current_node != goal:
         i, j = current_node
         path.append((i, j))
-        is_visited[i][j] = True
+        remaining[i + 1, j + 1] = float('inf')
 
-        max_T = float('inf')
-        i_max = (-1, -1)
+        k = -1
         i_last = 0
         for i_last in range(len(path)):
-            current_node = path[-1 - i_last]  # get latest node in path
-            for ci, cj in inc_order:
-                ni, nj = current_node[0] + ci, current_node[1] + cj
-                if is_valid_neighbor(ni, nj) and \
-                        transform_matrix[ni][nj] < max_T:
-                    i_max = (ni, nj)
-                    max_T = transform_matrix[ni][nj]
-
-            if i_max != (-1, -1):
+            ci, cj = path[-1 - i_last]  # get latest node in path
+            neighbours = remaining[ci + 1 + inc_order[:, 0],
+                                   cj + 1 + inc_order[:, 1]]
+            k = int(np.argmin(neighbours))
+            if neighbours[k] != float('inf'):
                 break
+            k = -1
 
-        if i_max == (-1, -1):
+        if k == -1:
             break
         else:
-            current_node = i_max
+            current_node = (int(ci + inc_order[k, 0]),
+                            int(cj + inc_order[k, 1]))
             if i_last != 0:
                 print('backtracing to', current_node)
     path.append(goal)
@@ -16,16 +16,18 @@ __status__ = "Stable"
 # Imports
 import os
 import airsim
-import pickle
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 from math import sqrt
 from icecream import ic
 import matplotlib.pyplot as plt
-from matplotlib.path import Path
 
 
 from Plotter3D import *
 from user_input import load_user_input
-from utils import counter_clockwise_ordering, compute_distance_points, obtain_outer_edge
+from Environment_extraction.PointStore import PointStore
+from Environment_extraction.PlannerCache import PlannerCache
+from utils import obtain_object_internal_points
 
 
 class OccupancyMap:
@@ -34,7 +36,7 @@ class OccupancyMap:
     and further manipulating it. Additionally, it provides 2D and 3D plots to visualize the occupancy map.
     """
     def __init__(self, folder="Environment_extraction//Point_files", extent_x=100, extent_y=100, cell_size=1,
-                 ue4_airsim_conv=100, client=None):
+                 ue4_airsim_conv=100, client=None, map_workers=1):
         """
         Initializes the OccupancyMap class
         :param folder: location where the point cloud is stored or will be stored
@@ -45,14 +47,18 @@ class OccupancyMap:
         :param ue4_airsim_conv: the conversion of distance units from the UE4 coordinate frame to the AirSim coordinate
         frame
         :param client: the AirSim client object
+        :param map_workers: number of processes among which the obstacles are distributed when building the map. If
+        it is 1, the obstacles are processed sequentially.
         """
         self.client = client
+        self.map_workers = map_workers
         self.folder = os.path.join(os.getcwd(), folder)
         isExist = os.path.exists(self.folder)
         if not isExist:
             os.makedirs(self.folder)
 
         self.filename = None
+        self.point_store = None
         self.ue4_airsim_conv = ue4_airsim_conv
 
         self.filtered_points = None
@@ -69,22 +75,25 @@ class OccupancyMap:
         self.object_grid = np.zeros([self.extent_x, self.extent_y], dtype=np.bool)
         self.object_grid_coord = None
         self.object_grid_coord_all = None
+        self.planner_cache = PlannerCache(self)  # Obstacle fields, inflated grids and road maps of the current grid
+        self.map_cache = None       # OccupancyMapCache where the map is stored, if any
+        self.map_cache_key = None   # Key of the map in the OccupancyMapCache
 
         self.plotter = None
 
     def extract_obstacle_vertices(self, filename='objects_points', update_points=False):
         """
-        Extract the vertices coordinates from the AirSim recursive data structure
+        Extract the vertices coordinates from the AirSim recursive data structure and store them in a PointStore. If
+        only the original pickled point cloud exists, it is converted to the PointStore format.
         :param filename: name of file where to save the data
         :param update_points: if the points exist, whether they should be updated
         :return: None
         """
         self.filename = filename   # Name of the file where the point clouds are saved
-        complete_filename = self.filename + '.p'   # Complete name with extension
-        path_save = os.path.join(self.folder, complete_filename)
+        self.point_store = PointStore(self.folder, self.filename)
 
         # If the points should be updated or there is no saved point cloud
-        if update_points or not os.path.isfile(path_save):
+        if update_points or not (self.point_store.exists() or os.path.isfile(self.point_store.pickle_path)):
             point_cloud = self.client.simGetMeshPositionVertexBuffers()
             objects = {}
             for i_mesh in range(len(point_cloud)):   # For each of the objects in the data structure
@@ -92,7 +101,16 @@ class OccupancyMap:
                 points = np.reshape(np.array(point_cloud[i_mesh].vertices), [-1, 3])
                 cut = np.max(point_cloud[i_mesh].indices) + 1
                 objects[object_name] = points[:cut, :]   # Obtain only the points that are really part of the obstacle
-            pickle.dump(objects, open(path_save, 'wb'))  # Store the point cloud
+            self.point_store.write(objects)  # Store the point cloud
+        elif not self.point_store.exists():
+            self.point_store.convert_pickle()
+
+    def get_vertices_path(self):
+        """
+        Provides the location of the file where the point cloud is stored
+        :return: path to the point cloud file
+        """
+        return self.point_store.vertices_path
 
     def set_env_dims(self):
         """
@@ -129,24 +147,18 @@ class OccupancyMap:
         :param delta_h: range of altitudes where points can be found
         :return self.filtered_points: dictionary with the filtered point cloud for each object in the environment
         """
-        # Locate point cloud file
-        complete_filename = self.filename + '.p'
-        path_save = os.path.join(self.folder, complete_filename)
-
-        # Load the point cloud and remove the objects' points coordinates into the 2D plane
-        space_points = pickle.load(open(path_save, 'rb'))
-        object_names = space_points.keys()
-        filtered_points = {}
+        # Load the points of the meshes within the altitude range and remove their altitude component to project them
+        # into the 2D plane
+        if self.point_store is None:
+            self.point_store = PointStore(self.folder, self.filename)
         h_max = h + delta_h
         h_min = max(h - delta_h, 150)
-        counter_points = 0
-        for name in object_names:
-            points = space_points[name]
-            counter_points += len(points)
-            point_filtered = points[(points[:, -1] <= h_max) &
-                                    (points[:, -1] >= h_min)]   # Filter the points found within the range
-            pf_projected = point_filtered[:, :-1]   # Remove the altitude component
-            if pf_projected.size and name != 'externalcamera' and 'cinecameraactor' not in name:   # Only considered objects which have points in the point cloud slice
+        space_points = self.point_store.slice_altitude(h_min, h_max)
+        counter_points = self.point_store.number_points()
+        filtered_points = {}
+        for name in space_points.keys():
+            pf_projected = space_points[name][:, :-1]   # Remove the altitude component
+            if name != 'externalcamera' and 'cinecameraactor' not in name:
                 filtered_points[name] = pf_projected  # Object filtered points
         self.filtered_points = filtered_points
         ic("Total number of 3D points: " + str(counter_points))
@@ -168,6 +180,28 @@ class OccupancyMap:
             self.filtered_points_array = np.vstack((self.filtered_points_array, self.filtered_points[name]))
         return self.filtered_points_array
 
+    def points_to_grid_cells(self, points):
+        """
+        Translates an array of points in the UE4 coordinate frame to the grid cells in which they fall. All the points
+        are processed at once with array operations instead of a Python loop. The points outside of the grid bounds
+        are ignored.
+        :param points: array of shape (n, 2) with the x-y coordinates of the points in the UE4 coordinate frame
+        :return cells: integer array of shape (m, 2) with the grid coordinates of the points within the grid
+        """
+        x_pos = points[:, 0]
+        y_pos = points[:, 1]
+
+        # Ignore points outside of grid
+        inside = (x_pos <= self.limit_x_max) & (x_pos >= self.limit_x_min) & \
+                 (y_pos <= self.limit_y_max) & (y_pos >= self.limit_y_min)
+
+        # Compute the point locations in the grid. The truncation matches the int() conversion of a single point
+        cells = ((points[inside, :2] - [self.limit_x_min, self.limit_y_min]) / self.cell_size).astype(int)
+
+        # A point lying exactly on the upper limit would fall one cell outside of the grid
+        cells = cells[(cells[:, 0] < self.extent_x) & (cells[:, 1] < self.extent_y)]
+        return cells
+
     def fill_grid_filtered_points(self):
         """
         Fill the grid with the previously filtered points
@@ -177,22 +211,11 @@ class OccupancyMap:
         if self.filtered_points_array is None:
             self.collect_all_points()
 
-        # Obtain the number of points, the max limits and loop over all the points in the cloud
-        n_points = self.filtered_points_array.shape[0]
+        # Obtain the max limits and rasterise all the points in the cloud at once
         self.limit_x_max = self.limit_x_min + self.extent_x * self.cell_size
         self.limit_y_max = self.limit_y_min + self.extent_y * self.cell_size
-        for i in range(n_points):
-            x_pos = self.filtered_points_array[i, 0]
-            y_pos = self.filtered_points_array[i, 1]
-
-            # Check if the point is outside the grid bounds
-            if x_pos > self.limit_x_max or x_pos < self.limit_x_min or y_pos > self.limit_y_max or \
-                    y_pos < self.limit_y_min:  # Ignore points outside of grid
-                pass
-            else:  # Else compute point location and save it in the grid
-                x_pos = int((x_pos - self.limit_x_min) / self.cell_size)
-                y_pos = int((y_pos - self.limit_y_min) / self.cell_size)
-                self.grid[x_pos, y_pos] = True
+        cells = self.points_to_grid_cells(self.filtered_points_array)
+        self.grid[cells[:, 0], cells[:, 1]] = True
 
         return self.grid
 
@@ -206,24 +229,15 @@ class OccupancyMap:
         if self.filtered_points_array is None:
             self.fill_grid_filtered_points()
 
-        # Initializes output dictionary with the objects' names as keys and the objects' occupied grid cells as values
-        objects_names = self.filtered_points.keys()
-        self.object_grid_coord = {key: set() for key in objects_names}
-
-        # Iterate over all the objects
-        for name in objects_names:
-            points = self.filtered_points[name]
-            for i in range(points.shape[0]):
-                x_pos = points[i, 0]
-                y_pos = points[i, 1]
-                if x_pos > self.limit_x_max or x_pos < self.limit_x_min or \
-                        y_pos > self.limit_y_max or y_pos < self.limit_y_min:  # Ignore points outside of grid
-                    pass
-                else:  # Else compute point location
-                    x_pos = int((x_pos - self.limit_x_min) / self.cell_size)
-                    y_pos = int((y_pos - self.limit_y_min) / self.cell_size)
-                    self.object_grid_coord[name].add((x_pos, y_pos))
-            self.object_grid_coord[name] = list(self.object_grid_coord[name])
+        # Initializes output dictionary with the objects' names as keys and the objects' occupied grid cells as values.
+        # If x points of an object fall on the same grid cell, the duplicates are removed with np.unique over the
+        # flattened cell index
+        self.object_grid_coord = {}
+        for name in self.filtered_points.keys():
+            cells = self.points_to_grid_cells(self.filtered_points[name])
+            flat_cells = np.unique(cells[:, 0] * self.extent_y + cells[:, 1])
+            x_pos, y_pos = np.divmod(flat_cells, self.extent_y)
+            self.object_grid_coord[name] = list(zip(x_pos.tolist(), y_pos.tolist()))
         return self.object_grid_coord
 
     def identify_object_internal_points(self, alpha=200):
@@ -237,46 +251,32 @@ class OccupancyMap:
         :return self.object_grid_coord_all: dictionary with the coordinates of the points inside the obstacles per
         obstacle.
         """
-        # Iterate over allthe objects
-        objects_names = self.object_grid_coord.keys()
+        objects_names = list(self.object_grid_coord.keys())
         self.object_grid_coord_all = self.object_grid_coord.copy()
-        for name in objects_names:
-            object_points = np.array(list(self.object_grid_coord[name]))  # Coordinates of each obstacle
-            if object_points.shape[0] > 3 and len(set(object_points[:, 0])) > 1 and len(set(object_points[:, 1])) > 1:
-                # Obtain the (grid) coordinates of the points that shape the outer edge of the polygon
-                _, output_points_unordered = list(obtain_outer_edge(object_points, alpha, only_outer=True))
-
-                # Order the points clockwise
-                output_points_ordered = counter_clockwise_ordering(output_points_unordered)
-
-                x, y = np.meshgrid(np.arange(self.grid.shape[0]),
-                                   np.arange(self.grid.shape[1]))  # make a canvas with coordinates
-                x, y = x.flatten(), y.flatten()
-                points = np.vstack((x, y)).T
-
-                # Make a polygon with the coordinates of the given points
-                p = Path(output_points_ordered)
-
-                # The points within the polygon are identified. A small radius is given in order to also consider
-                # those points on the edges.
-                grid = p.contains_points(points, radius=0.0000001)
-                mask = grid.reshape(self.grid.shape[0],
-                                    self.grid.shape[1])  # now you have a mask with points inside a polygon
-
-                # Set up the grid coordinates in a 2D mesh
-                points_grid = points.reshape(self.grid.shape[0], self.grid.shape[1], 2)
-
-                # Apply mask to point grid
-                internal_points = points_grid[mask]
-            else:
-                internal_points = object_points
-
-            for i in range(internal_points.shape[0]):
-                # All internal object points coordinates are stored
-                self.object_grid_coord_all[name].append(tuple(internal_points[i, :]))
-
-                # A grid is created only with the internal object points
-                self.object_grid[internal_points[i, 0], internal_points[i, 1]] = True
+
+        # Coordinates of each obstacle
+        objects_points = [np.array(list(self.object_grid_coord[name])) for name in objects_names]
+
+        # Each obstacle is processed independently. When multiple workers are available, the obstacles are distributed
+        # among processes. The results are retrieved in the order of the obstacles, such that the output does not
+        # depend on the number of workers.
+        if self.map_workers > 1 and len(objects_names) > 1:
+            chunksize = max(1, len(objects_names) // (4 * self.map_workers))
+            with ProcessPoolExecutor(max_workers=self.map_workers) as executor:
+                objects_internal_points = list(executor.map(obtain_object_internal_points, objects_points,
+                                                            repeat(alpha), repeat(self.grid.shape),
+                                                            chunksize=chunksize))
+        else:
+            objects_internal_points = [obtain_object_internal_points(object_points, alpha, self.grid.shape)
+                                       for object_points in objects_points]
+
+        # Iterate over all the objects
+        for name, internal_points in zip(objects_names, objects_internal_points):
+            # All internal object points coordinates are stored
+            self.object_grid_coord_all[name].extend(map(tuple, internal_points.tolist()))
+
+            # A grid is created only with the internal object points
+            self.object_grid[internal_points[:, 0], internal_points[:, 1]] = True
             ic(name)
 
         return self.object_grid_coord_all
@@ -418,25 +418,66 @@ class OccupancyMap:
         :param distance: distance from obstacle to be evaluated
         :return: whether the location is inside or in the distance-range of an obstacle
         """
-        # Obtain all the x-y coordinates from the location within the input distance
-        candidates_x = np.unique(np.minimum(np.maximum(np.arange(location[0]-distance, location[0]+distance+1), 0),
-                                            self.extent_x-1))
-        candidates_y = np.unique(np.minimum(np.maximum(np.arange(location[1]-distance, location[1]+distance+1), 0),
-                                            self.extent_y-1))
-
-        # Check if any of the points around of the location (including the location) are within an obstacle.
-        for i in range(candidates_x.shape[0]):
-            for j in range(candidates_y.shape[0]):
-                if self.grid[int(candidates_x[i]), int(candidates_y[j])]:
-                    # Check whether the evaluated point is still within the distance from the location
-                    # The square root of 2 is added to the distance since that is the distance of the diagonal of a
-                    # square. The worst case scenario.
-                    if compute_distance_points((candidates_x[i], candidates_y[j]), location) <= (distance+sqrt(2)):
-                        return True
-        return False
+        return bool(self.check_obstacle_batch([location], distance)[0])
+
+    def check_obstacle_batch(self, locations, distance=3):
+        """
+        Vectorized version of check_obstacle. Checks for multiple locations at once whether they can be found within an
+        obstacle or within a certain distance of any obstacle. For locations on the grid, the answer is looked up in
+        the obstacle field of the distance, which is computed once per map.
+        :param locations: array of shape (n, 2) with the locations to evaluate
+        :param distance: distance from obstacle to be evaluated
+        :return: boolean array of shape (n,) with whether each location is inside or in the distance-range of an
+        obstacle
+        """
+        locations = np.asarray(locations, dtype=float).reshape(-1, 2)
+        x, y = locations[:, 0], locations[:, 1]
+        on_grid = (x == np.round(x)) & (y == np.round(y)) & (x >= 0) & (x < self.extent_x) & (y >= 0) & \
+                  (y < self.extent_y)
+        if np.all(on_grid):
+            return self.compute_obstacle_field(distance)[x.astype(int), y.astype(int)]
+        return self.evaluate_obstacle_proximity(x, y, distance)
+
+    def compute_obstacle_field(self, distance):
+        """
+        Computes, for every cell of the grid, whether it is inside or in the distance-range of an obstacle. The field is
+        computed once per map and distance, and stored in the planner cache for later look-ups.
+        :param distance: distance from obstacle to be evaluated
+        :return: boolean array with the shape of the grid
+        """
+        def compute():
+            x, y = np.meshgrid(np.arange(self.extent_x, dtype=float), np.arange(self.extent_y, dtype=float),
+                               indexing='ij')
+            return self.evaluate_obstacle_proximity(x.ravel(), y.ravel(), distance).reshape(self.extent_x,
+                                                                                            self.extent_y)
+        return self.planner_cache.get("obstacle_field", distance, compute)
+
+    def evaluate_obstacle_proximity(self, x, y, distance):
+        """
+        Checks for multiple locations whether any of the grid cells within the (2*distance+1) square window around them
+        is occupied and within distance+sqrt(2) of the location. The candidate cells are clipped to the grid limits.
+        Instead of iterating over the locations, it iterates over the candidate offsets of the window, such that all
+        the locations are evaluated at once.
+        :param x: array with the x-coordinates of the locations
+        :param y: array with the y-coordinates of the locations
+        :param distance: distance from obstacle to be evaluated
+        :return: boolean array with whether each location is inside or in the distance-range of an obstacle
+        """
+        # The square root of 2 is added to the distance since that is the distance of the diagonal of a square. The
+        # worst case scenario.
+        n_candidates = np.arange(-distance, distance + 1).shape[0]
+        blocked = np.zeros(x.shape, dtype=bool)
+        for i in range(n_candidates):
+            candidates_x = np.minimum(np.maximum((x - distance) + i, 0), self.extent_x - 1)
+            for j in range(n_candidates):
+                candidates_y = np.minimum(np.maximum((y - distance) + j, 0), self.extent_y - 1)
+                occupied = self.grid[candidates_x.astype(int), candidates_y.astype(int)]
+                blocked |= occupied & (np.sqrt((candidates_x - x) ** 2 + (candidates_y - y) ** 2) <=
+                                       (distance + sqrt(2)))
+        return blocked
 
     def run(self, h=1100, delta_h=500, filename_vertices='object_points',
-            update_vertices_flag=False, plot_2D=False, plot3D=False):
+            update_vertices_flag=False, plot_2D=False, plot3D=False, map_cache=None):
         """
         Function which computes the Occupancy map. First, the obstacles are extracted, they are projected to the x-y
         plane and the environment dimensions are defined. Then, the grid is filled with the obstacle meshes and the
@@ -447,18 +488,31 @@ class OccupancyMap:
         :param update_vertices_flag: whether the saved points are updated
         :param plot_2D: whether the 2D plots are generated
         :param plot3D: whether the 3D plots are generated
+        :param map_cache: OccupancyMapCache object. If provided, the map is retrieved from it when it has already been
+        computed and stored in it otherwise
         :return: None
         """
         self.extract_obstacle_vertices(filename=filename_vertices, update_points=update_vertices_flag)
-        self.project_points_altitude(h, delta_h)
-        self.set_env_dims()
-        _ = self.fill_grid_filtered_points()
+        self.planner_cache.clear()
+        self.map_cache = map_cache
+        self.map_cache_key = map_cache.compute_key(self, h, delta_h) if map_cache is not None else None
+        if map_cache is not None and map_cache.load(self, h, delta_h):
+            # The point cloud is only required for plotting
+            if plot_2D or plot3D:
+                self.project_points_altitude(h, delta_h)
+                self.collect_all_points()
+        else:
+            self.project_points_altitude(h, delta_h)
+            self.set_env_dims()
+            _ = self.fill_grid_filtered_points()
+            _ = self.fill_grid_filtered_points_objects()
+            self.identify_object_internal_points()
+            self.create_grid_full_obstacle()
+            if map_cache is not None:
+                map_cache.store(self, h, delta_h)
+
         if plot_2D:
             self.plot_projected_points()
-
-        _ = self.fill_grid_filtered_points_objects()
-        self.identify_object_internal_points()
-        self.create_grid_full_obstacle()
         if plot3D:
             self.plot_projected_points_3D_grid()
 
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+"""
+Provides the OccupancyMapCache class which stores the occupancy maps that have already been computed on disk, such that
+the maps of altitudes that have already been seen do not have to be computed again.
+
+Each map is stored in a separate file whose name is obtained from the hash of the point cloud file and the altitude,
+altitude range and cell size used to slice it. The least recently used maps are evicted once the maximum number of
+stored maps is exceeded. The planner data of a map, such as the landmark index used by GridNavigation, is stored next
+to it and removed together with it.
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import os
+import time
+import pickle
+import hashlib
+from icecream import ic
+
+from user_input import load_user_input
+from Environment_extraction.PointStore import PointStore
+from Environment_extraction.OccupancyMap import OccupancyMap
+
+
+class OccupancyMapCache:
+    """
+    Class which stores and retrieves the finished occupancy grids, together with their limits and extents, from disk.
+    """
+    # Attributes of the OccupancyMap that are stored for each map
+    map_attributes = ["grid", "object_grid", "extent_x", "extent_y", "limit_x_min", "limit_y_min", "limit_x_max",
+                      "limit_y_max"]
+
+    def __init__(self, folder="Environment_extraction//Map_cache", max_entries=50):
+        """
+        Initializes the OccupancyMapCache class
+        :param folder: location where the occupancy maps are stored
+        :param max_entries: maximum number of occupancy maps stored. When it is exceeded, the least recently used maps
+        are removed
+        """
+        self.folder = os.path.join(os.getcwd(), folder)
+        isExist = os.path.exists(self.folder)
+        if not isExist:
+            os.makedirs(self.folder)
+        self.max_entries = max_entries
+
+        # Hash of each point cloud file with the (size, modification time) of the file when the hash was computed
+        self.file_hashes = {}
+
+    def hash_file(self, path):
+        """
+        Computes the hash of the contents of a point cloud file. Since the point cloud files can be large, the hash is
+        only recomputed when the size or the modification time of the file change.
+        :param path: location of the point cloud file
+        :return: hexadecimal hash of the file contents
+        """
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if path not in self.file_hashes or self.file_hashes[path][0] != signature:
+            sha = hashlib.sha1()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+            self.file_hashes[path] = (signature, sha.hexdigest())
+        return self.file_hashes[path][1]
+
+    def compute_key(self, om, h, delta_h):
+        """
+        Computes the key of an occupancy map from the point cloud used to build it and the slicing parameters
+        :param om: occupancy map whose point cloud has already been extracted
+        :param h: altitude
+        :param delta_h: range of altitudes where points can be found
+        :return: key of the occupancy map
+        """
+        file_hash = self.hash_file(om.get_vertices_path())
+        return hashlib.sha1(str((file_hash, h, delta_h, om.cell_size)).encode()).hexdigest()
+
+    def get_entry_path(self, key):
+        """
+        Provides the location of the file where a map is stored
+        :param key: key of the occupancy map
+        :return: location of the file
+        """
+        return os.path.join(self.folder, key + '.p')
+
+    def get_planner_data_path(self, key, name):
+        """
+        Provides the location of the file where planner data of a map, such as its landmark index, is stored next to
+        the map
+        :param key: key of the occupancy map
+        :param name: name of the planner data
+        :return: location of the file
+        """
+        return os.path.join(self.folder, key + '.' + name + '.npz')
+
+    def load(self, om, h, delta_h):
+        """
+        Fills the occupancy map with the stored map of the same point cloud and slicing parameters, if it exists
+        :param om: occupancy map whose point cloud has already been extracted
+        :param h: altitude
+        :param delta_h: range of altitudes where points can be found
+        :return: whether the map was found in the cache
+        """
+        path = self.get_entry_path(self.compute_key(om, h, delta_h))
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False
+
+        for attribute in self.map_attributes:
+            setattr(om, attribute, entry[attribute])
+
+        # The modification time of the file is used to keep track of the least recently used maps
+        os.utime(path)
+        ic("Occupancy map retrieved from cache: " + path)
+        return True
+
+    def store(self, om, h, delta_h):
+        """
+        Stores a computed occupancy map and evicts the least recently used maps if the cache is full
+        :param om: occupancy map that has been computed
+        :param h: altitude
+        :param delta_h: range of altitudes where points can be found
+        :return: None
+        """
+        path = self.get_entry_path(self.compute_key(om, h, delta_h))
+        entry = {attribute: getattr(om, attribute) for attribute in self.map_attributes}
+
+        # The map is first written to a temporary file such that other processes never read a half written map
+        path_tmp = path + '.' + str(os.getpid()) + '.tmp'
+        with open(path_tmp, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path_tmp, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used maps until the number of stored maps does not exceed the maximum
+        :return: None
+        """
+        entries = [os.path.join(self.folder, file) for file in os.listdir(self.folder) if file.endswith('.p')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: os.path.getmtime(entry))
+        evicted_keys = [os.path.basename(entry)[:-2] for entry in entries[:len(entries) - self.max_entries]]
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+
+        # The planner data stored next to the evicted maps is removed as well
+        for file in os.listdir(self.folder):
+            if file.endswith('.npz') and file.split('.')[0] in evicted_keys:
+                try:
+                    os.remove(os.path.join(self.folder, file))
+                except OSError:
+                    pass
+
+    def clear(self):
+        """
+        Removes all the stored maps and their planner data
+        :return: None
+        """
+        for file in os.listdir(self.folder):
+            if file.endswith('.p') or file.endswith('.npz'):
+                os.remove(os.path.join(self.folder, file))
+
+    def prewarm(self, flight_altitudes, altitude_range, cell_size, filename_vertices, ue4_airsim_conv=100,
+                client=None, map_workers=1):
+        """
+        Computes and stores the occupancy maps of all the integer altitudes within the range of flight altitudes, such
+        that they are immediately available during data gathering.
+        :param flight_altitudes: range of altitudes at which the drone could be spawned: [min, max] in m
+        :param altitude_range: altitude range of the slice in UE4 units
+        :param cell_size: size of the grid cells in UE4 units
+        :param filename_vertices: name of the file where the point cloud is stored
+        :param ue4_airsim_conv: the conversion of distance units from the UE4 coordinate frame to the AirSim coordinate
+        frame
+        :param client: the AirSim client object. Only required if the point cloud has not been extracted yet.
+        :param map_workers: number of processes among which the obstacles are distributed when building each map
+        :return: None
+        """
+        for altitude_m in range(flight_altitudes[0], flight_altitudes[1] + 1):
+            start_time = time.time()
+            h = int(altitude_m * ue4_airsim_conv)
+            om = OccupancyMap(cell_size=cell_size, ue4_airsim_conv=ue4_airsim_conv, client=client,
+                              map_workers=map_workers)
+            om.run(h, altitude_range, filename_vertices, map_cache=self)
+            print(f"Occupancy map at {altitude_m} m ready: {time.time() - start_time} s")
+
+
+if __name__ == "__main__":
+    # Pre-warm the cache with the maps of all the altitudes at which the drone could be spawned
+    args = load_user_input()
+    cell_size = int(args.cell_size_m * args.ue4_airsim_conversion_units)
+    altitude_range = int(args.altitude_range_m * args.ue4_airsim_conversion_units)
+
+    # The client is only required if the point cloud has not been extracted yet
+    client = None
+    point_store = PointStore(os.path.join(os.getcwd(), "Environment_extraction//Point_files"),
+                             args.saved_vertices_filename)
+    if not (point_store.exists() or os.path.isfile(point_store.pickle_path)):
+        import airsim
+        client = airsim.MultirotorClient()
+        client.confirmConnection()
+
+    map_cache = OccupancyMapCache(args.occupancy_map_cache_folder, args.occupancy_map_cache_size)
+    map_cache.prewarm(args.flight_altitudes, altitude_range, cell_size, args.saved_vertices_filename,
+                      args.ue4_airsim_conversion_units, client, args.map_workers)
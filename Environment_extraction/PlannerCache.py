@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Provides the PlannerCache class which stores the planner data that only depends on the occupancy map, such as the
+inflated grids, the road maps and the obstacle distance fields. It is owned by the OccupancyMap, such that all the
+flights carried out with the same map reuse it and only the connection of the start and goal is computed per flight.
+
+The cache keeps a reference to the grid it was filled for and it is emptied as soon as the occupancy map holds a
+different grid, namely when a new map is extracted.
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+
+class PlannerCache:
+    """
+    Class which stores the planner data computed for an occupancy map, identified by its kind (e.g. "inflated_grid")
+    and its parameters (e.g. the robot radius)
+    """
+    def __init__(self, om):
+        """
+        Initializes the PlannerCache object
+        :param om: occupancy map whose planner data is stored
+        """
+        self.om = om
+        self.grid = None    # Grid for which the stored data was computed
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, key, compute):
+        """
+        Retrieves the stored data of a kind and key. If it has not been computed yet for the current grid of the
+        occupancy map, it is computed and stored
+        :param kind: kind of planner data
+        :param key: parameters with which the data is computed
+        :param compute: function without arguments that computes the data
+        :return: the planner data
+        """
+        if self.grid is not self.om.grid:
+            self.clear()
+        if (kind, key) in self.entries:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.entries[(kind, key)] = compute()
+        return self.entries[(kind, key)]
+
+    def clear(self):
+        """
+        Removes all the stored data and binds the cache to the current grid of the occupancy map
+        :return: None
+        """
+        self.grid = self.om.grid
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+Provides the PointStore class which stores the point cloud extracted from the UE4 environment in a columnar format that
+can be memory-mapped.
+
+All the vertices are stored in a single contiguous float32 .npy file, next to an index with the name of each mesh, the
+offsets of its vertices within the .npy file and its minimum and maximum altitudes. The vertices of each mesh are sorted
+by altitude. Slicing the point cloud at an altitude only reads the meshes whose altitude range overlaps with the slice,
+and the points of each of those meshes within the slice are found with two binary searches instead of a full scan.
+Multiple processes share the same pages through the OS page cache. It also provides the converter from the original pickled point cloud files.
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import os
+import pickle
+import numpy as np
+
+
+class PointStore:
+    """
+    Class which writes, converts and slices the memory-mapped point cloud of a UE4 environment.
+    """
+    def __init__(self, folder, filename):
+        """
+        Initializes the PointStore class
+        :param folder: location where the point cloud is stored or will be stored
+        :param filename: name of the point cloud, without extension
+        """
+        self.folder = folder
+        self.filename = filename
+        self.vertices_path = os.path.join(self.folder, self.filename + '_vertices.npy')
+        self.index_path = os.path.join(self.folder, self.filename + '_index.npz')
+        self.pickle_path = os.path.join(self.folder, self.filename + '.p')
+
+        self.vertices = None   # Memory-mapped array with the vertices of all the meshes
+        self.names = None      # Name of each of the meshes
+        self.offsets = None    # The vertices of mesh i are vertices[offsets[i]:offsets[i+1]]
+        self.z_min = None      # Minimum altitude of each of the meshes
+        self.z_max = None      # Maximum altitude of each of the meshes
+
+    def exists(self):
+        """
+        Checks whether the point cloud has already been stored in the columnar format
+        :return: whether both the vertices and the index files exist
+        """
+        return os.path.isfile(self.vertices_path) and os.path.isfile(self.index_path)
+
+    def write(self, objects):
+        """
+        Stores a point cloud in the columnar format
+        :param objects: dictionary with the name of each mesh as key and the array of its vertices as value
+        :return: None
+        """
+        names = list(objects.keys())
+        arrays = [np.asarray(objects[name], dtype=np.float32).reshape(-1, 3) for name in names]
+
+        # The vertices of each mesh are sorted by altitude such that an altitude slice is a contiguous block
+        arrays = [array[np.argsort(array[:, 2], kind='stable')] for array in arrays]
+        lengths = [array.shape[0] for array in arrays]
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+
+        # Altitude range of each mesh. Empty meshes are given a range that never overlaps with a slice
+        z_min = np.array([np.min(array[:, 2]) if array.size else np.inf for array in arrays], dtype=np.float32)
+        z_max = np.array([np.max(array[:, 2]) if array.size else -np.inf for array in arrays], dtype=np.float32)
+
+        if arrays:
+            vertices = np.concatenate(arrays, axis=0)
+        else:
+            vertices = np.zeros([0, 3], dtype=np.float32)
+
+        # The files are first written to temporary files such that other processes never read a half written store
+        self.save_atomic(self.vertices_path, lambda f: np.save(f, vertices))
+        self.save_atomic(self.index_path, lambda f: np.savez(f, names=np.array(names, dtype=str), offsets=offsets,
+                                                              z_min=z_min, z_max=z_max, z_sorted=True))
+        self.vertices = None
+
+    @staticmethod
+    def save_atomic(path, save_function):
+        """
+        Writes a file through a temporary file that replaces the final file once it is complete
+        :param path: location of the file
+        :param save_function: function which writes the contents to the provided open file
+        :return: None
+        """
+        path_tmp = path + '.' + str(os.getpid()) + '.tmp'
+        with open(path_tmp, 'wb') as f:
+            save_function(f)
+        os.replace(path_tmp, path)
+
+    def convert_pickle(self, remove_pickle=False):
+        """
+        Converts the original pickled point cloud (dictionary of vertex arrays per mesh) to the columnar format
+        :param remove_pickle: whether the pickled point cloud should be removed after the conversion
+        :return: None
+        """
+        with open(self.pickle_path, 'rb') as f:
+            objects = pickle.load(f)
+        self.write(objects)
+        if remove_pickle:
+            os.remove(self.pickle_path)
+
+    def load(self):
+        """
+        Memory-maps the vertices and loads the index of the point cloud
+        :return: None
+        """
+        self.vertices = np.load(self.vertices_path, mmap_mode='r')
+        with np.load(self.index_path) as index:
+            self.names = index['names'].tolist()
+            self.offsets = index['offsets']
+            self.z_min = index['z_min']
+            self.z_max = index['z_max']
+            z_sorted = 'z_sorted' in index.files
+
+        # Stores written before the vertices were sorted by altitude are sorted once and rewritten
+        if not z_sorted:
+            objects = {self.names[i]: np.array(self.vertices[self.offsets[i]:self.offsets[i + 1]])
+                       for i in range(len(self.names))}
+            self.vertices = None
+            self.write(objects)
+            self.load()
+
+    def number_points(self):
+        """
+        Provides the total number of vertices in the point cloud
+        :return: number of vertices
+        """
+        if self.vertices is None:
+            self.load()
+        return self.vertices.shape[0]
+
+    def slice_altitude(self, h_min, h_max):
+        """
+        Retrieves the points of each mesh found within a range of altitudes. Only the vertices of the meshes whose
+        altitude range overlaps with the slice are read from disk. Since the vertices of each mesh are sorted by
+        altitude, the slice of each mesh is located with two binary searches.
+        :param h_min: minimum altitude of the slice
+        :param h_max: maximum altitude of the slice
+        :return sliced_points: dictionary with the name of each mesh with points in the slice as key and the array of
+        those points as value
+        """
+        if self.vertices is None:
+            self.load()
+
+        sliced_points = {}
+        overlapping = np.flatnonzero((self.z_max >= h_min) & (self.z_min <= h_max))
+        for i in overlapping:
+            z = self.vertices[self.offsets[i]:self.offsets[i + 1], 2]
+            start = self.offsets[i] + np.searchsorted(z, h_min, side='left')
+            stop = self.offsets[i] + np.searchsorted(z, h_max, side='right')
+            if stop > start:
+                sliced_points[self.names[i]] = self.vertices[start:stop].astype(float)
+        return sliced_points
+
+
+if __name__ == "__main__":
+    # One-shot conversion of all the pickled point clouds to the columnar format
+    point_files_folder = os.path.join(os.getcwd(), "Environment_extraction//Point_files")
+    for file in os.listdir(point_files_folder):
+        if file.endswith('.p'):
+            store = PointStore(point_files_folder, file[:-2])
+            store.convert_pickle()
+            print(f"Converted {file}: {store.number_points()} points")
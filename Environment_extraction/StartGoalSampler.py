@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Provides the StartGoalSampler class which draws random start and goal locations of the flights in the occupancy map.
+
+Both locations must be separated from the obstacles by the radius of the robot and their distance must be within the
+allowed flight distance range. Instead of drawing random pairs of locations until one satisfies the constraints, the
+number of valid goals for every start location is computed once per map and the pairs are drawn directly from the set
+of valid pairs.
+"""
+
+__author__ = "Jose Ignacio de Alvear Cardenas (GitHub: @joigalcar3)"
+__copyright__ = "Copyright 2022, Jose Ignacio de Alvear Cardenas"
+__credits__ = ["Jose Ignacio de Alvear Cardenas"]
+__license__ = "MIT"
+__version__ = "1.0.2 (21/12/2022)"
+__maintainer__ = "Jose Ignacio de Alvear Cardenas"
+__email__ = "jialvear@hotmail.com"
+__status__ = "Stable"
+
+# Imports
+import numpy as np
+from scipy.signal import fftconvolve
+
+
+class StartGoalSampler:
+    """
+    Class which samples start and goal locations uniformly from all the pairs of locations that satisfy the obstacle
+    clearance and flight distance constraints.
+    """
+    def __init__(self, om, robot_radius, min_distance, max_distance):
+        """
+        Initializes the StartGoalSampler class and computes the number of valid goals for each start location
+        :param om: occupancy map
+        :param robot_radius: minimum distance from the obstacles in grid cells, as used by OccupancyMap.check_obstacle
+        :param min_distance: minimum distance between the start and the goal in grid cells
+        :param max_distance: maximum distance between the start and the goal in grid cells
+        """
+        self.shape = om.grid.shape
+
+        # Cells that are far enough from the obstacles
+        self.free = ~om.compute_obstacle_field(robot_radius)
+
+        # Offsets from the start location at which the goal location is within the flight distance range
+        r = int(np.floor(max_distance))
+        dx, dy = np.meshgrid(np.arange(-r, r + 1), np.arange(-r, r + 1), indexing='ij')
+        distance = np.sqrt(dx ** 2 + dy ** 2)
+        annulus = (distance >= min_distance) & (distance <= max_distance)
+        self.offsets = np.column_stack((dx[annulus], dy[annulus]))
+
+        # Number of free goal locations within the flight distance range of each free start location. Since the
+        # annulus is symmetric, the convolution is equal to the correlation.
+        if self.offsets.shape[0]:
+            counts = np.rint(fftconvolve(self.free.astype(float), annulus.astype(float), mode='same'))
+        else:
+            counts = np.zeros(self.shape)
+        self.counts = np.where(self.free, counts, 0).ravel()
+        self.number_pairs = int(self.counts.sum())
+
+    def sample(self, n=1):
+        """
+        Draws start and goal location pairs uniformly from all the valid pairs
+        :param n: number of pairs
+        :return: list of (start, goal) tuples of grid coordinates
+        """
+        if self.number_pairs == 0:
+            raise ValueError("There are no start and goal locations that satisfy the obstacle clearance and flight "
+                             "distance constraints in this occupancy map.")
+
+        # The start location is chosen with a probability proportional to its number of valid goals
+        starts_flat = np.random.choice(self.counts.shape[0], size=n, p=self.counts / self.number_pairs)
+        starts = np.column_stack(np.unravel_index(starts_flat, self.shape))
+
+        # The goal is chosen uniformly among the valid goals of each start location
+        goals = starts[:, None, :] + self.offsets[None, :, :]
+        in_grid = (goals[:, :, 0] >= 0) & (goals[:, :, 0] < self.shape[0]) & (goals[:, :, 1] >= 0) & \
+                  (goals[:, :, 1] < self.shape[1])
+        valid = in_grid.copy()
+        valid[in_grid] = self.free[goals[in_grid][:, 0], goals[in_grid][:, 1]]
+        chosen = np.random.randint(0, valid.sum(axis=1))
+        goal_index = np.argmax(np.cumsum(valid, axis=1) > chosen[:, None], axis=1)
+        goals = goals[np.arange(n), goal_index]
+
+        return [((int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))) for start, goal in zip(starts, goals)]
@@ -43,6 +43,12 @@ def load_user_input():
                         help='Conversion factor from Unreal Engine 4 to Airsim units (m)')
     parser.add_argument('--update_saved_vertices', type=bool, default=False,
                         help='Whether the saved cloud points should be saved')
+    parser.add_argument('--occupancy_map_cache_size', type=int, default=50,
+                        help='Maximum number of occupancy maps stored on disk such that the maps of altitudes that '
+                             'have already been seen are not computed again. If it is 0, the maps are not stored.')
+    parser.add_argument('--map_workers', type=int, default=1,
+                        help='Number of processes used to build the occupancy map. The obstacles are distributed '
+                             'among them. If it is 1, the obstacles are processed sequentially.')
 
     # Arguments related to the drone navigation
     parser.add_argument('--min_flight_distance_m', type=int, default=15,   # 30
@@ -73,7 +79,8 @@ def load_user_input():
 
     # Information regarding the navigation of the drone  sensors_remote_storage_location
     parser.add_argument('--navigation_type', type=str, default="A_star",
-                        help='Method employed for navigation: A_star, wavefront, Voronoid, RRT_star and PRM')
+                        help='Method employed for navigation: A_star, ALT (A* guided by landmarks), JPS (Jump Point '
+                             'Search), wavefront, Voronoid, RRT_star and PRM')
 
     # Arguments related to the failure factory
     parser.add_argument('--failure_types', default=['prop_damage_advanced_single_blade_dis_abr'],  #'prop_fly_off_dis_abr', 'actuator_saturation_dis_abr', 'prop_damage_advanced_single_blade_dis_abr', 'actuator_locked_dis_abr'
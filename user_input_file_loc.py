@@ -25,6 +25,8 @@ def load_user_input_file_loc(parser):
     parser.add_argument('--saved_vertices_filename', type=str, default='Blocks_object_points',
                         # 'object_points', 'SunTemple_object_points', CoenCity_Object_points
                         help='Name of cloud points file.')
+    parser.add_argument('--occupancy_map_cache_folder', type=str, default='Environment_extraction//Map_cache',
+                        help='Location where the computed occupancy maps are stored.')
 
     # Arguments related to the sensor data collection
     parser.add_argument('--sensors_remote_storage_location',
@@ -189,65 +189,138 @@ def merge_flight_infos(original_datasets, fi_folder, run, it):
 def obtain_outer_edge(points, alpha, only_outer=True):
     """
     Compute the alpha shape (concave hull) of a set of points. The higher the alpha, the larger the polygon considered.
+    The circumradii of all the triangles are computed at once and the edges shared by two of the triangles in the shape
+    are identified by counting the occurrences of each edge with np.unique.
     :param points: np.array of shape (n,2) points
     :param alpha: alpha value
     :param only_outer: boolean value to specify if we keep only the outer border
     or also inner edges
     :return: set of (i,j) pairs representing edges of the alpha-shape. (i,j) are
-    the indices in the points array. Also, a list of all the points that shape the convex hull.
+    the indices in the points array. Also, an array of all the points that shape the convex hull, sorted by their index.
     """
     assert points.shape[0] > 3, "Need at least four points"
 
-    def add_edge(edges, i, j):
-        """
-        Add an edge between the i-th and j-th points, if not in the list already
-        :param edges: tuples of points
-        :param i: first point
-        :param j: second point
-        :return: None
-        """
-        if (i, j) in edges or (j, i) in edges:
-            # already added
-            assert (j, i) in edges, "Can't go twice over same directed edge right?"
-            if only_outer:
-                # if both neighboring triangles are in shape, it's not a boundary edge
-                edges.remove((j, i))
-            return
-        edges.add((i, j))
-
-    # Obtain the triangulation from Delaunay and initiate a set of edges
+    # Obtain the triangulation from Delaunay
     tri = Delaunay(points)
-    edges = set()
-
-    # Loop over triangles:
-    # ia, ib, ic = indices of corner points of the triangle
-    for ia, ib, ic in tri.vertices:
-        pa = points[ia]
-        pb = points[ib]
-        pc = points[ic]
-
-        # Computing radius of triangle circumcircle
-        # www.mathalino.com/reviewer/derivation-of-formulas/derivation-of-formula-for-radius-of-circumcircle
-        a = np.sqrt((pa[0] - pb[0]) ** 2 + (pa[1] - pb[1]) ** 2)
-        b = np.sqrt((pb[0] - pc[0]) ** 2 + (pb[1] - pc[1]) ** 2)
-        c = np.sqrt((pc[0] - pa[0]) ** 2 + (pc[1] - pa[1]) ** 2)
-        s = (a + b + c) / 2.0
+    ia, ib, ic = tri.simplices[:, 0], tri.simplices[:, 1], tri.simplices[:, 2]
+    pa = points[ia]
+    pb = points[ib]
+    pc = points[ic]
+
+    # Computing radius of triangle circumcircle
+    # www.mathalino.com/reviewer/derivation-of-formulas/derivation-of-formula-for-radius-of-circumcircle
+    a = np.sqrt((pa[:, 0] - pb[:, 0]) ** 2 + (pa[:, 1] - pb[:, 1]) ** 2)
+    b = np.sqrt((pb[:, 0] - pc[:, 0]) ** 2 + (pb[:, 1] - pc[:, 1]) ** 2)
+    c = np.sqrt((pc[:, 0] - pa[:, 0]) ** 2 + (pc[:, 1] - pa[:, 1]) ** 2)
+    s = (a + b + c) / 2.0
+    with np.errstate(divide='ignore', invalid='ignore'):
         area = np.sqrt(s * (s - a) * (s - b) * (s - c))
         circum_r = a * b * c / (4.0 * area)
 
-        # Only add triangles that fit in circles whose radius is smaller than circum_r
-        if circum_r < alpha:
-            add_edge(edges, ia, ib)
-            add_edge(edges, ib, ic)
-            add_edge(edges, ic, ia)
+    # Only keep triangles that fit in circles whose radius is smaller than alpha. Degenerate triangles have an infinite
+    # or undefined radius and are discarded
+    keep = circum_r < alpha
+
+    # Directed edges (ia, ib), (ib, ic), (ic, ia) of the kept triangles, in the order of the triangles
+    directed_edges = np.stack((np.column_stack((ia, ib)), np.column_stack((ib, ic)), np.column_stack((ic, ia))),
+                              axis=1)[keep].reshape(-1, 2)
+
+    # An edge shared by two triangles in the shape is not a boundary edge. Each undirected edge is identified with
+    # a single integer
+    undirected_edges = np.sort(directed_edges, axis=1)
+    edge_keys = undirected_edges[:, 0].astype(np.int64) * points.shape[0] + undirected_edges[:, 1]
+    _, first_index, counts = np.unique(edge_keys, return_index=True, return_counts=True)
+    if only_outer:
+        edges_array = directed_edges[first_index[counts == 1]]
+    else:
+        edges_array = directed_edges[first_index]
+    edges = set(map(tuple, edges_array.tolist()))
 
     # The convex hull is defined by the points that still remain after adding the edges of all the triangles to the
     # edges set
-    point_indices = list(set([point for edge in edges for point in edge]))
+    point_indices = np.unique(edges_array)
     output_points = points[point_indices]
     return edges, output_points
 
 
+def polygon_internal_points(polygon, shape):
+    """
+    Obtains the integer grid coordinates of all the points inside a polygon or on its edges. The polygon is filled
+    with a scanline even-odd fill restricted to its bounding box: for each row of the grid, the crossings of the row with
+    the polygon edges are sorted and the cells between each pair of crossings are filled. The points on the edges are
+    added by walking along the lattice points of each edge.
+    :param polygon: array of shape (n, 2) with the integer coordinates of the ordered vertices of the polygon. The
+    polygon is closed implicitly.
+    :param shape: shape of the grid. Points outside of it are not returned.
+    :return: integer array of shape (m, 2) with the coordinates of the points, sorted by their second and then their
+    first coordinate.
+    """
+    polygon = np.asarray(polygon, dtype=np.int64).reshape(-1, 2)
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+
+    # Scanline fill. An edge crosses the rows y with min(y0, y1) <= y < max(y0, y1), such that horizontal edges never
+    # cross a row and every row is crossed an even number of times
+    y_low = np.minimum(y0, y1)
+    n_rows = np.maximum(y0, y1) - y_low
+    edge_index = np.repeat(np.arange(polygon.shape[0]), n_rows)
+    row = np.repeat(y_low, n_rows) + np.arange(n_rows.sum()) - np.repeat(np.cumsum(n_rows) - n_rows, n_rows)
+    crossing = x0[edge_index] + (row - y0[edge_index]) * (x1[edge_index] - x0[edge_index]) / \
+        (y1[edge_index] - y0[edge_index])
+
+    # Sort the crossings of each row. The cells between the crossings 2k and 2k+1 of a row are inside the polygon.
+    order = np.lexsort((crossing, row))
+    row, crossing = row[order], crossing[order]
+    span_row = row[0::2]
+    span_start = np.maximum(np.ceil(crossing[0::2]).astype(np.int64), 0)
+    span_stop = np.minimum(np.ceil(crossing[1::2]).astype(np.int64), shape[0])
+    span_length = np.maximum(span_stop - span_start, 0)
+    inside_x = np.repeat(span_start, span_length) + np.arange(span_length.sum()) - \
+        np.repeat(np.cumsum(span_length) - span_length, span_length)
+    inside_y = np.repeat(span_row, span_length)
+
+    # Points on the edges. The lattice points of an edge are separated by (dx, dy) / gcd(dx, dy)
+    steps = np.gcd(x1 - x0, y1 - y0)
+    n_points = steps + 1
+    edge_index = np.repeat(np.arange(polygon.shape[0]), n_points)
+    step = np.arange(n_points.sum()) - np.repeat(np.cumsum(n_points) - n_points, n_points)
+    divisor = np.maximum(steps, 1)[edge_index]
+    edge_x = x0[edge_index] + step * ((x1 - x0)[edge_index] // divisor)
+    edge_y = y0[edge_index] + step * ((y1 - y0)[edge_index] // divisor)
+
+    # Put both sets of points together, remove those outside of the grid and the duplicates
+    x = np.concatenate((inside_x, edge_x))
+    y = np.concatenate((inside_y, edge_y))
+    within = (x >= 0) & (x < shape[0]) & (y >= 0) & (y < shape[1])
+    flat_points = np.unique(y[within] * shape[0] + x[within])
+    return np.column_stack((flat_points % shape[0], flat_points // shape[0]))
+
+
+def obtain_object_internal_points(object_points, alpha, shape):
+    """
+    Obtains the grid coordinates of all the points within the polygon that encloses the points of an obstacle. The
+    outer edge of the obstacle is obtained with its alpha shape, ordered counter-clockwise and filled. It only depends on
+    its inputs, such that multiple obstacles can be processed in parallel.
+    :param object_points: integer array of shape (n, 2) with the grid coordinates of the points of the obstacle
+    :param alpha: alpha value of the alpha shape
+    :param shape: shape of the grid
+    :return internal_points: integer array of shape (m, 2) with the grid coordinates of the points inside the obstacle
+    """
+    object_points = np.asarray(object_points, dtype=np.int64).reshape(-1, 2)
+    if object_points.shape[0] > 3 and len(set(object_points[:, 0])) > 1 and len(set(object_points[:, 1])) > 1:
+        # Obtain the (grid) coordinates of the points that shape the outer edge of the polygon
+        _, output_points_unordered = obtain_outer_edge(object_points, alpha, only_outer=True)
+
+        # Order the points clockwise
+        output_points_ordered = counter_clockwise_ordering(output_points_unordered)
+
+        # The points within the polygon and on its edges are identified
+        internal_points = polygon_internal_points(output_points_ordered, shape)
+    else:
+        internal_points = object_points
+    return internal_points
+
+
 def depickle(directory, filename):
     """
     Function to retrieve the information that has been pickled